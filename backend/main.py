@@ -1,19 +1,42 @@
 """FastAPI backend for Spiritual AI Companion with Bhakti Features."""
+import os
 import sys
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import uuid
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Tuple, AsyncIterator
 import uvicorn
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.core.agent import SpiritualAgent, close_shared_llm_client
+from src.core.config import load_config
+from src.core.llm_client import MockClient
+from src.core.session_pool import SessionPool
+from src.utils.metrics import get_metrics
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Flush the sessions and release the shared LLM client at shutdown."""
+    yield
+    await asyncio.to_thread(shutdown)
+
 app = FastAPI(
     title="Spiritual AI Companion API",
     description="A compassionate AI companion for spiritual guidance, bhakti, and mindfulness",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -129,131 +152,252 @@ EVENING_ROUTINE = {
 # INTENT DETECTION
 # ============================================================================
 
-def detect_intent(message: str) -> Dict[str, Any]:
-    """Detect spiritual intent from user message."""
-    msg_lower = message.lower()
-    
+DEITY_RULES = [
+    ("Krishna", ['krishna']),
+    ("Rama", ['rama']),
+    ("Hanuman", ['hanuman']),
+    ("Shiva", ['shiva']),
+    ("Vishnu", ['vishnu']),
+    ("Lakshmi", ['lakshmi']),
+    ("Saraswati", ['saraswati']),
+]
+
+MANTRA_RULES = [
+    ("gayatri_mantra", ['gayatri']),
+    ("om_namah_shivaya", ['namah shivaya']),
+    ("hanuman_chalisa", ['hanuman']),
+    ("vishnu_sahasranamam", ['vishnu']),
+]
+
+class _RuleTable:
+    """Rules compiled for first-match lookup.
+
+    Keywords are flattened in priority order, so the first keyword found
+    belongs to the winning rule. The scan is ``filter`` over a tuple with
+    the message's ``__contains__``, which runs every substring check in C and
+    stops at the first hit.
+    """
+
+    def __init__(self, rules, default: str):
+        self.default = default
+        self.labels: Dict[str, str] = {}
+        for label, keywords, *_ in rules:
+            for keyword in keywords:
+                self.labels.setdefault(keyword, label)
+        self.keywords = tuple(self.labels)
+
+    def first(self, contains: Callable[[str], bool]) -> str:
+        """Label of the highest-priority rule with a keyword in the message."""
+        keyword = next(filter(contains, self.keywords), None)
+        return self.labels[keyword] if keyword else self.default
+
+_DEITIES = _RuleTable(DEITY_RULES, "General")
+_MANTRAS = _RuleTable(MANTRA_RULES, "general")
+
+# Intent rules in priority order: the first rule with a keyword in the
+# message wins. Each rule builds the rest of its payload from the message's
+# ``__contains__``, so deity and mantra are only looked up where needed.
+INTENT_RULES: List[Tuple[str, List[str], Callable[[Callable[[str], bool]], Dict[str, Any]]]] = [
     # Bhakti/Song intents
-    if any(word in msg_lower for word in ['bhajan', 'devotional song', 'spiritual song', 'kirtan']):
-        return {"intent": "PLAY_BHAKTI_SONG", "deity": detect_deity(msg_lower)}
-    
+    ("PLAY_BHAKTI_SONG", ['bhajan', 'devotional song', 'spiritual song', 'kirtan'],
+     lambda contains: {"deity": _DEITIES.first(contains)}),
     # Mantra intents
-    if any(word in msg_lower for word in ['mantra', 'chant', 'recite', 'chanting']):
-        return {"intent": "CHANT_MANRA", "mantra": detect_mantra(msg_lower)}
-    
+    ("CHANT_MANRA", ['mantra', 'chant', 'recite', 'chanting'],
+     lambda contains: {"mantra": _MANTRAS.first(contains)}),
     # Gayatri specific
-    if 'gayatri' in msg_lower:
-        return {"intent": "PLAY_GAYATRI", "content": BHakti_CONTENT["gayatri_mantra"]}
-    
+    ("PLAY_GAYATRI", ['gayatri'],
+     lambda contains: {"content": BHakti_CONTENT["gayatri_mantra"]}),
     # Shiva specific
-    if any(word in msg_lower for word in ['shiva', 'shivaya', 'rudra']):
-        return {"intent": "PLAY_SHIVA", "content": BHakti_CONTENT["om_namah_shivaya"]}
-    
+    ("PLAY_SHIVA", ['shiva', 'shivaya', 'rudra'],
+     lambda contains: {"content": BHakti_CONTENT["om_namah_shivaya"]}),
     # Hanuman specific
-    if any(word in msg_lower for word in ['hanuman', 'anjaneya', 'maruti']):
-        return {"intent": "PLAY_HANUMAN", "content": BHakti_CONTENT["hanuman_chalisa"]}
-    
+    ("PLAY_HANUMAN", ['hanuman', 'anjaneya', 'maruti'],
+     lambda contains: {"content": BHakti_CONTENT["hanuman_chalisa"]}),
     # Vishnu specific
-    if any(word in msg_lower for word in ['vishnu', 'narayana', 'krishna', 'rama']):
-        return {"intent": "PLAY_VISHNU", "deity": "Vishnu"}
-    
+    ("PLAY_VISHNU", ['vishnu', 'narayana', 'krishna', 'rama'],
+     lambda contains: {"deity": "Vishnu"}),
     # Meaning/Explanation intents
-    if any(word in msg_lower for word in ['meaning', 'explain', 'what is', 'understand']):
-        return {"intent": "EXPLAIN_MANTRAM", "item": detect_mantra(msg_lower)}
-    
+    ("EXPLAIN_MANTRAM", ['meaning', 'explain', 'what is', 'understand'],
+     lambda contains: {"item": _MANTRAS.first(contains)}),
     # Morning prayer
-    if any(word in msg_lower for word in ['morning', 'sunrise', 'prayer']):
-        return {"intent": "MORNING_PRAYER", "routine": MORNING_ROUTINE}
-    
+    ("MORNING_PRAYER", ['morning', 'sunrise', 'prayer'],
+     lambda contains: {"routine": MORNING_ROUTINE}),
     # Evening practice
-    if any(word in msg_lower for word in ['evening', 'night', 'bedtime']):
-        return {"intent": "EVENING_PRACTICE", "routine": EVENING_ROUTINE}
-    
+    ("EVENING_PRACTICE", ['evening', 'night', 'bedtime'],
+     lambda contains: {"routine": EVENING_ROUTINE}),
     # Meditation
-    if any(word in msg_lower for word in ['meditate', 'meditation', 'dhyana']):
-        return {"intent": "MEDITATION", "type": "general"}
-    
-    return {"intent": "GENERAL_CHAT", "message": message}
+    ("MEDITATION", ['meditate', 'meditation', 'dhyana'],
+     lambda contains: {"type": "general"}),
+]
+
+_INTENTS = _RuleTable(INTENT_RULES, "GENERAL_CHAT")
+_INTENT_PAYLOADS = {label: build for label, _, build in INTENT_RULES}
+
+def detect_intent(message: str) -> Dict[str, Any]:
+    """Detect spiritual intent from user message."""
+    contains = message.lower().__contains__
+    intent = _INTENTS.first(contains)
+    if intent == "GENERAL_CHAT":
+        return {"intent": intent, "message": message}
+    return {"intent": intent, **_INTENT_PAYLOADS[intent](contains)}
 
 def detect_deity(msg: str) -> str:
     """Detect deity name from message."""
-    if 'krishna' in msg: return "Krishna"
-    if 'rama' in msg: return "Rama"
-    if 'hanuman' in msg: return "Hanuman"
-    if 'shiva' in msg: return "Shiva"
-    if 'vishnu' in msg: return "Vishnu"
-    if 'lakshmi' in msg: return "Lakshmi"
-    if 'saraswati' in msg: return "Saraswati"
-    return "General"
+    return _DEITIES.first(msg.__contains__)
 
 def detect_mantra(msg: str) -> str:
     """Detect specific mantra from message."""
-    if 'gayatri' in msg: return "gayatri_mantra"
-    if 'namah shivaya' in msg: return "om_namah_shivaya"
-    if 'hanuman' in msg: return "hanuman_chalisa"
-    if 'vishnu' in msg: return "vishnu_sahasranamam"
-    return "general"
+    return _MANTRAS.first(msg.__contains__)
 
 # ============================================================================
 # SPIRITUAL AGENT RESPONSE GENERATOR
 # ============================================================================
 
+# Response templates per intent. Fields named in a template that also
+# appear in the intent data (deity, mantra) are filled in per request.
+BHAKTI_RESPONSES = {
+    "PLAY_BHAKTI_SONG": {
+        "response": "🙏 Let us together sing praises to the divine. Playing a devotional song to fill your heart with bhakti (devotion).",
+        "audio_type": "bhajan",
+        "deity": "General",
+        "flow": ["intro", "audio", "meaning", "close"]
+    },
+    "CHANT_MANRA": {
+        "response": "🕉️ Let us chant this sacred mantra together. Feel the vibration in your heart as we invoke the divine presence.",
+        "audio_type": "mantra",
+        "mantra": "general",
+        "flow": ["intro", "chant", "pause", "meaning", "close"]
+    },
+    "PLAY_GAYATRI": {
+        "response": "📿 The Gayatri Mantra is the mother of all mantras. Let us meditate on the divine light within. ॐ भूर्भुवः स्वः...",
+        "audio_type": "gayatri",
+        "content": BHakti_CONTENT["gayatri_mantra"],
+        "flow": ["intro", "sanskrit", "telugu", "english", "meaning", "close"]
+    },
+    "PLAY_SHIVA": {
+        "response": "🕉️ Om Namah Shivaya - I bow to the auspicious one. This mantra removes all obstacles and transforms consciousness.",
+        "audio_type": "shiva",
+        "content": BHakti_CONTENT["om_namah_shivaya"],
+        "flow": ["intro", "chant", "meaning", "close"]
+    },
+    "PLAY_HANUMAN": {
+        "response": "🐒 Jai Hanuman! Let us invoke the strength and devotion of Lord Hanuman, the supreme servant of Rama.",
+        "audio_type": "hanuman",
+        "content": BHakti_CONTENT["hanuman_chalisa"],
+        "flow": ["intro", "verse", "meaning", "close"]
+    },
+    "MEDITATION": {
+        "response": "🧘 Let us sit comfortably and turn our attention inward. Close your eyes and follow your breath...",
+        "audio_type": "meditation",
+        "duration": "10 minutes",
+        "flow": ["intro", "guidance", "silence", "close"]
+    },
+    "MORNING_PRAYER": {
+        "response": "🌅 Good morning, dear seeker. Let us begin the day with gratitude and divine connection.",
+        "audio_type": "routine",
+        "routine": MORNING_ROUTINE,
+        "flow": ["intro", "gayatri", "surya", "blessing"]
+    },
+    "EVENING_PRACTICE": {
+        "response": "🌙 As the day ends, let us reflect on the blessings received and prepare for peaceful rest.",
+        "audio_type": "routine",
+        "routine": EVENING_ROUTINE,
+        "flow": ["intro", "bhajan", "gratitude", "blessing"]
+    }
+}
+
+DEFAULT_BHAKTI_RESPONSE = {"response": "🙏 May peace be with you. How else may I assist you on your spiritual journey?"}
+
 def generate_bhakti_response(intent_data: Dict) -> Dict[str, Any]:
     """Generate response for bhakti-related intents."""
-    intent = intent_data.get("intent")
-    
-    responses = {
-        "PLAY_BHAKTI_SONG": {
-            "response": "🙏 Let us together sing praises to the divine. Playing a devotional song to fill your heart with bhakti (devotion).",
-            "audio_type": "bhajan",
-            "deity": intent_data.get("deity", "General"),
-            "flow": ["intro", "audio", "meaning", "close"]
-        },
-        "CHANT_MANRA": {
-            "response": "🕉️ Let us chant this sacred mantra together. Feel the vibration in your heart as we invoke the divine presence.",
-            "audio_type": "mantra",
-            "mantra": intent_data.get("mantra", "general"),
-            "flow": ["intro", "chant", "pause", "meaning", "close"]
-        },
-        "PLAY_GAYATRI": {
-            "response": "📿 The Gayatri Mantra is the mother of all mantras. Let us meditate on the divine light within. ॐ भूर्भुवः स्वः...",
-            "audio_type": "gayatri",
-            "content": BHakti_CONTENT["gayatri_mantra"],
-            "flow": ["intro", "sanskrit", "telugu", "english", "meaning", "close"]
-        },
-        "PLAY_SHIVA": {
-            "response": "🕉️ Om Namah Shivaya - I bow to the auspicious one. This mantra removes all obstacles and transforms consciousness.",
-            "audio_type": "shiva",
-            "content": BHakti_CONTENT["om_namah_shivaya"],
-            "flow": ["intro", "chant", "meaning", "close"]
-        },
-        "PLAY_HANUMAN": {
-            "response": "🐒 Jai Hanuman! Let us invoke the strength and devotion of Lord Hanuman, the supreme servant of Rama.",
-            "audio_type": "hanuman",
-            "content": BHakti_CONTENT["hanuman_chalisa"],
-            "flow": ["intro", "verse", "meaning", "close"]
-        },
-        "MEDITATION": {
-            "response": "🧘 Let us sit comfortably and turn our attention inward. Close your eyes and follow your breath...",
-            "audio_type": "meditation",
-            "duration": "10 minutes",
-            "flow": ["intro", "guidance", "silence", "close"]
-        },
-        "MORNING_PRAYER": {
-            "response": "🌅 Good morning, dear seeker. Let us begin the day with gratitude and divine connection.",
-            "audio_type": "routine",
-            "routine": MORNING_ROUTINE,
-            "flow": ["intro", "gayatri", "surya", "blessing"]
-        },
-        "EVENING_PRACTICE": {
-            "response": "🌙 As the day ends, let us reflect on the blessings received and prepare for peaceful rest.",
-            "audio_type": "routine",
-            "routine": EVENING_ROUTINE,
-            "flow": ["intro", "bhajan", "gratitude", "blessing"]
-        }
+    template = BHAKTI_RESPONSES.get(intent_data.get("intent"))
+    if template is None:
+        return dict(DEFAULT_BHAKTI_RESPONSE)
+    response = dict(template)
+    for field in ("deity", "mantra"):
+        if field in response and field in intent_data:
+            response[field] = intent_data[field]
+    return response
+
+# ============================================================================
+# PRE-RENDERED STATIC RESPONSES
+# ============================================================================
+
+# Static payloads only change on deploy; clients revalidate with the ETag
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+class PrerenderedJSON:
+    """A static JSON payload rendered to bytes once, served with a strong ETag.
+
+    The body is encoded exactly like FastAPI's default JSONResponse, so
+    clients see the same bytes as before, minus the per-request encoding.
+    """
+
+    def __init__(self, content: Any, cache_control: str = STATIC_CACHE_CONTROL):
+        self.body = json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def respond(self, request: Request) -> Response:
+        """Serve the body, or 304 Not Modified if the client has this version."""
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return Response(self.body, media_type="application/json", headers=self.headers)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against the ETag (weak comparison)."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+MANTRA_PAYLOADS = {
+    mantra_id: PrerenderedJSON({
+        "name": content["name"],
+        "soundscape": content["soundscape"],
+        "telugu": content["telugu"],
+        "english": content["english"],
+        "meaning": content["meaning"],
+        "benefits": content["benefits"],
+        "audio_url": content["audio_url"]
+    })
+    for mantra_id, content in BHakti_CONTENT.items()
+}
+MANTRA_NOT_FOUND = PrerenderedJSON({"error": "Mantra not found"})
+
+ROUTINE_PAYLOADS = {
+    "morning": PrerenderedJSON({
+        "routine": "Morning Spiritual Practice",
+        "items": MORNING_ROUTINE,
+        "message": "🌅 Begin your day with divine connection"
+    }),
+    "evening": PrerenderedJSON({
+        "routine": "Evening Spiritual Practice",
+        "items": EVENING_ROUTINE,
+        "message": "🌙 End your day with gratitude and peace"
+    }),
+}
+ROUTINE_INVALID = PrerenderedJSON({"error": "Invalid time of day. Use 'morning' or 'evening'"})
+
+MEDITATION_PAYLOAD = PrerenderedJSON({
+    "meditation": {
+        "type": "Guided Meditation",
+        "steps": [
+            "Find a comfortable seated position",
+            "Close your eyes gently",
+            "Follow your breath without force",
+            "Observe thoughts without attachment",
+            "Return to the present moment",
+            "Feel peace within"
+        ],
+        "duration": "10-20 minutes"
     }
-    
-    return responses.get(intent, {"response": "🙏 May peace be with you. How else may I assist you on your spiritual journey?"})
+})
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -262,6 +406,7 @@ def generate_bhakti_response(intent_data: Dict) -> Dict[str, Any]:
 class ChatRequest(BaseModel):
     message: str
     context: Optional[Dict[str, Any]] = {}
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
@@ -282,6 +427,327 @@ class BhaktiResponse(BaseModel):
     english_meaning: Optional[str] = None
     benefits: Optional[List[str]] = None
 
+# ============================================================================
+# STREAMING CHAT
+# ============================================================================
+
+# Audio types whose full content is sent along with the response
+AUDIO_CONTENT_TYPES = ("gayatri", "shiva", "hanuman")
+
+# Seconds without an event before a keep-alive comment is sent
+SSE_HEARTBEAT_SECONDS = 15.0
+
+# Stop nginx-style proxies from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Signs session ids; set SESSION_SECRET so issued ids survive restarts and
+# are accepted by every worker
+_SESSION_SECRET = (os.getenv("SESSION_SECRET") or "").encode("utf-8") or secrets.token_bytes(32)
+
+_agent: Optional[SpiritualAgent] = None
+_session_pool: Optional[SessionPool] = None
+_agent_lock = threading.Lock()
+
+def uses_llm(agent: SpiritualAgent) -> bool:
+    """Whether the agent's responses come from a real, currently reachable LLM provider."""
+    return not isinstance(agent.llm_client, MockClient) and agent.llm_client.is_available()
+
+def get_session_pool() -> SessionPool:
+    """The pool of session agents, configured from the sessions settings."""
+    global _session_pool
+    with _agent_lock:
+        if _session_pool is None:
+            settings = load_config().get("sessions") or {}
+            _session_pool = SessionPool(
+                max_sessions=settings.get("max_resident", 500),
+                idle_ttl=settings.get("idle_ttl_seconds", 1800),
+                sweep_interval=settings.get("sweep_interval_seconds", 60),
+            )
+    return _session_pool
+
+def _sign(session_key: str) -> str:
+    return hmac.new(_SESSION_SECRET, session_key.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+def issue_session_id() -> str:
+    """A new session id: a random key signed by the server, so clients
+    cannot pick (or guess) another user's session."""
+    session_key = uuid.uuid4().hex
+    return f"{session_key}.{_sign(session_key)}"
+
+def verify_session_id(session_id: str) -> Optional[str]:
+    """The session key of an id issued by ``issue_session_id()``, or None
+    if the id was not issued by this server."""
+    session_key, _, signature = session_id.partition(".")
+    if not session_key or not hmac.compare_digest(signature, _sign(session_key)):
+        return None
+    return session_key
+
+def session_key_or_403(session_id: Optional[str]) -> Optional[str]:
+    """The session key of a request's session id, rejecting forged ids."""
+    if not session_id:
+        return None
+    session_key = verify_session_id(session_id)
+    if session_key is None:
+        raise HTTPException(status_code=403, detail="Unknown session; request one from /api/session")
+    return session_key
+
+def get_agent() -> Optional[SpiritualAgent]:
+    """The shared SpiritualAgent for requests without a session, or None
+    when no LLM provider is usable. Turns it answers neither recall nor
+    store memories (see ``chat_turn()``), so sessionless users never see
+    each other's conversations."""
+    global _agent
+    if os.getenv("LLM_PROVIDER", "mock").lower() == "mock":
+        return None
+    with _agent_lock:
+        if _agent is None:
+            _agent = SpiritualAgent()
+    return _agent if uses_llm(_agent) else None
+
+def shutdown() -> None:
+    """Close the session pool and the shared agent, flushing their memories,
+    then the shared LLM client."""
+    global _agent, _session_pool
+    with _agent_lock:
+        pool, _session_pool = _session_pool, None
+        agent, _agent = _agent, None
+    if pool is not None:
+        pool.close()
+    if agent is not None:
+        agent.close()
+    close_shared_llm_client()
+
+@contextlib.asynccontextmanager
+async def session_agent(session_key: Optional[str]) -> AsyncIterator[Optional[SpiritualAgent]]:
+    """The agent answering a request: the session's, leased from the pool
+    until the request is done so it cannot be evicted mid-turn, or without
+    a session the shared one from ``get_agent()``."""
+    if not session_key:
+        yield await asyncio.to_thread(get_agent)
+        return
+    pool = get_session_pool()
+    agent = await asyncio.to_thread(pool.acquire, session_key)
+    try:
+        yield agent
+    finally:
+        await asyncio.to_thread(pool.release, session_key)
+
+def chat_context(intent_data: Dict[str, Any], response_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The routing context reported to the client for a chat message."""
+    return {
+        "intent": intent_data.get("intent"),
+        "deity": intent_data.get("deity"),
+        "audio_type": response_data.get("audio_type")
+    }
+
+def audio_content(response_data: Dict[str, Any]) -> Optional[Dict]:
+    """The audio content to send with a response, if its audio type has any."""
+    return response_data.get("content") if response_data.get("audio_type") in AUDIO_CONTENT_TYPES else None
+
+async def _single(text: str) -> AsyncIterator[str]:
+    """An async iterator over one piece of text."""
+    yield text
+
+async def chat_turn(
+    message: str, agent: Optional[SpiritualAgent], remember: bool = True
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """The events of one chat turn, as (event, data) pairs.
+    
+    ``intent`` (routing context) comes first, then ``audio`` when the
+    response has audio, then one ``token`` per piece of the response and a
+    final ``done`` with the full text. With an LLM-backed agent the tokens
+    come from the agent; otherwise the bhakti response is sent whole and,
+    if there is an agent, recorded in its memory. Without ``remember`` the
+    agent's memory is neither recalled nor written, as for the shared
+    agent answering sessionless requests.
+    """
+    intent_data = detect_intent(message)
+    response_data = generate_bhakti_response(intent_data)
+    yield "intent", chat_context(intent_data, response_data)
+    if response_data.get("audio_type"):
+        yield "audio", {
+            "audio_type": response_data["audio_type"],
+            "audio_content": audio_content(response_data),
+        }
+    
+    # uses_llm() may probe the provider; keep it off the event loop
+    streaming = agent is not None and await asyncio.to_thread(uses_llm, agent)
+    tokens = agent.astream_interact(message, remember=remember) if streaming else _single(response_data["response"])
+    pieces = []
+    async for token in tokens:
+        pieces.append(token)
+        yield "token", {"text": token}
+    response = "".join(pieces)
+    if agent is not None and remember and not streaming:
+        await asyncio.to_thread(agent.record, message, response)
+    yield "done", {"response": response}
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event with a JSON payload."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+async def with_heartbeat(items: AsyncIterator[Any], interval: float) -> AsyncIterator[Any]:
+    """Yield from an async iterator, yielding None whenever ``interval`` seconds pass without an item."""
+    iterator = items.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield None
+                continue
+            try:
+                item = pending.result()
+            except StopAsyncIteration:
+                return
+            yield item
+            pending = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        # The client went away or the stream ended: stop the producer too
+        if not pending.done():
+            pending.cancel()
+            with contextlib.suppress(BaseException):
+                await pending
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+async def chat_events(message: str, session_id: Optional[str] = None) -> AsyncIterator[bytes]:
+    """Server-Sent Events for one chat message.
+    
+    Carries the events of ``chat_turn()``, answered by the session's agent
+    when a session is given, otherwise by the shared agent without memory.
+    Failures end the stream with an ``error`` event; idle periods are
+    filled with comment heartbeats.
+    """
+    try:
+        async with session_agent(session_id) as agent:
+            turn = chat_turn(message, agent, remember=session_id is not None)
+            async for item in with_heartbeat(turn, SSE_HEARTBEAT_SECONDS):
+                yield b": heartbeat\n\n" if item is None else sse_event(*item)
+    except Exception as e:
+        yield sse_event("error", {"detail": str(e)})
+
+# ============================================================================
+# WEBSOCKET SESSIONS
+# ============================================================================
+
+def check_in_interval() -> Optional[float]:
+    """Seconds of silence before a session is sent a check-in, or None if disabled."""
+    minutes = (load_config().get("agent") or {}).get("check_in_frequency")
+    return minutes * 60 if minutes else None
+
+class ChatSession:
+    """One /ws/chat connection, bound to a session's pooled SpiritualAgent,
+    which stays leased (and so resident) while the connection is open.
+    
+    Messages are ``{"message": "..."}`` (or plain text); every turn is
+    answered with the events of ``chat_turn()``, sent as
+    ``{"type": event, "data": {...}}``. After ``check_in_after`` seconds
+    without activity the agent's check-in is pushed unprompted, once per
+    silence: the next one waits for the user to send a message.
+    """
+    
+    def __init__(self, websocket: WebSocket, session_id: str, agent: SpiritualAgent, check_in_after: Optional[float]):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.agent = agent
+        self.check_in_after = check_in_after
+        self._send_lock = asyncio.Lock()
+        self._busy = False
+        self._last_activity = asyncio.get_running_loop().time()
+        self._active = asyncio.Event()
+    
+    async def send(self, event: str, data: Dict[str, Any]) -> None:
+        """Send one event; turns and check-ins share the socket."""
+        async with self._send_lock:
+            await self.websocket.send_json({"type": event, "data": data})
+    
+    async def run(self) -> None:
+        """Answer turns until the client disconnects."""
+        check_ins = asyncio.create_task(self._check_ins()) if self.check_in_after else None
+        try:
+            while True:
+                raw = await self._receive()
+                self._touch()
+                if raw is None:
+                    await self.send("error", {"detail": "Expected UTF-8 text"})
+                    continue
+                message = self._parse(raw)
+                if message:
+                    await self._turn(message)
+                else:
+                    await self.send("error", {"detail": "Expected a non-empty message"})
+        finally:
+            if check_ins is not None:
+                check_ins.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await check_ins
+    
+    async def _receive(self) -> Optional[str]:
+        """The next client frame as text; binary frames are decoded as UTF-8,
+        and None is returned when they are not valid UTF-8."""
+        frame = await self.websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(frame.get("code", 1000))
+        if frame.get("text") is not None:
+            return frame["text"]
+        try:
+            return (frame.get("bytes") or b"").decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    
+    async def _turn(self, message: str) -> None:
+        self._busy = True
+        try:
+            async for event, data in chat_turn(message, self.agent):
+                await self.send(event, data)
+        except WebSocketDisconnect:
+            raise
+        except Exception as e:
+            await self.send("error", {"detail": str(e)})
+        finally:
+            self._busy = False
+            self._touch()
+    
+    async def _check_ins(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = self._last_activity + self.check_in_after - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            if self._busy:
+                # The turn re-arms the timer when it ends
+                await asyncio.sleep(self.check_in_after)
+                continue
+            try:
+                await self.send("check_in", {"text": self.agent.check_in()})
+            except Exception:
+                # The connection is gone; run() ends on the disconnect
+                return
+            # Our own push is not activity: stay quiet until the user is back
+            self._active.clear()
+            await self._active.wait()
+    
+    def _touch(self) -> None:
+        """Restart the silence before a check-in after the user's activity."""
+        self._last_activity = asyncio.get_running_loop().time()
+        self._active.set()
+    
+    @staticmethod
+    def _parse(raw: str) -> str:
+        """The message text of a client frame: JSON with a "message" field, or plain text."""
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return raw.strip()
+        message = data.get("message")
+        return message.strip() if isinstance(message, str) else ""
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -301,9 +767,20 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": "spiritual-ai"}
 
+@app.get("/metrics")
+async def metrics():
+    """Counters, gauges and latency histograms recorded by this process, by name."""
+    return get_metrics().snapshot()
+
+@app.post("/api/session")
+async def new_session():
+    """Issue a session id for ``/api/chat``, ``/api/chat/stream`` and ``/ws/chat``."""
+    return {"session_id": issue_session_id()}
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """Chat endpoint for spiritual guidance."""
+    session_key = session_key_or_403(request.session_id)
     try:
         # Detect intent
         intent_data = detect_intent(request.message)
@@ -311,21 +788,52 @@ async def chat(request: ChatRequest):
         # Generate response based on intent
         response_data = generate_bhakti_response(intent_data)
         
-        context = {
-            "intent": intent_data.get("intent"),
-            "deity": intent_data.get("deity"),
-            "audio_type": response_data.get("audio_type")
-        }
+        # Remember the exchange in the session's memory
+        if session_key:
+            async with session_agent(session_key) as agent:
+                await asyncio.to_thread(agent.record, request.message, response_data["response"])
         
         return ChatResponse(
             response=response_data["response"],
-            context=context,
+            context=chat_context(intent_data, response_data),
             audio_type=response_data.get("audio_type"),
-            audio_content=response_data.get("content") if response_data.get("audio_type") in ["gayatri", "shiva", "hanuman"] else None
+            audio_content=audio_content(response_data)
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Chat endpoint streaming intent, audio and response tokens as Server-Sent Events."""
+    session_key = session_key_or_403(request.session_id)
+    return StreamingResponse(chat_events(request.message, session_key), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket, session_id: Optional[str] = None):
+    """Chat over a persistent connection with session memory and pushed check-ins.
+    
+    Pass ``?session_id=`` with an id issued by this server to resume a
+    session; otherwise a new one is created and announced in the first
+    ``session`` event. Connections with an id the server did not issue are
+    refused. The session's agent stays in the pool after the connection
+    closes.
+    """
+    session_id = session_id or issue_session_id()
+    session_key = verify_session_id(session_id)
+    if session_key is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    async with session_agent(session_key) as agent:
+        session = ChatSession(websocket, session_key, agent, check_in_interval())
+        try:
+            await session.send("session", {"session_id": session_id})
+            await session.run()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await asyncio.to_thread(agent.memory.flush)
+
 @app.post("/api/bhakti", response_model=BhaktiResponse)
 async def bhakti_content(request: BhaktiRequest):
     """Get bhakti content based on intent."""
@@ -353,63 +861,19 @@ async def bhakti_content(request: BhaktiRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/mantra/{mantra_id}")
-async def get_mantra(mantra_id: str):
+async def get_mantra(mantra_id: str, request: Request):
     """Get specific mantra content."""
-    try:
-        if mantra_id in BHakti_CONTENT:
-            content = BHakti_CONTENT[mantra_id]
-            return {
-                "name": content["name"],
-                "soundscape": content["soundscape"],
-                "telugu": content["telugu"],
-                "english": content["english"],
-                "meaning": content["meaning"],
-                "benefits": content["benefits"],
-                "audio_url": content["audio_url"]
-            }
-        else:
-            return {"error": "Mantra not found"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return MANTRA_PAYLOADS.get(mantra_id, MANTRA_NOT_FOUND).respond(request)
 
 @app.get("/api/routine/{time_of_day}")
-async def get_routine(time_of_day: str):
+async def get_routine(time_of_day: str, request: Request):
     """Get morning or evening spiritual routine."""
-    try:
-        if time_of_day == "morning":
-            return {
-                "routine": "Morning Spiritual Practice",
-                "items": MORNING_ROUTINE,
-                "message": "🌅 Begin your day with divine connection"
-            }
-        elif time_of_day == "evening":
-            return {
-                "routine": "Evening Spiritual Practice",
-                "items": EVENING_ROUTINE,
-                "message": "🌙 End your day with gratitude and peace"
-            }
-        else:
-            return {"error": "Invalid time of day. Use 'morning' or 'evening'"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ROUTINE_PAYLOADS.get(time_of_day, ROUTINE_INVALID).respond(request)
 
 @app.get("/api/meditation")
-async def get_meditation():
+async def get_meditation(request: Request):
     """Get meditation guidance."""
-    return {
-        "meditation": {
-            "type": "Guided Meditation",
-            "steps": [
-                "Find a comfortable seated position",
-                "Close your eyes gently",
-                "Follow your breath without force",
-                "Observe thoughts without attachment",
-                "Return to the present moment",
-                "Feel peace within"
-            ],
-            "duration": "10-20 minutes"
-        }
-    }
+    return MEDITATION_PAYLOAD.respond(request)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
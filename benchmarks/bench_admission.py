@@ -0,0 +1,123 @@
+"""Benchmark admission control in front of an overloaded LLM backend.
+
+A stub Ollama server in its own process slows down as it gets busier:
+each generation takes ``base_ms`` times the number of generations running
+when it starts, like a GPU time-sliced between requests. A burst of
+``callers`` concurrent turns, every tenth one a crisis, is sent through a
+plain OllamaClient and through AdmittedLLMClient. Run with:
+python benchmarks/bench_admission.py [callers] [base_ms] [max_concurrent]
+"""
+import json
+import multiprocessing
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.admission import AdmissionController, AdmissionRejected  # noqa: E402
+from src.core.llm_client import AdmittedLLMClient, OllamaClient  # noqa: E402
+from src.utils.metrics import get_metrics  # noqa: E402
+
+REPLY = json.dumps({"message": {"role": "assistant", "content": "Be gentle with yourself."}, "done": True}).encode()
+
+
+class ContendedOllama(BaseHTTPRequestHandler):
+    """Ollama stand-in whose generations slow down with concurrency."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    base = 0.05
+    active = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            ContendedOllama.active += 1
+            running = ContendedOllama.active
+        time.sleep(self.base * running)
+        with self.lock:
+            ContendedOllama.active -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 1024
+
+
+def serve(base, ready):
+    """Run the stub server (in a child process) and report its port."""
+    ContendedOllama.base = base
+    server = StubServer(("127.0.0.1", 0), ContendedOllama)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def burst(client, callers):
+    """Send every turn at once; per-kind latencies in ms, and rejections."""
+    latencies = {"crisis": [], "normal": []}
+    rejected = [0]
+
+    def turn(i):
+        crisis = i % 10 == 5
+        context = {"emotion": None, "intent": "spiritual_question", "is_crisis": crisis}
+        start = time.perf_counter()
+        try:
+            client.complete([{"role": "user", "content": f"Question {i}"}], context)
+        except AdmissionRejected:
+            rejected[0] += 1
+            return
+        latencies["crisis" if crisis else "normal"].append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(callers) as pool:
+        list(pool.map(turn, range(callers)))
+    return latencies, rejected[0], time.perf_counter() - start
+
+
+def report(label, latencies, rejected, elapsed):
+    normal = sorted(latencies["normal"])
+    print(f"  {label:<28} crisis p50 {statistics.median(latencies['crisis']):6.0f}"
+          f"   normal p50 {statistics.median(normal):6.0f}  max {normal[-1]:6.0f}"
+          f"   rejected {rejected:3d}   burst {elapsed:5.2f} s")
+
+
+def main():
+    """Run the benchmark."""
+    callers = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    base = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    limit = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(base, ready), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{ready.get()}"
+    http = {"pool_maxsize": callers}
+
+    print(f"{callers} concurrent turns, {base * 1000:.0f} ms x running generations each (ms)")
+    report("no admission control", *burst(OllamaClient(base_url=base_url, **http), callers))
+    for max_wait in (None, 1.0):
+        admission = AdmissionController(max_concurrent=limit, max_queue=callers, max_wait=max_wait,
+                                        name=f"bench.admission.{max_wait}")
+        client = AdmittedLLMClient(OllamaClient(base_url=base_url, **http), admission)
+        label = f"{limit} at a time, " + ("no deadline" if max_wait is None else f"{max_wait:.0f} s deadline")
+        report(label, *burst(client, callers))
+    waits = get_metrics().snapshot()["bench.admission.None.wait_seconds"]
+    print(f"  queue wait without deadline: p50 {waits['p50'] * 1000:.0f} ms, max {waits['max'] * 1000:.0f} ms")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark SpiritualAgent construction time and per-agent memory.
+
+Agents are built for new sessions the way the backend's SessionPool does,
+once with their own ContextAnalyzer, ConversationHandler and LLM client
+(as every agent used to be) and once with the process-wide ones. The LLM
+provider is Ollama at an address where nothing listens, so client setup
+includes the connection pools and wrappers but no generation. Loading
+just the session's memory is the floor. Run with:
+python benchmarks/bench_agent_construction.py [agents]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.agent import SpiritualAgent, create_llm_client, get_shared_llm_client  # noqa: E402
+from src.dialogue.conversation_handler import ConversationHandler  # noqa: E402
+from src.memory.store import MemoryStore  # noqa: E402
+from src.reasoning.context_analyzer import ContextAnalyzer  # noqa: E402
+
+
+def unshared(session_id, store):
+    """An agent with its own subsystems, as SpiritualAgent.__init__ used to build them."""
+    return SpiritualAgent(
+        session_id=session_id,
+        memory_store=store,
+        context_analyzer=ContextAnalyzer(),
+        conversation=ConversationHandler(),
+        llm_client=create_llm_client(),
+    )
+
+
+def shared(session_id, store):
+    return SpiritualAgent(session_id=session_id, memory_store=store)
+
+
+def memory_only(session_id, store):
+    """Just the session's memory, the per-user state every agent needs."""
+    return store.get(session_id)
+
+
+def build_all(label, build, agents, store, traced):
+    """Build the agents; seconds taken, or bytes retained when traced."""
+    if traced:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    # Silence the provider availability message printed for every new client
+    with contextlib.redirect_stdout(io.StringIO()):
+        built = [build(f"{label}-{traced}-{i}", store) for i in range(agents)]
+    cost = time.perf_counter() - start
+    if traced:
+        cost = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+    for agent in built:
+        llm_client = getattr(agent, "llm_client", None)
+        if llm_client is not None and llm_client is not built[0].llm_client:
+            llm_client.close()
+    return cost
+
+
+def measure(label, build, agents, root):
+    """Report time per agent and memory retained per agent."""
+    store = MemoryStore(root=root / label, max_resident=2 * agents)
+    elapsed = build_all(label, build, agents, store, traced=False)
+    retained = build_all(label, build, agents, store, traced=True)
+    print(f"  {label:<20} {elapsed / agents * 1e6:8.1f} us/agent   {retained / agents / 1024:6.1f} KiB/agent")
+    store.close()
+
+
+def main():
+    """Run the benchmark."""
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    os.environ["LLM_PROVIDER"] = "ollama"
+    os.environ["OLLAMA_BASE_URL"] = "http://127.0.0.1:9"
+    print(f"{agents} agents for new sessions")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Create the process-wide parts first so only per-agent work is measured
+        warm_up = MemoryStore(root=Path(tmp) / "warm-up")
+        shared("warm-up", warm_up)
+        get_shared_llm_client()
+        warm_up.close()
+        measure("own subsystems", unshared, agents, Path(tmp))
+        measure("shared subsystems", shared, agents, Path(tmp))
+        measure("session memory only", memory_only, agents, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark ContextAnalyzer.analyze_batch() against a loop over analyze().
+
+Messages are sampled from a small pool of phrasings, as in real logs where
+users repeat themselves. Run with:
+python benchmarks/bench_analyze_batch.py [messages] [processes]
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.reasoning.context_analyzer import ContextAnalyzer
+
+
+def make_corpus(analyzer: ContextAnalyzer, count: int, seed: int = 0) -> list:
+    """Generate chat-sized messages mixing keywords and filler words."""
+    rng = random.Random(seed)
+    keywords = list(analyzer._matcher.keywords)
+    filler = ["the", "day", "was", "long", "and", "i", "walked", "home", "slowly",
+              "thinking", "about", "everything", "that", "happened", "today"]
+    pool = [
+        " ".join(rng.choice(keywords) if rng.random() < 0.15 else rng.choice(filler)
+                 for _ in range(rng.randint(5, 40)))
+        for _ in range(count // 10 or 1)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    analyzer = ContextAnalyzer()
+    messages = make_corpus(analyzer, count)
+
+    start = time.perf_counter()
+    expected = [analyzer.analyze(message) for message in messages]
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = analyzer.analyze_batch(messages)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel_batch = analyzer.analyze_batch(messages, processes=processes)
+    parallel = time.perf_counter() - start
+
+    assert batch.to_dicts() == expected
+    assert parallel_batch.to_dicts() == expected
+
+    print(f"{count} messages")
+    print(f"  analyze() loop          {loop:8.3f} s  {count / loop:>10,.0f} msg/s")
+    print(f"  analyze_batch()         {single:8.3f} s  {count / single:>10,.0f} msg/s")
+    print(f"  analyze_batch({processes} procs) {parallel:8.3f} s  {count / parallel:>10,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
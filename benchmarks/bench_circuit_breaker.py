@@ -0,0 +1,123 @@
+"""Benchmark turn latency through a provider outage, with and without the circuit breaker.
+
+A stub Ollama server in its own process is healthy, then hangs (accepts
+connections but never answers, as an overloaded or wedged server does),
+then recovers. An agent takes turns throughout with a plain OllamaClient
+and with a GuardedLLMClient, both using a ``timeout_ms`` HTTP timeout and
+no latency budget, so only the breaker differs. Run with:
+python benchmarks/bench_circuit_breaker.py [timeout_ms] [turns_per_phase]
+"""
+import json
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.agent import SpiritualAgent  # noqa: E402
+from src.core.circuit_breaker import CircuitBreaker, HealthProber  # noqa: E402
+from src.core.llm_client import GuardedLLMClient, OllamaClient  # noqa: E402
+from src.memory.store import MemoryStore  # noqa: E402
+
+REPLY = {"message": {"role": "assistant", "content": "Rest in the stillness between breaths."}, "done": True}
+
+
+class FlakyOllama(BaseHTTPRequestHandler):
+    """Ollama stand-in that hangs while the shared ``hung`` flag is set."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    hung = None
+
+    def do_GET(self):
+        self._reply({"models": []})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(REPLY)
+
+    def _reply(self, reply):
+        while self.hung.value:
+            time.sleep(0.05)
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(hung, ready):
+    """Run the stub server (in a child process) and report its port."""
+    FlakyOllama.hung = hung
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyOllama)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def phase(agent, turns):
+    """Median and worst milliseconds per turn."""
+    latencies = []
+    for i in range(turns):
+        start = time.perf_counter()
+        agent.interact(f"How do I find peace? ({i})")
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.1)
+    return statistics.median(latencies), max(latencies)
+
+
+def main():
+    """Run the benchmark."""
+    timeout = (int(sys.argv[1]) if len(sys.argv) > 1 else 1000) / 1000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    hung = multiprocessing.Value("b", 0)
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(hung, ready), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{ready.get()}"
+
+    def plain():
+        return OllamaClient(base_url=base_url, timeout=timeout)
+
+    def guarded():
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, name="bench.circuit")
+        prober = HealthProber(plain().is_available, interval=0.5, breaker=breaker, name="bench.health")
+        return GuardedLLMClient(plain(), breaker, prober)
+
+    print(f"HTTP timeout {timeout * 1000:.0f} ms, {turns} turns per phase (median / worst ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(root=Path(tmp))
+        for label, make in (("plain", plain), ("circuit breaker", guarded)):
+            agent = SpiritualAgent(session_id=label.replace(" ", "-"), memory_store=store)
+            agent.llm_client, agent.llm_budget = make(), None
+            results = []
+            for outage in (False, True, False):
+                hung.value = outage
+                # Give the prober a moment to notice the change, as time between turns would
+                time.sleep(3 if outage else 1)
+                results.append(phase(agent, turns))
+            print(f"  {label:<16}" + "".join(
+                f"  {name} {median:6.1f} / {worst:6.1f}"
+                for name, (median, worst) in zip(("healthy", "outage", "recovered"), results)))
+            if isinstance(agent.llm_client, GuardedLLMClient):
+                agent.llm_client.prober.close()
+            agent.close()
+        store.close()
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark ContextAnalyzer.analyze() against the previous substring scans.
+
+The previous implementation ran four passes of ``kw in message`` over every
+keyword list; it is reproduced here for comparison. Run with:
+python benchmarks/bench_context_analyzer.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.reasoning.context_analyzer import ContextAnalyzer
+
+LENGTHS = [10, 100, 1_000, 10_000]  # words per message
+MESSAGES = 200
+
+
+def substring_analyze(analyzer: ContextAnalyzer, message: str) -> dict:
+    """The previous analyze(): one substring pass per keyword table."""
+    message_lower = message.lower()
+
+    def best(table):
+        scores = {}
+        for label, keywords in table.items():
+            score = sum(1 for kw in keywords if kw in message_lower)
+            if score > 0:
+                scores[label] = score
+        return max(scores, key=scores.get) if scores else None
+
+    return {
+        "emotion": best(analyzer.emotion_keywords),
+        "intent": best(analyzer.intent_patterns) or "general_conversation",
+        "is_crisis": any(kw in message_lower for kw in analyzer.crisis_keywords),
+        "themes": [
+            theme for theme, keywords in analyzer.theme_keywords.items()
+            if any(kw in message_lower for kw in keywords)
+        ],
+        "message_length": len(message),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    analyzer = ContextAnalyzer()
+    rng = random.Random(0)
+    keywords = list(analyzer._matcher.keywords)
+    filler = ["the", "day", "was", "long", "and", "i", "walked", "home", "slowly",
+              "thinking", "about", "everything", "that", "happened", "today"]
+
+    print(f"{'words':>8} {'substring (us)':>16} {'matcher (us)':>16} {'speedup':>8}")
+    for length in LENGTHS:
+        messages = [
+            " ".join(rng.choice(keywords) if rng.random() < 0.05 else rng.choice(filler)
+                     for _ in range(length))
+            for _ in range(MESSAGES)
+        ]
+
+        start = time.perf_counter()
+        for message in messages:
+            substring_analyze(analyzer, message)
+        legacy = (time.perf_counter() - start) / MESSAGES * 1e6
+
+        start = time.perf_counter()
+        for message in messages:
+            analyzer.analyze(message)
+        matcher = (time.perf_counter() - start) / MESSAGES * 1e6
+
+        print(f"{length:>8} {legacy:>16.1f} {matcher:>16.1f} {legacy / matcher:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark backend intent routing for /api/chat.
+
+Compares the compiled rule table in backend/main.py with the previous
+chain of ``any(word in msg_lower for word in [...])`` checks (reproduced
+here), then measures end-to-end /api/chat throughput in-process. Run with:
+python benchmarks/bench_intent_routing.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+import main as backend  # noqa: E402
+
+ROUTING_MESSAGES = 20_000
+CHAT_REQUESTS = 2_000
+
+
+def legacy_detect_deity(msg):
+    if 'krishna' in msg: return "Krishna"
+    if 'rama' in msg: return "Rama"
+    if 'hanuman' in msg: return "Hanuman"
+    if 'shiva' in msg: return "Shiva"
+    if 'vishnu' in msg: return "Vishnu"
+    if 'lakshmi' in msg: return "Lakshmi"
+    if 'saraswati' in msg: return "Saraswati"
+    return "General"
+
+
+def legacy_detect_mantra(msg):
+    if 'gayatri' in msg: return "gayatri_mantra"
+    if 'namah shivaya' in msg: return "om_namah_shivaya"
+    if 'hanuman' in msg: return "hanuman_chalisa"
+    if 'vishnu' in msg: return "vishnu_sahasranamam"
+    return "general"
+
+
+def legacy_detect_intent(message):
+    """The previous detect_intent()."""
+    msg_lower = message.lower()
+    if any(word in msg_lower for word in ['bhajan', 'devotional song', 'spiritual song', 'kirtan']):
+        return {"intent": "PLAY_BHAKTI_SONG", "deity": legacy_detect_deity(msg_lower)}
+    if any(word in msg_lower for word in ['mantra', 'chant', 'recite', 'chanting']):
+        return {"intent": "CHANT_MANRA", "mantra": legacy_detect_mantra(msg_lower)}
+    if 'gayatri' in msg_lower:
+        return {"intent": "PLAY_GAYATRI", "content": backend.BHakti_CONTENT["gayatri_mantra"]}
+    if any(word in msg_lower for word in ['shiva', 'shivaya', 'rudra']):
+        return {"intent": "PLAY_SHIVA", "content": backend.BHakti_CONTENT["om_namah_shivaya"]}
+    if any(word in msg_lower for word in ['hanuman', 'anjaneya', 'maruti']):
+        return {"intent": "PLAY_HANUMAN", "content": backend.BHakti_CONTENT["hanuman_chalisa"]}
+    if any(word in msg_lower for word in ['vishnu', 'narayana', 'krishna', 'rama']):
+        return {"intent": "PLAY_VISHNU", "deity": "Vishnu"}
+    if any(word in msg_lower for word in ['meaning', 'explain', 'what is', 'understand']):
+        return {"intent": "EXPLAIN_MANTRAM", "item": legacy_detect_mantra(msg_lower)}
+    if any(word in msg_lower for word in ['morning', 'sunrise', 'prayer']):
+        return {"intent": "MORNING_PRAYER", "routine": backend.MORNING_ROUTINE}
+    if any(word in msg_lower for word in ['evening', 'night', 'bedtime']):
+        return {"intent": "EVENING_PRACTICE", "routine": backend.EVENING_ROUTINE}
+    if any(word in msg_lower for word in ['meditate', 'meditation', 'dhyana']):
+        return {"intent": "MEDITATION", "type": "general"}
+    return {"intent": "GENERAL_CHAT", "message": message}
+
+
+def make_messages(count, words=(4, 20), seed=0):
+    """Random messages; about half mention a routing keyword."""
+    rng = random.Random(seed)
+    keywords = [kw for table in (backend._INTENTS, backend._DEITIES, backend._MANTRAS)
+                for kw in table.keywords]
+    filler = ["please", "can", "you", "help", "me", "with", "something", "today",
+              "i", "would", "like", "to", "hear", "a", "the", "for", "my", "family"]
+    messages = []
+    for _ in range(count):
+        text = [rng.choice(filler) for _ in range(rng.randint(*words))]
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            text.insert(rng.randrange(len(text) + 1), rng.choice(keywords).title())
+        messages.append(" ".join(text))
+    return messages
+
+
+def rate(func, messages):
+    """Calls per second of func over messages."""
+    start = time.perf_counter()
+    for message in messages:
+        func(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark."""
+    print(f"detect_intent, {ROUTING_MESSAGES} messages")
+    print(f"{'words':>10} {'any() chain':>14} {'compiled':>14} {'speedup':>8}")
+    for words in [(4, 20), (50, 100), (200, 400)]:
+        messages = make_messages(ROUTING_MESSAGES, words)
+        mismatches = sum(backend.detect_intent(m) != legacy_detect_intent(m) for m in messages)
+        assert mismatches == 0, f"{mismatches} routing mismatches"
+
+        legacy = rate(legacy_detect_intent, messages)
+        compiled = rate(backend.detect_intent, messages)
+        label = f"{words[0]}-{words[1]}"
+        print(f"{label:>10} {legacy:>10,.0f}/s {compiled:>10,.0f}/s {compiled / legacy:>7.2f}x")
+
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:
+        print("fastapi.testclient unavailable; skipping /api/chat")
+        return
+    client = TestClient(backend.app)
+    chat = make_messages(CHAT_REQUESTS)
+    throughput = rate(lambda m: client.post("/api/chat", json={"message": m}), chat)
+    print(f"/api/chat (in-process), {CHAT_REQUESTS} requests")
+    print(f"  {throughput:>10,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
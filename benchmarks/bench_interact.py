@@ -0,0 +1,52 @@
+"""Benchmark SpiritualAgent.interact() latency against memory size.
+
+Compares the legacy synchronous snapshot rewrite with write-behind journal
+persistence. Run with: python benchmarks/bench_interact.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.agent import SpiritualAgent
+from src.memory.memory_manager import MemoryManager
+
+SIZES = [100, 1_000, 10_000]
+TURNS = 200
+CONTEXT = {"emotion": "sadness", "intent": "emotional_support", "is_crisis": False,
+           "themes": [], "message_length": 20}
+
+
+def bench(agent: SpiritualAgent, memory_size: int, **memory_options) -> float:
+    """Return mean interact() latency in milliseconds."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Seed through the journal and compact once, so setup costs the same in both modes
+        seed = MemoryManager(max_episodic=memory_size, data_dir=Path(data_dir), write_behind=False)
+        for i in range(memory_size):
+            seed.store(f"I feel sad about thing {i}", "I hear you.", CONTEXT)
+        seed.close()
+        memory = MemoryManager(max_episodic=memory_size, data_dir=Path(data_dir), **memory_options)
+        agent.memory = memory
+
+        start = time.perf_counter()
+        for i in range(TURNS):
+            agent.interact(f"I feel sad and lonely today {i}")
+        elapsed = time.perf_counter() - start
+        memory.close()
+    return elapsed / TURNS * 1000
+
+
+def main():
+    """Run the benchmark."""
+    agent = SpiritualAgent()
+    print(f"{'memories':>10} {'sync snapshot (ms)':>20} {'write-behind (ms)':>20}")
+    for size in SIZES:
+        sync = bench(agent, size, storage="snapshot", write_behind=False)
+        behind = bench(agent, size, storage="journal", write_behind=True)
+        print(f"{size:>10} {sync:>20.3f} {behind:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
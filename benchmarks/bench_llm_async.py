@@ -0,0 +1,118 @@
+"""Benchmark concurrent LLM completions: threads vs acomplete().
+
+A local stub of the Ollama API, in its own process, answers every request
+after a fixed delay standing in for generation time. Many concurrent completions are issued
+through blocking complete() on a thread pool and through acomplete() on
+one event loop. Run with:
+python benchmarks/bench_llm_async.py [concurrency] [delay_ms]
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.llm_client import OllamaClient  # noqa: E402
+
+REPLY = json.dumps({"response": "Breathe in, breathe out.", "done": True}).encode()
+THREADS = 10
+
+
+class SlowOllama(BaseHTTPRequestHandler):
+    """Ollama stand-in that takes ``delay`` seconds per generation."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled or timed out
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def serve(delay, ready):
+    """Run the stub server (in a child process) and report its port."""
+    SlowOllama.delay = delay
+    server = StubServer(("127.0.0.1", 0), SlowOllama)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    """Run the benchmark."""
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    SlowOllama.delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 500) / 1000
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(SlowOllama.delay, ready), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{ready.get()}"
+    messages = [{"role": "user", "content": "How do I find peace?"}]
+    context = {"emotion": "peace"}
+    print(f"{concurrency} completions, {SlowOllama.delay * 1000:.0f} ms each")
+
+    client = OllamaClient(base_url=base_url, pool_maxsize=THREADS)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(lambda _: client.complete(messages, context), range(concurrency)))
+    elapsed = time.perf_counter() - start
+    print(f"  complete() on {THREADS} threads  {elapsed:7.2f} s  {concurrency / elapsed:8.1f} req/s")
+    client.close()
+
+    async def run_async():
+        client = OllamaClient(base_url=base_url)
+        await client.acomplete(messages, context)  # open the client outside the timing
+        start = time.perf_counter()
+        await asyncio.gather(*(client.acomplete(messages, context) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        print(f"  acomplete() on one loop     {elapsed:7.2f} s  {concurrency / elapsed:8.1f} req/s")
+
+        # Cancellation and timeouts reach the caller promptly
+        task = asyncio.create_task(client.acomplete(messages, context))
+        await asyncio.sleep(SlowOllama.delay / 4)
+        task.cancel()
+        start = time.perf_counter()
+        try:
+            await task
+        except asyncio.CancelledError:
+            print(f"  cancelled in-flight call    {(time.perf_counter() - start) * 1000:7.2f} ms")
+        await client.aclose()
+
+        impatient = OllamaClient(base_url=base_url, timeout=SlowOllama.delay / 4)
+        start = time.perf_counter()
+        try:
+            await impatient.acomplete(messages, context)
+        except Exception as e:
+            print(f"  timed out ({type(e).__name__}) after {(time.perf_counter() - start) * 1000:.0f} ms")
+        await impatient.aclose()
+
+    asyncio.run(run_async())
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark the per-turn LLM latency budget.
+
+A stub Ollama server in its own process answers after ``delay_ms``, slower
+than the agent's budget. Each turn is asked twice, a little over
+``delay_ms`` apart: the first answer is the rule-based fallback once the
+budget runs out, and the second comes from the response cache that the
+late LLM reply landed in. Without a budget every turn waits for the model.
+Run with:
+python benchmarks/bench_llm_budget.py [delay_ms] [budget_ms]
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.agent import SpiritualAgent  # noqa: E402
+from src.memory.store import MemoryStore  # noqa: E402
+from src.utils.metrics import get_metrics  # noqa: E402
+
+REPLY = "Breathe in slowly, and let each breath settle the mind. "
+MESSAGES = ["Guide me in meditation", "I feel anxious about work", "How do I practice gratitude?"]
+
+
+class SlowOllama(BaseHTTPRequestHandler):
+    """Ollama stand-in that takes ``delay`` seconds per reply."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 1.0
+
+    def do_GET(self):
+        self._send({"models": []})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        time.sleep(self.delay)
+        message = {"role": "assistant", "content": REPLY}
+        if request.get("stream"):
+            body = (json.dumps({"message": message, "done": False}) + "\n" + json.dumps({"done": True}) + "\n")
+            self._send_raw(body.encode(), "application/x-ndjson")
+        else:
+            self._send({"message": message, "done": True})
+
+    def _send(self, reply):
+        self._send_raw(json.dumps(reply).encode(), "application/json")
+
+    def _send_raw(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(delay, ready):
+    """Run the stub server (in a child process) and report its port."""
+    SlowOllama.delay = delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowOllama)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def turn_ms(agent, message, loop):
+    """Milliseconds until the whole reply to one turn is available (streamed if there is a loop)."""
+    start = time.perf_counter()
+    if loop is not None:
+        async def collect():
+            return "".join([token async for token in agent.astream_interact(message)])
+        loop.run_until_complete(collect())
+    else:
+        agent.interact(message)
+    return (time.perf_counter() - start) * 1000
+
+
+def pause(seconds, loop):
+    """Wait, letting late streams on the loop run meanwhile."""
+    if loop is not None:
+        loop.run_until_complete(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
+
+
+def main():
+    """Run the benchmark."""
+    delay = (int(sys.argv[1]) if len(sys.argv) > 1 else 1000) / 1000
+    budget = (int(sys.argv[2]) if len(sys.argv) > 2 else 250) / 1000
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(delay, ready), daemon=True)
+    server.start()
+    os.environ["LLM_PROVIDER"] = "ollama"
+    os.environ["OLLAMA_BASE_URL"] = f"http://127.0.0.1:{ready.get()}"
+
+    print(f"LLM takes {delay * 1000:.0f} ms; budget {budget * 1000:.0f} ms (ms per turn)")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(root=Path(tmp))
+        # Late streams finish on the loop that started them, as in the backend
+        loop = asyncio.new_event_loop()
+        for streaming in (False, True):
+            mode = "astream_interact" if streaming else "interact"
+            turn_loop = loop if streaming else None
+            for label, limit in (("no budget", None), ("budgeted", budget)):
+                agent = SpiritualAgent(session_id=f"{mode}-{label}", memory_store=store)
+                agent.llm_budget = limit
+                first, second = [], []
+                for message in MESSAGES:
+                    # Vary the text so earlier runs cannot have cached it
+                    message = f"{message} ({mode}, {label})"
+                    first.append(turn_ms(agent, message, turn_loop))
+                    pause(delay + 0.2, turn_loop)
+                    second.append(turn_ms(agent, message, turn_loop))
+                print(f"  {mode:<17} {label:<10} first ask {sum(first) / len(first):7.1f}"
+                      f"   asked again {sum(second) / len(second):7.1f}")
+                agent.close()
+        loop.close()
+        store.close()
+
+    snapshot = get_metrics().snapshot()
+    print("  budget hits {} misses {}  late replies p50 {:.0f} ms".format(
+        snapshot["agent.llm_budget.hits"]["value"],
+        snapshot["agent.llm_budget.misses"]["value"],
+        snapshot["agent.llm_budget.late_seconds"]["p50"] * 1000))
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark per-call HTTP overhead of the LLM clients.
+
+Starts a local stub of the Ollama API (HTTP/1.1 with keep-alive) and
+compares one-off ``requests.post`` calls, as the clients made before, with
+OllamaClient's pooled session. The stub answers instantly, so the numbers
+are pure client and connection overhead. Run with:
+python benchmarks/bench_llm_http.py
+"""
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests  # noqa: E402
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.llm_client import OllamaClient  # noqa: E402
+
+CALLS = 500
+REPLY_TEXT = "Breathe in, breathe out."
+# Shaped like a non-streaming /api/chat reply
+REPLY = json.dumps({"message": {"role": "assistant", "content": REPLY_TEXT}, "done": True}).encode()
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Minimal Ollama stand-in that keeps connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    # Like real servers; otherwise Nagle stalls keep-alive replies ~40 ms
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubOllama.connections += 1
+
+    def do_GET(self):
+        self._reply(b'{"models":[]}')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(REPLY)
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(call):
+    """Per-call latencies in microseconds, plus connections opened."""
+    StubOllama.connections = 0
+    latencies = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies, StubOllama.connections
+
+
+def report(label, latencies, connections):
+    latencies.sort()
+    print(f"  {label:<28} p50 {statistics.median(latencies):7.0f} us"
+          f"  p99 {latencies[int(len(latencies) * 0.99)]:7.0f} us"
+          f"  connections {connections}")
+
+
+def main():
+    """Run the benchmark."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    messages = [{"role": "user", "content": "How do I find peace?"}]
+    context = {"emotion": "peace", "intent": "spiritual_question"}
+
+    client = OllamaClient(base_url=base_url)
+    payload = {"model": client.model, "messages": messages, "stream": False}
+
+    # A stub reply the client cannot parse would time nothing useful
+    reply = client.complete(messages, context)
+    assert reply == REPLY_TEXT, f"unexpected reply from the stub: {reply!r}"
+
+    print(f"{CALLS} calls against a local stub server")
+    report("requests.post per call", *measure(
+        lambda: requests.post(client.api_url, json=payload, timeout=120).json()))
+    report("requests.get per call", *measure(
+        lambda: requests.get(f"{base_url}/api/tags", timeout=2)))
+    report("pooled complete()", *measure(lambda: client.complete(messages, context)))
+    report("pooled is_available()", *measure(client.is_available))
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark time-to-first-token: complete() vs stream() vs astream().
+
+A stub server in its own process speaks Ollama's /api/chat (NDJSON) and
+OpenAI's /v1/chat/completions (server-sent events), emitting one token
+every ``token_ms``. The numbers come from the metrics registry the clients
+record into. Run with:
+python benchmarks/bench_llm_stream.py [tokens] [token_ms]
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.llm_client import OllamaClient, OpenAIClient  # noqa: E402
+from src.utils.metrics import get_metrics  # noqa: E402
+
+RUNS = 5
+
+
+class StreamingStub(BaseHTTPRequestHandler):
+    """Streams ``tokens`` tokens, ``delay`` seconds apart."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    tokens = 50
+    delay = 0.02
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        openai = self.path.startswith("/v1/")
+        if not request.get("stream"):
+            time.sleep(self.tokens * self.delay)
+            text = "word " * self.tokens
+            message = {"role": "assistant", "content": text}
+            reply = {"choices": [{"message": message}]} if openai else {"message": message, "done": True}
+            body = json.dumps(reply).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if openai else "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(self.tokens):
+            time.sleep(self.delay)
+            if openai:
+                line = "data: " + json.dumps({"choices": [{"delta": {"content": "word "}}]}) + "\n\n"
+            else:
+                line = json.dumps({"message": {"role": "assistant", "content": "word "}, "done": False}) + "\n"
+            self._chunk(line.encode())
+        self._chunk(b"data: [DONE]\n\n" if openai else json.dumps({"done": True}).encode() + b"\n")
+        self._chunk(b"")
+
+    def _chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(tokens, delay, ready):
+    """Run the stub server (in a child process) and report its port."""
+    StreamingStub.tokens, StreamingStub.delay = tokens, delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingStub)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def timed_complete(client, messages, context):
+    """complete(): the first token arrives with the last."""
+    start = time.perf_counter()
+    client.complete(messages, context)
+    get_metrics().histogram(f"bench.{client.provider_name.lower()}.complete").observe(
+        time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark."""
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(tokens, delay, ready), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{ready.get()}"
+
+    ollama = OllamaClient(base_url=base_url)
+    openai = OpenAIClient(api_key="test")
+    openai.api_url = f"{base_url}/v1/chat/completions"
+    messages = [{"role": "user", "content": "How do I find peace?"}]
+    context = {"emotion": "peace"}
+
+    for client in (ollama, openai):
+        for _ in range(RUNS):
+            timed_complete(client, messages, context)
+            text = "".join(client.stream(messages, context))
+            assert text == "word " * tokens, text
+
+    async def run_async():
+        for client in (ollama, openai):
+            for _ in range(RUNS):
+                text = "".join([token async for token in client.astream(messages, context)])
+                assert text == "word " * tokens, text
+            await client.aclose()
+
+    # The async runs add to the same histograms as stream()
+    asyncio.run(run_async())
+
+    snapshot = get_metrics().snapshot()
+    print(f"{tokens} tokens, {delay * 1000:.0f} ms apart, {RUNS} runs each (p50, ms)")
+    for name in ("ollama", "openai"):
+        complete = snapshot[f"bench.{name}.complete"]["p50"] * 1000
+        ttft = snapshot[f"llm.{name}.time_to_first_token"]["p50"] * 1000
+        total = snapshot[f"llm.{name}.stream_duration"]["p50"] * 1000
+        print(f"  {name:<7} complete() {complete:7.1f}   stream TTFT {ttft:6.1f}   stream total {total:7.1f}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
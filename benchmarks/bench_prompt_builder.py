@@ -0,0 +1,80 @@
+"""Benchmark prompt assembly.
+
+Compares the previous OllamaClient system prompt, concatenated from a
+literal on every call, with PromptBuilder's cached one (checking they are
+identical), and the previous five-turn history with the token-budgeted
+history on conversations of growing verbosity. Run with:
+python benchmarks/bench_prompt_builder.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.constants import SYSTEM_PROMPT  # noqa: E402
+from src.core.prompt_builder import PromptBuilder, approx_tokens  # noqa: E402
+from src.memory.records import Interaction  # noqa: E402
+
+CALLS = 200_000
+CONTEXTS = [
+    {"emotion": emotion, "intent": intent}
+    for emotion in (None, "peace", "sadness", "fear")
+    for intent in (None, "meditation_request", "spiritual_question")
+]
+
+
+def legacy_system_prompt(context):
+    """The previous OllamaClient._build_system_prompt (SYSTEM_PROMPT was inlined verbatim)."""
+    base_prompt = SYSTEM_PROMPT
+    emotion = context.get("emotion")
+    intent = context.get("intent")
+    if emotion:
+        base_prompt += f"\n\nThe user seems to be feeling: {emotion}"
+    if intent:
+        base_prompt += f"\nThe user's intent appears to be: {intent}"
+    return base_prompt
+
+
+def legacy_history(memories):
+    """The previous SpiritualAgent history: the last five exchanges, whatever their length."""
+    messages = []
+    for mem in memories[-5:]:
+        messages.append({"role": "user", "content": mem.user})
+        messages.append({"role": "assistant", "content": mem.agent})
+    return messages
+
+
+def tokens(messages):
+    return sum(approx_tokens(m["content"]) for m in messages)
+
+
+def main():
+    """Run the benchmark."""
+    builder = PromptBuilder()
+    for context in CONTEXTS:
+        assert builder.system_prompt(context) == legacy_system_prompt(context)
+
+    print(f"System prompt, {CALLS} calls over {len(CONTEXTS)} contexts")
+    for label, build in (("rebuilt per call", legacy_system_prompt), ("cached", builder.system_prompt)):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            build(CONTEXTS[i % len(CONTEXTS)])
+        print(f"  {label:<18} {(time.perf_counter() - start) / CALLS * 1e9:6.0f} ns/call")
+
+    print(f"History tokens (estimated), budget {builder.history_token_budget}")
+    for words in (20, 100, 400, 1000):
+        memories = [
+            Interaction(user=f"question {i} " + "word " * words, agent=f"answer {i} " + "reply " * words,
+                        timestamp=float(i))
+            for i in range(10)
+        ]
+        legacy = legacy_history(memories)
+        trimmed = builder.history(memories)
+        print(f"  {words:>5}-word turns   last five {tokens(legacy):6d} tokens"
+              f"   budgeted {tokens(trimmed):5d} tokens ({len(trimmed) // 2} turns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark MemoryManager.recall() at 100k episodic memories.
+
+Run with: python benchmarks/bench_recall.py
+"""
+import random
+import sys
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory.memory_manager import MemoryManager
+
+MEMORIES = 100_000
+QUERIES = 1_000
+VOCABULARY = 20_000
+WORDS = [f"w{rank}" for rank in range(1, VOCABULARY + 1)]
+CUM_WEIGHTS = list(accumulate(1 / rank for rank in range(1, VOCABULARY + 1)))
+CONTEXT = {"emotion": "sadness", "intent": "emotional_support", "is_crisis": False,
+           "themes": [], "message_length": 40}
+
+
+def sentence(rng: random.Random) -> str:
+    """Build a synthetic message with a Zipf-like word distribution."""
+    words = rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=rng.randint(4, 14))
+    return " ".join(words)
+
+
+def main():
+    """Run the benchmark."""
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as data_dir:
+        memory = MemoryManager(max_episodic=MEMORIES, data_dir=Path(data_dir),
+                               compact_threshold=MEMORIES * 2)
+
+        start = time.perf_counter()
+        for _ in range(MEMORIES):
+            memory.store(sentence(rng), "I hear you.", CONTEXT)
+        build = time.perf_counter() - start
+
+        queries = [sentence(rng) for _ in range(QUERIES)]
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            memory.recall(query, top_k=5)
+            timings.append(time.perf_counter() - start)
+        memory.close(compact=False)
+
+    timings.sort()
+    print(f"stored {MEMORIES} memories in {build:.2f}s")
+    print(f"recall p50 {timings[len(timings) // 2] * 1000:.3f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the LLM response cache on repeated turns.
+
+Replays the user messages in data/user_data/memories.json (each with a few
+casing and punctuation variants, as people retype them) against a client
+that takes ``latency_ms`` per completion, with and without CachedLLMClient.
+A second cache opened on the same SQLite file shows the warm on-disk tier.
+Run with:
+python benchmarks/bench_response_cache.py [rounds] [latency_ms]
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.llm_client import CachedLLMClient, MockClient  # noqa: E402
+from src.core.response_cache import ResponseCache  # noqa: E402
+from src.reasoning.context_analyzer import ContextAnalyzer  # noqa: E402
+from src.utils.metrics import get_metrics  # noqa: E402
+
+
+class SlowClient(MockClient):
+    """Mock responses after a fixed delay, standing in for a real model."""
+
+    provider_name = "Slow"
+    model = "bench"
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def complete(self, messages, context):
+        time.sleep(self.latency)
+        return super().complete(messages, context)
+
+
+def workload(rounds):
+    """Turns from the stored memories, with retyped variants."""
+    memories = json.loads((ROOT / "data" / "user_data" / "memories.json").read_text())
+    messages = [m["user"] for m in memories.get("episodic", [])]
+    variants = [m for message in messages for m in (message, message.lower() + "?", f"  {message.upper()}!  ")]
+    analyzer = ContextAnalyzer()
+    return [([{"role": "user", "content": m}], analyzer.analyze(m)) for m in variants] * rounds
+
+
+def run(client, turns):
+    """Seconds to answer every turn."""
+    start = time.perf_counter()
+    for messages, context in turns:
+        client.complete(messages, context)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    turns = workload(rounds)
+    crisis = sum(1 for _, context in turns if context.get("is_crisis"))
+    print(f"{len(turns)} turns ({crisis} crisis), {latency * 1000:.0f} ms per completion")
+
+    print(f"  uncached                {run(SlowClient(latency), turns):7.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk_path = Path(tmp) / "responses.sqlite"
+        cache = ResponseCache(disk_path=disk_path)
+        cached = CachedLLMClient(SlowClient(latency), cache)
+        elapsed = run(cached, turns)
+        hits = get_metrics().counter("llm.cache.hits").value
+        misses = get_metrics().counter("llm.cache.misses").value
+        print(f"  cached (cold)           {elapsed:7.2f} s   hits {hits}  misses {misses}"
+              f"  entries {len(cache)}  bytes {cache.size_bytes}")
+        cache.close()
+
+        reopened = CachedLLMClient(SlowClient(latency), ResponseCache(disk_path=disk_path))
+        print(f"  cached (disk tier warm) {run(reopened, turns):7.2f} s")
+        reopened.cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark single-flight coalescing of identical concurrent LLM calls.
+
+A stub Ollama server in its own process streams a reply over ``delay_ms``
+and counts the generations it was asked for. ``callers`` users then send
+the same prompt at once, through threads (complete, stream) and asyncio
+(acomplete, astream), with and without CoalescingLLMClient. Run with:
+python benchmarks/bench_single_flight.py [callers] [delay_ms]
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
+from src.core.llm_client import CoalescingLLMClient, OllamaClient  # noqa: E402
+
+TOKENS = 20
+REPLY = "peace " * TOKENS
+
+
+class CountingStub(BaseHTTPRequestHandler):
+    """Ollama stand-in that counts generations; GET /count reads and resets the count."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.2
+    generations = None
+
+    def do_GET(self):
+        with self.generations.get_lock():
+            count, self.generations.value = self.generations.value, 0
+        self._send(json.dumps({"count": count}).encode(), "application/json")
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with self.generations.get_lock():
+            self.generations.value += 1
+        if not request.get("stream"):
+            time.sleep(self.delay)
+            reply = {"message": {"role": "assistant", "content": REPLY}, "done": True}
+            self._send(json.dumps(reply).encode(), "application/json")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for _ in range(TOKENS):
+            time.sleep(self.delay / TOKENS)
+            self._chunk(json.dumps({"message": {"content": "peace "}, "done": False}).encode() + b"\n")
+        self._chunk(json.dumps({"done": True}).encode() + b"\n")
+        self._chunk(b"")
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # Room for every caller to connect at once
+    request_queue_size = 1024
+
+
+def serve(delay, generations, ready):
+    """Run the stub server (in a child process) and report its port."""
+    CountingStub.delay, CountingStub.generations = delay, generations
+    server = StubServer(("127.0.0.1", 0), CountingStub)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    """Run the benchmark."""
+    callers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+    generations = multiprocessing.Value("i", 0)
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(delay, generations, ready), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{ready.get()}"
+
+    messages = [{"role": "user", "content": "Guide me in meditation"}]
+    context = {"emotion": None, "intent": "meditation_request", "is_crisis": False}
+    http = {"pool_maxsize": callers, "async_pool_maxsize": callers}
+
+    def measure(client, mode):
+        if mode == "complete":
+            call = lambda _: client.complete(messages, context)  # noqa: E731
+        else:
+            call = lambda _: "".join(client.stream(messages, context))  # noqa: E731
+        start = time.perf_counter()
+        if mode in ("complete", "stream"):
+            with ThreadPoolExecutor(callers) as pool:
+                replies = list(pool.map(call, range(callers)))
+        else:
+            async def run():
+                if mode == "acomplete":
+                    calls = [client.acomplete(messages, context) for _ in range(callers)]
+                else:
+                    async def collect():
+                        return "".join([token async for token in client.astream(messages, context)])
+                    calls = [collect() for _ in range(callers)]
+                try:
+                    return await asyncio.gather(*calls)
+                finally:
+                    await client.aclose()
+            replies = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        assert all(reply == REPLY for reply in replies)
+        count = client.session.get(f"{base_url}/count").json()["count"]
+        return elapsed, count
+
+    print(f"{callers} identical concurrent turns, {delay * 1000:.0f} ms per generation")
+    for mode in ("complete", "stream", "acomplete", "astream"):
+        plain = OllamaClient(base_url=base_url, **http)
+        coalesced = CoalescingLLMClient(OllamaClient(base_url=base_url, **http))
+        for label, client in (("independent", plain), ("coalesced", coalesced)):
+            elapsed, count = measure(client, mode)
+            print(f"  {mode:<10} {label:<12} {elapsed * 1000:7.0f} ms   generations {count}")
+            client.close()
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
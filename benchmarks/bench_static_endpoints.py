@@ -0,0 +1,94 @@
+"""Benchmark the static bhakti endpoints.
+
+Compares the pre-rendered responses in backend/main.py with the previous
+handlers, which rebuilt a dict per call and let FastAPI serialize it. The
+previous handler is mounted on a scratch app here. Requests are driven
+straight through the ASGI interface, so no HTTP client or socket cost is
+included. Run with:
+python benchmarks/bench_static_endpoints.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from fastapi import FastAPI  # noqa: E402
+
+import main as backend  # noqa: E402
+
+REQUESTS = 20_000
+
+legacy_app = FastAPI()
+
+
+@legacy_app.get("/api/mantra/{mantra_id}")
+async def legacy_get_mantra(mantra_id: str):
+    """The previous /api/mantra handler."""
+    if mantra_id in backend.BHakti_CONTENT:
+        content = backend.BHakti_CONTENT[mantra_id]
+        return {
+            "name": content["name"],
+            "soundscape": content["soundscape"],
+            "telugu": content["telugu"],
+            "english": content["english"],
+            "meaning": content["meaning"],
+            "benefits": content["benefits"],
+            "audio_url": content["audio_url"]
+        }
+    return {"error": "Mantra not found"}
+
+
+async def call(app, path, headers=()):
+    """Send one GET through an ASGI app; return (status, body)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("bench", 80),
+        "client": ("127.0.0.1", 1),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = sent[0]["status"]
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return status, body
+
+
+def rate(app, path, headers=()):
+    """Requests per second for GET path."""
+    async def run():
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await call(app, path, headers)
+        return REQUESTS / (time.perf_counter() - start)
+    return asyncio.run(run())
+
+
+def main():
+    """Run the benchmark."""
+    path = "/api/mantra/gayatri_mantra"
+    legacy = asyncio.run(call(legacy_app, path))
+    current = asyncio.run(call(backend.app, path))
+    assert legacy == current
+    etag = backend.MANTRA_PAYLOADS["gayatri_mantra"].etag
+
+    print(f"GET {path}, {REQUESTS} requests")
+    print(f"  rebuilt + encoded per call  {rate(legacy_app, path):>8,.0f} req/s")
+    print(f"  pre-rendered (200)          {rate(backend.app, path):>8,.0f} req/s")
+    print(f"  pre-rendered (304)          {rate(backend.app, path, [('If-None-Match', etag)]):>8,.0f} req/s")
+    print(f"  body bytes saved per 304    {len(current[1]):>8}")
+
+
+if __name__ == "__main__":
+    main()
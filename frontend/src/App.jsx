@@ -15,6 +15,7 @@ function App() {
   const [selectedTab, setSelectedTab] = useState('chat')
   
   const messagesEndRef = useRef(null)
+  const sessionIdRef = useRef(null)
 
   const quickActions = [
     'Guide me in meditation',
@@ -63,6 +64,16 @@ Take a deep breath... and share whatever is on your heart. I'm here to listen wi
     return content.split('\n').map((line, i) => <p key={i}>{line}</p>)
   }
 
+  // The server remembers the conversation per session; without one, turns are not remembered
+  const getSessionId = async (renew = false) => {
+    if (renew || !sessionIdRef.current) {
+      const response = await fetch(`${API_BASE}/session`, { method: 'POST' })
+      if (!response.ok) throw new Error('Could not start a session')
+      sessionIdRef.current = (await response.json()).session_id
+    }
+    return sessionIdRef.current
+  }
+
   const handleSend = async (message = inputValue) => {
     if (!message.trim() || isLoading) return
 
@@ -73,17 +84,55 @@ Take a deep breath... and share whatever is on your heart. I'm here to listen wi
     setIsTyping(true)
 
     try {
-      const response = await fetch(`${API_BASE}/chat`, {
+      const send = async (renew) => fetch(`${API_BASE}/chat/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: message.trim(), context: {} })
+        body: JSON.stringify({ message: message.trim(), context: {}, session_id: await getSessionId(renew) })
       })
 
+      let response = await send(false)
+      // The server no longer accepts our session (e.g. it restarted): start a new one
+      if (response.status === 403) response = await send(true)
+
       if (!response.ok) throw new Error('Network response was not ok')
 
-      const data = await response.json()
-      const agentMessage = { role: 'agent', content: data.response }
-      setMessages(prev => [...prev, agentMessage])
+      // Server-Sent Events: show the reply as its tokens arrive
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      let started = false
+
+      const handleEvent = (event, data) => {
+        if (event === 'error') throw new Error(data.detail)
+        if (event !== 'token') return
+        if (!started) {
+          started = true
+          setIsTyping(false)
+          setMessages(prev => [...prev, { role: 'agent', content: data.text }])
+        } else {
+          setMessages(prev => {
+            const last = prev[prev.length - 1]
+            return [...prev.slice(0, -1), { ...last, content: last.content + data.text }]
+          })
+        }
+      }
+
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const events = buffer.split('\n\n')
+        buffer = events.pop()
+        for (const block of events) {
+          let event = 'message'
+          let data = ''
+          for (const line of block.split('\n')) {
+            if (line.startsWith('event: ')) event = line.slice(7)
+            else if (line.startsWith('data: ')) data += line.slice(6)
+          }
+          if (data) handleEvent(event, JSON.parse(data))
+        }
+      }
     } catch (error) {
       console.error('Error:', error)
       setMessages(prev => [...prev, {
@@ -0,0 +1,188 @@
+"""Admission control: bounded concurrency with a priority queue."""
+from typing import Optional
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+from src.utils.metrics import get_metrics
+
+CRISIS = 0
+NORMAL = 1
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a call cannot start within the admission deadline."""
+
+
+class _Waiter:
+    """A queued call; ``granted`` flips under the controller lock when it is given a slot."""
+
+    __slots__ = ("granted", "abandoned", "event", "future", "loop")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.granted = False
+        self.abandoned = False
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """Lets at most ``max_concurrent`` calls run at once; the rest queue by priority.
+
+    A freed slot goes to the waiting call with the lowest priority number
+    (``CRISIS`` before ``NORMAL``), first come first served within a
+    priority. A call is rejected with AdmissionRejected instead of queueing
+    when the queue is full or the expected wait, estimated from recent call
+    durations, is beyond ``max_wait``; one that has queued for ``max_wait``
+    seconds gives up the same way.
+
+    Metrics, under ``name``: ``queue_depth`` and ``in_flight`` gauges, a
+    ``wait_seconds`` histogram, and ``admitted``/``rejected`` counters.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        max_queue: int = 64,
+        max_wait: Optional[float] = 5.0,
+        name: str = "llm.admission",
+    ):
+        """Initialize the controller.
+
+        Args:
+            max_concurrent: Calls allowed to run at once
+            max_queue: Calls allowed to wait at once
+            max_wait: Seconds a call may wait to start, or None to wait indefinitely
+            name: Metrics prefix
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self._in_flight = 0
+        self._queue: list = []
+        self._queued = 0
+        self._order = itertools.count()
+        self._service_time: Optional[float] = None
+        self._lock = threading.Lock()
+        metrics = get_metrics()
+        self._depth = metrics.gauge(f"{name}.queue_depth")
+        self._running = metrics.gauge(f"{name}.in_flight")
+        self._wait = metrics.histogram(f"{name}.wait_seconds")
+        self._admitted = metrics.counter(f"{name}.admitted")
+        self._rejected = metrics.counter(f"{name}.rejected")
+
+    def acquire(self, priority: int = NORMAL) -> float:
+        """Wait for a slot.
+
+        Returns:
+            The time the slot was granted, to pass to ``release()``
+
+        Raises:
+            AdmissionRejected: If no slot frees up within ``max_wait``
+        """
+        started = time.perf_counter()
+        waiter = self._enqueue(priority, None)
+        if waiter is not None:
+            waiter.event.wait(self.max_wait)
+            self._settle(waiter)
+        return self._admit(started)
+
+    async def aacquire(self, priority: int = NORMAL) -> float:
+        """Async variant of ``acquire()``."""
+        started = time.perf_counter()
+        waiter = self._enqueue(priority, asyncio.get_running_loop())
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                if self._settle(waiter, raise_rejected=False):
+                    with self._lock:
+                        self._hand_off()
+                raise
+            self._settle(waiter)
+        return self._admit(started)
+
+    def release(self, granted_at: float) -> None:
+        """Free a slot taken by ``acquire()``, handing it to the next queued call."""
+        duration = time.perf_counter() - granted_at
+        with self._lock:
+            # Smoothed call duration, for estimating how long a new call would wait
+            self._service_time = duration if self._service_time is None else 0.8 * self._service_time + 0.2 * duration
+            self._hand_off()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _enqueue(self, priority: int, loop: Optional[asyncio.AbstractEventLoop]) -> Optional[_Waiter]:
+        """Take a free slot (returns None) or join the queue (returns the waiter)."""
+        with self._lock:
+            if self._in_flight < self.max_concurrent and not self._queued:
+                self._in_flight += 1
+                self._running.set(self._in_flight)
+                return None
+            if self._queued >= self.max_queue or self._expected_wait(priority) > (self.max_wait or float("inf")):
+                self._rejected.inc()
+                raise AdmissionRejected("LLM backend is saturated")
+            waiter = _Waiter(loop)
+            heapq.heappush(self._queue, (priority, next(self._order), waiter))
+            self._queued += 1
+            self._depth.set(self._queued)
+            return waiter
+
+    def _hand_off(self) -> None:
+        """Give a freed slot to the next queued call, if any (called with the lock held)."""
+        while self._queue:
+            waiter = heapq.heappop(self._queue)[2]
+            if not waiter.abandoned:
+                self._queued -= 1
+                self._depth.set(self._queued)
+                waiter.granted = True
+                waiter.wake()
+                return
+        self._in_flight -= 1
+        self._running.set(self._in_flight)
+
+    def _expected_wait(self, priority: int) -> float:
+        if self._service_time is None:
+            return 0.0
+        ahead = sum(1 for p, _, w in self._queue if p <= priority and not w.abandoned)
+        return (ahead // self.max_concurrent + 1) * self._service_time
+
+    def _settle(self, waiter: _Waiter, raise_rejected: bool = True) -> bool:
+        """After waiting: whether the waiter holds a slot; otherwise withdraw it (and reject)."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiter.abandoned = True
+            self._queued -= 1
+            self._depth.set(self._queued)
+        if raise_rejected:
+            self._rejected.inc()
+            raise AdmissionRejected("Timed out waiting for the LLM backend")
+        return False
+
+    def _admit(self, started: float) -> float:
+        granted_at = time.perf_counter()
+        self._wait.observe(granted_at - started)
+        self._admitted.inc()
+        return granted_at
@@ -1,13 +1,314 @@
 """SpiritualAgent main class - orchestrates all subsystems."""
 import os
-from typing import Dict, Any, List, Optional
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, List, Optional, AsyncIterator, Set, Tuple
 from pathlib import Path
 
-from src.core.constants import SYSTEM_PROMPT
+from src.core.config import load_config
+from src.core.prompt_builder import get_prompt_builder
 from src.memory.memory_manager import MemoryManager
+from src.memory.records import Interaction
+from src.memory.store import MemoryStore
 from src.reasoning.context_analyzer import ContextAnalyzer
 from src.dialogue.conversation_handler import ConversationHandler
-from src.core.llm_client import get_llm_client, LLMClient
+from src.core.admission import AdmissionController, AdmissionRejected
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError, HealthProber
+from src.core.llm_client import (
+    get_llm_client, LLMClient, LLMClientWrapper, AdmittedLLMClient, CachedLLMClient, CoalescingLLMClient,
+    GuardedLLMClient, MockClient,
+)
+from src.core.response_cache import ResponseCache
+from src.core.single_flight import SingleFlight
+from src.utils.metrics import get_metrics
+
+_memory_store: Optional[MemoryStore] = None
+_response_cache: Optional[ResponseCache] = None
+_single_flight: Optional[SingleFlight] = None
+_llm_executor: Optional[ThreadPoolExecutor] = None
+# Calls running or queued on the executor, bounded by llm_workers + llm_queue
+_llm_slots: Optional[threading.BoundedSemaphore] = None
+_llm_guards: Dict[str, Tuple[CircuitBreaker, HealthProber]] = {}
+_admission: Dict[str, AdmissionController] = {}
+_context_analyzer: Optional[ContextAnalyzer] = None
+_conversation_handler: Optional[ConversationHandler] = None
+_llm_client: Optional[LLMClient] = None
+# When the shared client is a MockClient standing in for an unreachable provider,
+# the time to try the provider again
+_llm_client_retry_at: Optional[float] = None
+_shared_lock = threading.Lock()
+# Held while the shared LLM client is created, which probes the provider
+_llm_client_lock = threading.Lock()
+_response_cache_lock = threading.Lock()
+_llm_executor_lock = threading.Lock()
+# Streams still running after their turn fell back, kept alive until they finish
+_late_streams: Set["asyncio.Task"] = set()
+
+
+def get_memory_store() -> MemoryStore:
+    """Get the process-wide per-session memory store."""
+    global _memory_store
+    if _memory_store is None:
+        with _shared_lock:
+            if _memory_store is None:
+                settings = load_config().get("memory") or {}
+                _memory_store = MemoryStore(
+                    max_resident=settings.get("max_resident_sessions", 1000),
+                    **_memory_options(settings),
+                )
+    return _memory_store
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide LLM response cache, or None if it is disabled."""
+    global _response_cache
+    settings = (load_config().get("llm") or {}).get("cache") or {}
+    if not settings.get("enabled", False):
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                disk_path = settings.get("disk_path")
+                if disk_path and not Path(disk_path).is_absolute():
+                    disk_path = Path(__file__).parent.parent.parent / disk_path
+                _response_cache = ResponseCache(
+                    max_entries=settings.get("max_entries", 1024),
+                    max_bytes=settings.get("max_bytes", 4 * 1024 * 1024),
+                    ttl=settings.get("ttl_seconds", 3600),
+                    disk_path=disk_path,
+                    max_disk_entries=settings.get("max_disk_entries", 100_000),
+                )
+    return _response_cache
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Get the process-wide group of in-flight LLM calls, or None if coalescing is disabled."""
+    global _single_flight
+    if not (load_config().get("llm") or {}).get("coalesce", False):
+        return None
+    if _single_flight is None:
+        with _shared_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """Get the process-wide pool that runs LLM calls under a latency budget."""
+    global _llm_executor, _llm_slots
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                settings = load_config().get("agent") or {}
+                workers = settings.get("llm_workers", 8)
+                _llm_slots = threading.BoundedSemaphore(workers + settings.get("llm_queue", 16))
+                _llm_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm")
+    return _llm_executor
+
+
+def submit_llm_call(fn, *args) -> Optional[Future]:
+    """Run an LLM call on the process-wide executor.
+    
+    Returns:
+        The call's future, or None if ``llm_queue`` calls are already
+        waiting for a thread
+    """
+    executor = get_llm_executor()
+    if not _llm_slots.acquire(blocking=False):
+        return None
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        _llm_slots.release()
+        raise
+    future.add_done_callback(lambda _: _llm_slots.release())
+    return future
+
+
+def get_llm_guard(provider: str, pool_options: Dict[str, Any]) -> Optional[Tuple[CircuitBreaker, HealthProber]]:
+    """Get the process-wide circuit breaker and health prober for a provider, or None if disabled."""
+    settings = (load_config().get("llm") or {}).get("circuit_breaker") or {}
+    if not settings.get("enabled", False):
+        return None
+    provider = provider.lower()
+    guard = _llm_guards.get(provider)
+    if guard is None:
+        # Under the lock, so racing callers cannot each start a prober thread
+        with _shared_lock:
+            guard = _llm_guards.get(provider)
+            if guard is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=settings.get("failure_threshold", 3),
+                    reset_timeout=settings.get("reset_timeout", 30),
+                    half_open_calls=settings.get("half_open_calls", 1),
+                    name=f"llm.{provider}.circuit",
+                )
+                # Probes use their own client, so closing an agent never stops them
+                probe_client = get_llm_client(provider, **pool_options)
+                prober = HealthProber(
+                    probe_client.is_available,
+                    interval=settings.get("probe_interval", 10),
+                    breaker=breaker,
+                    name=f"llm.{provider}.health",
+                )
+                guard = _llm_guards[provider] = (breaker, prober)
+    return guard
+
+
+def get_admission(provider: str) -> Optional[AdmissionController]:
+    """Get the process-wide admission controller for a provider, or None if disabled."""
+    settings = (load_config().get("llm") or {}).get("admission") or {}
+    if not settings.get("enabled", False):
+        return None
+    provider = provider.lower()
+    admission = _admission.get(provider)
+    if admission is None:
+        with _shared_lock:
+            admission = _admission.get(provider)
+            if admission is None:
+                admission = _admission[provider] = AdmissionController(
+                    max_concurrent=settings.get("max_concurrent", 2),
+                    max_queue=settings.get("max_queue", 64),
+                    max_wait=settings.get("max_wait_seconds", 5),
+                    name=f"llm.{provider}.admission",
+                )
+    return admission
+
+
+def create_llm_client(settings: Optional[Dict[str, Any]] = None) -> LLMClient:
+    """Create the LLM client for the configured provider ($LLM_PROVIDER).
+    
+    Real providers get the process-wide circuit breaker, admission control,
+    response cache and call coalescing. A provider that cannot be reached
+    is replaced by MockClient, unless a circuit breaker will let calls
+    through again once it is up.
+    """
+    settings = settings if settings is not None else load_config()
+    llm_provider = os.getenv("LLM_PROVIDER", "mock")
+    pool_options = (settings.get("llm") or {}).get("http") or {}
+    
+    try:
+        llm_client = get_llm_client(llm_provider, **pool_options)
+        guarded = False
+        if not isinstance(llm_client, MockClient):
+            llm_client, guarded = _wrap_llm_client(llm_client, llm_provider, pool_options, settings)
+        
+        if llm_client.is_available():
+            print(f"LLM client initialized with provider: {llm_provider}")
+        elif guarded:
+            # The health prober lets calls through again once the provider is up
+            print(f"LLM provider {llm_provider} not available yet, using rule-based responses until it is")
+        else:
+            print(f"LLM provider {llm_provider} not available, using mock responses")
+            llm_client.close()
+            llm_client = get_llm_client("mock")
+        return llm_client
+    except Exception as e:
+        print(f"Failed to initialize LLM client: {e}")
+        return get_llm_client("mock")
+
+
+def _wrap_llm_client(
+    llm_client: LLMClient, provider: str, pool_options: Dict[str, Any], settings: Dict[str, Any]
+) -> Tuple[LLMClient, bool]:
+    """Add the process-wide circuit breaker, admission control, response cache and call coalescing.
+    
+    Returns:
+        The wrapped client, and whether it is guarded by a circuit breaker
+    """
+    guard = get_llm_guard(provider, pool_options)
+    if guard is not None:
+        breaker, prober = guard
+        slow_call = ((settings.get("llm") or {}).get("circuit_breaker") or {}).get("slow_call_seconds")
+        llm_client = GuardedLLMClient(llm_client, breaker, prober, slow_call)
+    admission = get_admission(provider)
+    if admission is not None:
+        llm_client = AdmittedLLMClient(llm_client, admission)
+    cache = get_response_cache()
+    if cache is not None:
+        llm_client = CachedLLMClient(llm_client, cache)
+    group = get_single_flight()
+    if group is not None:
+        llm_client = CoalescingLLMClient(llm_client, group)
+    return llm_client, guard is not None
+
+
+def get_context_analyzer() -> ContextAnalyzer:
+    """Get the process-wide context analyzer (its keyword tables are read-only)."""
+    global _context_analyzer
+    if _context_analyzer is None:
+        with _shared_lock:
+            if _context_analyzer is None:
+                _context_analyzer = ContextAnalyzer()
+    return _context_analyzer
+
+
+def get_conversation_handler() -> ConversationHandler:
+    """Get the process-wide rule-based responder, with prompts and quotes loaded once."""
+    global _conversation_handler
+    if _conversation_handler is None:
+        with _shared_lock:
+            if _conversation_handler is None:
+                _conversation_handler = ConversationHandler()
+    return _conversation_handler
+
+
+def get_shared_llm_client() -> LLMClient:
+    """Get the process-wide LLM client, created by ``create_llm_client()`` on first use.
+    
+    A MockClient standing in for an unreachable provider is not kept for
+    good: once ``llm.fallback_retry_seconds`` have passed, the next caller
+    tries to create the real client again while the others keep getting
+    the MockClient. It is never closed by the agents using it;
+    ``close_shared_llm_client()`` releases it at shutdown.
+    """
+    global _llm_client, _llm_client_retry_at
+    llm_client = _llm_client
+    if llm_client is not None and not _llm_client_retry_due():
+        return llm_client
+    # Only the first creation makes callers wait; a retry is left to one of them
+    if not _llm_client_lock.acquire(blocking=llm_client is None):
+        return llm_client
+    try:
+        replaced = _llm_client
+        if replaced is not None and not _llm_client_retry_due():
+            return replaced
+        _llm_client = create_llm_client()
+        retry = (load_config().get("llm") or {}).get("fallback_retry_seconds", 60)
+        fallback = isinstance(_llm_client, MockClient) and os.getenv("LLM_PROVIDER", "mock").lower() != "mock"
+        _llm_client_retry_at = time.monotonic() + retry if fallback and retry is not None else None
+        llm_client = _llm_client
+    finally:
+        _llm_client_lock.release()
+    if replaced is not None:
+        replaced.close()
+    return llm_client
+
+
+def _llm_client_retry_due() -> bool:
+    return _llm_client_retry_at is not None and time.monotonic() >= _llm_client_retry_at
+
+
+def close_shared_llm_client() -> None:
+    """Close the process-wide LLM client; the next ``get_shared_llm_client()`` creates a new one."""
+    global _llm_client, _llm_client_retry_at
+    with _llm_client_lock:
+        llm_client, _llm_client = _llm_client, None
+        _llm_client_retry_at = None
+    if llm_client is not None:
+        llm_client.close()
+
+
+def _memory_options(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate the memory config section into MemoryManager arguments."""
+    return {
+        "max_short_term": settings.get("max_short_term_items", 20),
+        "max_episodic": settings.get("episodic_memory_limit", 50),
+        "save_frequency": settings.get("save_frequency", 10),
+        "flush_interval": settings.get("flush_interval_ms", 1000) / 1000,
+    }
 
 
 class SpiritualAgent:
@@ -20,39 +321,60 @@ class SpiritualAgent:
     - Coordinates responses
     """
     
-    def __init__(self):
-        """Initialize the spiritual agent."""
-        self.memory = MemoryManager()
-        self.context_analyzer = ContextAnalyzer()
-        self.conversation = ConversationHandler()
-        self.session_id = None
-        
-        # Initialize LLM client
-        self._init_llm_client()
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        memory_store: Optional[MemoryStore] = None,
+        context_analyzer: Optional[ContextAnalyzer] = None,
+        conversation: Optional[ConversationHandler] = None,
+        llm_client: Optional[LLMClient] = None,
+    ):
+        """Initialize the spiritual agent.
         
+        Args:
+            session_id: Session whose memories this agent uses; without one the
+                agent uses the single shared memory file
+            memory_store: Store holding per-session memories (defaults to the
+                process-wide store)
+            context_analyzer: Context analyzer (defaults to the process-wide one)
+            conversation: Rule-based responder (defaults to the process-wide one)
+            llm_client: LLM client (defaults to the process-wide one, looked up
+                on every use so the agent follows it when it is replaced);
+                the agent never closes it
+        """
         # Load configuration
         self._load_config()
-    
-    def _init_llm_client(self):
-        """Initialize the LLM client based on configuration."""
-        llm_provider = os.getenv("LLM_PROVIDER", "mock")
         
-        try:
-            self.llm_client: LLMClient = get_llm_client(llm_provider)
-            
-            if self.llm_client.is_available():
-                print(f"LLM client initialized with provider: {llm_provider}")
-            else:
-                print(f"LLM provider {llm_provider} not available, using mock responses")
-                self.llm_client = get_llm_client("mock")
-        except Exception as e:
-            print(f"Failed to initialize LLM client: {e}")
-            self.llm_client = get_llm_client("mock")
+        self.session_id = session_id
+        self.memory = self._init_memory(memory_store)
+        self.context_analyzer = context_analyzer if context_analyzer is not None else get_context_analyzer()
+        self.conversation = conversation if conversation is not None else get_conversation_handler()
+        self._llm_client = llm_client
+    
+    @property
+    def llm_client(self) -> LLMClient:
+        """The agent's LLM client, or the process-wide one if none was given."""
+        return self._llm_client if self._llm_client is not None else get_shared_llm_client()
+    
+    @llm_client.setter
+    def llm_client(self, llm_client: Optional[LLMClient]) -> None:
+        self._llm_client = llm_client
+    
+    def _init_memory(self, memory_store: Optional[MemoryStore]) -> MemoryManager:
+        """Lease the session's memory manager, or load the shared one without a session."""
+        self._memory_store: Optional[MemoryStore] = None
+        if self.session_id is not None:
+            self._memory_store = memory_store if memory_store is not None else get_memory_store()
+            return self._memory_store.acquire(self.session_id)
+        return MemoryManager(**_memory_options(self.settings.get("memory") or {}))
     
     def _load_config(self):
         """Load agent configuration."""
-        config_path = Path(__file__).parent.parent.parent / "config" / "config.yaml"
-        # TODO: Load from config file
+        self.settings = load_config()
+        agent_settings = self.settings.get("agent") or {}
+        # Seconds an LLM reply may take before the rule-based one is used instead
+        self.llm_budget: Optional[float] = agent_settings.get("llm_budget_seconds", 8.0)
+        # TODO: Load dialogue settings from config file
         self.config = {
             "response_length": "balanced",
             "tone": "empathetic",
@@ -87,39 +409,179 @@ class SpiritualAgent:
         
         return response
     
+    async def astream_interact(self, user_message: str, remember: bool = True) -> AsyncIterator[str]:
+        """Like ``interact()``, but yield the response in pieces as the LLM generates it.
+        
+        If the LLM fails before producing anything, the rule-based response is
+        yielded whole. The interaction is stored once the stream ends.
+        
+        Args:
+            user_message: The user's input message
+            remember: Recall memories for the response and store the
+                interaction; without it the turn neither reads nor writes
+                the agent's memory
+            
+        Yields:
+            Pieces of the agent's response
+        """
+        context = self.context_analyzer.analyze(user_message)
+        memories = self.memory.recall(user_message) if remember else []
+        messages = self._build_messages(user_message, memories)
+        fallback = self.conversation.generate_response(
+            user_message=user_message,
+            context=context,
+            memories=memories,
+        )
+        
+        pieces: List[str] = []
+        stream = self.llm_client.astream(messages, context).__aiter__()
+        first = asyncio.ensure_future(stream.__anext__())
+        started = time.perf_counter()
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self._llm_budget())
+            if not done:
+                self._record_budget("misses")
+                if self._keeps_late_replies():
+                    # Too slow to start: answer now, let the stream finish for the cache
+                    late = asyncio.ensure_future(self._finish_late_stream(first, stream, started))
+                    _late_streams.add(late)
+                    late.add_done_callback(_late_streams.discard)
+                    first = None
+                else:
+                    # Nothing would use the reply; the finally below cancels the call
+                    self._record_budget("cancelled")
+            else:
+                self._record_budget("hits")
+                token = first.result()
+                pieces.append(token)
+                yield token
+                async for token in stream:
+                    pieces.append(token)
+                    yield token
+        except (StopAsyncIteration, CircuitOpenError, AdmissionRejected):
+            pass
+        except Exception as e:
+            print(f"LLM generation failed: {e}")
+        finally:
+            if first is not None and not first.done():
+                first.cancel()
+        
+        if not "".join(pieces).strip():
+            pieces = [fallback]
+            yield fallback
+        
+        if remember:
+            self.memory.store(user_message, "".join(pieces), context)
+    
+    def record(self, user_message: str, response: str) -> None:
+        """Store an exchange whose response was produced outside the agent.
+        
+        Args:
+            user_message: The user's input message
+            response: The response the user was given
+        """
+        context = self.context_analyzer.analyze(user_message)
+        self.memory.store(user_message, response, context)
+    
+    def _build_messages(self, user_message: str, memories: List[Interaction]) -> List[Dict[str, str]]:
+        """Build the LLM conversation: recent exchanges within the history budget, then the new message."""
+        messages = get_prompt_builder().history(memories)
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
     def _generate_llm_response(
         self,
         user_message: str,
         context: Dict[str, Any],
-        memories: List[Dict[str, Any]]
+        memories: List[Interaction]
     ) -> str:
-        """Generate response using LLM if available."""
+        """Generate response using LLM if it answers within the latency budget.
+        
+        The rule-based response is computed first; it is returned if the LLM
+        fails or runs over ``llm_budget`` seconds, or if ``llm_queue`` calls
+        are already waiting. A late LLM call that has not started is
+        cancelled; one already running is left to finish, so its reply can
+        still land in the response cache.
+        """
+        # Fallback to rule-based response
+        fallback = self.conversation.generate_response(
+            user_message=user_message,
+            context=context,
+            memories=memories,
+        )
+        
         try:
             # Build conversation history
-            messages = []
-            
-            # Add recent conversation context
-            for mem in memories[-5:]:
-                messages.append({"role": "user", "content": mem.get("user", "")})
-                messages.append({"role": "assistant", "content": mem.get("agent", "")})
-            
-            messages.append({"role": "user", "content": user_message})
+            messages = self._build_messages(user_message, memories)
             
             # Get response from LLM
-            llm_response = self.llm_client.complete(messages, context)
+            budget = self._llm_budget()
+            if budget is None:
+                llm_response = self.llm_client.complete(messages, context)
+            else:
+                started = time.perf_counter()
+                future = submit_llm_call(self.llm_client.complete, messages, context)
+                if future is None:
+                    self._record_budget("rejected")
+                    return fallback
+                try:
+                    llm_response = future.result(timeout=budget)
+                    self._record_budget("hits")
+                except FutureTimeout:
+                    self._record_budget("misses")
+                    if future.cancel():
+                        self._record_budget("cancelled")
+                    else:
+                        future.add_done_callback(lambda f: self._record_late(f, started))
+                    return fallback
             
             if llm_response and len(llm_response.strip()) > 10:
                 return llm_response
                 
+        except (CircuitOpenError, AdmissionRejected):
+            pass
         except Exception as e:
             print(f"LLM generation failed: {e}")
         
-        # Fallback to rule-based response
-        return self.conversation.generate_response(
-            user_message=user_message,
-            context=context,
-            memories=memories,
-        )
+        return fallback
+    
+    def _llm_budget(self) -> Optional[float]:
+        """The latency budget for a turn, or None to wait as long as the LLM takes."""
+        if self.llm_budget is None or isinstance(self.llm_client, MockClient):
+            return None
+        return self.llm_budget
+    
+    def _keeps_late_replies(self) -> bool:
+        """Whether an over-budget reply is still useful, i.e. lands in a response cache."""
+        client = self.llm_client
+        while isinstance(client, LLMClientWrapper):
+            if isinstance(client, CachedLLMClient):
+                return True
+            client = client.inner
+        return False
+    
+    @staticmethod
+    def _record_budget(outcome: str) -> None:
+        get_metrics().counter(f"agent.llm_budget.{outcome}").inc()
+    
+    @staticmethod
+    def _record_late(future: Future, started: float) -> None:
+        """Record how long an over-budget LLM call finally took."""
+        if future.exception() is None:
+            get_metrics().histogram("agent.llm_budget.late_seconds").observe(time.perf_counter() - started)
+    
+    @staticmethod
+    async def _finish_late_stream(first: "asyncio.Future", stream: AsyncIterator[str], started: float) -> None:
+        """Consume an over-budget stream nobody is reading, so it completes (and is cached)."""
+        try:
+            await first
+            async for _ in stream:
+                pass
+        except StopAsyncIteration:
+            pass
+        except Exception:
+            return
+        get_metrics().histogram("agent.llm_budget.late_seconds").observe(time.perf_counter() - started)
     
     def get_daily_meditation(self) -> str:
         """Get daily meditation guidance.
@@ -137,6 +599,18 @@ class SpiritualAgent:
         """
         return self.memory.get_insights()
     
+    def get_trends(self, granularity: str = "day", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get emotion and topic trends over the user's history.
+        
+        Args:
+            granularity: Bucket size, "hour", "day" or "week"
+            limit: Only return the most recent buckets
+            
+        Returns:
+            Time buckets with interaction, emotion and intent counts
+        """
+        return self.memory.get_trends(granularity, limit)
+    
     def check_in(self) -> str:
         """Perform a wellness check-in.
         
@@ -145,6 +619,15 @@ class SpiritualAgent:
         """
         return "How are you feeling today? Take a moment to check in with yourself."
     
+    def close(self) -> None:
+        """Flush memories to disk and give the session's memory back to the store."""
+        if self._memory_store is None:
+            self.memory.close()
+            return
+        self.memory.flush()
+        store, self._memory_store = self._memory_store, None
+        store.release(self.session_id)
+    
     def farewell(self) -> str:
         """Generate farewell message."""
         return (
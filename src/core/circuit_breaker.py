@@ -0,0 +1,190 @@
+"""Circuit breaker and background health probing for LLM providers."""
+from typing import Callable, Optional
+import threading
+import time
+
+from src.utils.metrics import get_metrics
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a provider that keeps failing.
+
+    The circuit starts closed. ``failure_threshold`` consecutive failures
+    open it, and while it is open ``allow()`` refuses every call. After
+    ``reset_timeout`` seconds it is half-open: up to ``half_open_calls``
+    trial calls go through, and the first result closes the circuit again
+    or re-opens it.
+
+    Openings and refused calls are counted in the metrics registry as
+    ``<name>.opened`` and ``<name>.rejected``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        name: str = "llm.circuit",
+    ):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before trial calls
+            half_open_calls: Trial calls allowed at once while half-open
+            name: Metrics prefix
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = max(1, half_open_calls)
+        self._state = self.CLOSED
+        self._failures = 0
+        self._trials = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        metrics = get_metrics()
+        self._opened = metrics.counter(f"{name}.opened")
+        self._rejected = metrics.counter(f"{name}.rejected")
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._reset_due():
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; every allowed call must report back."""
+        with self._lock:
+            if self._state == self.OPEN:
+                if not self._reset_due():
+                    self._rejected.inc()
+                    return False
+                self._state, self._trials = self.HALF_OPEN, 0
+            if self._state == self.HALF_OPEN:
+                if self._trials >= self.half_open_calls:
+                    self._rejected.inc()
+                    return False
+                self._trials += 1
+            return True
+
+    def record_success(self) -> None:
+        """Report an allowed call that succeeded."""
+        with self._lock:
+            self._failures = 0
+            if self._state == self.HALF_OPEN:
+                self._state, self._trials = self.CLOSED, 0
+
+    def record_failure(self) -> None:
+        """Report an allowed call that failed or took too long."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """Report an allowed call that ended without a verdict, e.g. an abandoned stream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def trip(self) -> None:
+        """Open the circuit now, e.g. because a health probe failed."""
+        with self._lock:
+            if self._state != self.OPEN:
+                self._open()
+
+    def half_open(self) -> None:
+        """Allow trial calls if the circuit has been open for ``reset_timeout``
+        seconds, e.g. because a health probe succeeded."""
+        with self._lock:
+            if self._state == self.OPEN and self._reset_due():
+                self._state, self._trials = self.HALF_OPEN, 0
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._trials = 0
+        self._opened.inc()
+
+    def _reset_due(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+
+class HealthProber:
+    """Checks a provider in the background and caches the answer.
+
+    ``check()`` runs once when the prober starts and then every
+    ``interval`` seconds on a daemon thread, so reading ``available`` never
+    blocks. ``failure_threshold`` consecutive failed probes trip the
+    breaker, as failed calls do, so one dropped health check does not cut
+    off a working provider. While the breaker is half-open a single failed
+    probe re-opens it, like a failed trial call: the provider has just
+    been given its one chance. A successful probe lets an open breaker try
+    again once its reset timeout has passed, so a provider that answers
+    probes but fails calls is not retried any sooner.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], bool],
+        interval: float = 10.0,
+        breaker: Optional[CircuitBreaker] = None,
+        name: str = "llm.health",
+    ):
+        """Start probing.
+
+        Args:
+            check: Returns whether the provider is reachable; must not raise
+            interval: Seconds between probes
+            breaker: Circuit to trip and re-arm from probe results
+            name: Metrics prefix, and the probe thread's name
+        """
+        self.check = check
+        self.interval = interval
+        self.breaker = breaker
+        self._failures = get_metrics().counter(f"{name}.failures")
+        self._consecutive_failures = 0
+        self._stopped = threading.Event()
+        self.available = False
+        self.probe()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def probe(self) -> bool:
+        """Check the provider now and update the cached state."""
+        try:
+            ok = bool(self.check())
+        except Exception:
+            ok = False
+        self.available = ok
+        if ok:
+            self._consecutive_failures = 0
+        else:
+            self._failures.inc()
+            self._consecutive_failures += 1
+        if self.breaker is not None:
+            if ok:
+                self.breaker.half_open()
+            elif (
+                self._consecutive_failures >= self.breaker.failure_threshold
+                or self.breaker.state == CircuitBreaker.HALF_OPEN
+            ):
+                self.breaker.trip()
+        return ok
+
+    def close(self) -> None:
+        """Stop probing."""
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.probe()
@@ -0,0 +1,28 @@
+"""Configuration loading."""
+from typing import Dict, Any, Optional
+from pathlib import Path
+from functools import lru_cache
+
+CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "config.yaml"
+
+
+@lru_cache(maxsize=None)
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """Load the YAML configuration file.
+
+    The result is cached per path and must be treated as read-only.
+
+    Args:
+        path: Config file path (defaults to config/config.yaml)
+
+    Returns:
+        Parsed configuration, or an empty dict if it cannot be read
+    """
+    config_file = Path(path) if path else CONFIG_PATH
+    try:
+        import yaml
+
+        with open(config_file, "r") as f:
+            return yaml.safe_load(f) or {}
+    except Exception:
+        return {}
@@ -1,13 +1,27 @@
 """LLM client for connecting to Ollama or OpenAI."""
 import os
+import re
 import json
-from typing import Optional, Dict, Any, List
+import time
+import asyncio
+import threading
+import weakref
+from typing import Optional, Dict, Any, List, Tuple, Iterator, AsyncIterator
 from abc import ABC, abstractmethod
 
+from src.core.admission import AdmissionController, CRISIS, NORMAL
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError, HealthProber
+from src.core.prompt_builder import get_prompt_builder
+from src.core.response_cache import ResponseCache, cache_key
+from src.core.single_flight import SingleFlight
+from src.utils.metrics import get_metrics
+
 
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
     
+    provider_name = "LLM"
+    
     @abstractmethod
     def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
         """Generate a completion."""
@@ -17,95 +31,339 @@ class LLMClient(ABC):
     def is_available(self) -> bool:
         """Check if the LLM service is available."""
         pass
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        """Generate a completion without blocking the event loop.
+        
+        The default runs ``complete()`` in a worker thread; clients with a
+        native async implementation override it. A cancelled call stops
+        waiting immediately, but the thread runs to completion.
+        """
+        return await asyncio.to_thread(self.complete, messages, context)
+    
+    def stream(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        """Yield the completion in pieces as they are generated.
+        
+        Time to first token and total stream duration are recorded in the
+        metrics registry as ``llm.<provider>.time_to_first_token`` and
+        ``llm.<provider>.stream_duration`` (seconds).
+        """
+        started = time.perf_counter()
+        waiting = True
+        for token in self._generate_tokens(messages, context):
+            if waiting and token:
+                self._observe("time_to_first_token", time.perf_counter() - started)
+                waiting = False
+            yield token
+        self._observe("stream_duration", time.perf_counter() - started)
+    
+    async def astream(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async variant of ``stream()``, recording the same metrics."""
+        started = time.perf_counter()
+        waiting = True
+        async for token in self._agenerate_tokens(messages, context):
+            if waiting and token:
+                self._observe("time_to_first_token", time.perf_counter() - started)
+                waiting = False
+            yield token
+        self._observe("stream_duration", time.perf_counter() - started)
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        """Produce tokens for ``stream()``; by default the whole completion at once."""
+        yield self.complete(messages, context)
+    
+    async def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Produce tokens for ``astream()``; by default the whole completion at once."""
+        yield await self.acomplete(messages, context)
+    
+    def _observe(self, name: str, seconds: float) -> None:
+        """Record a latency for this provider."""
+        get_metrics().histogram(f"llm.{self.provider_name.lower()}.{name}").observe(seconds)
+    
+    def close(self) -> None:
+        """Release connections or other resources held by the client."""
+        pass
+    
+    async def aclose(self) -> None:
+        """Release resources, including those tied to the running event loop."""
+        self.close()
+
+
+class HTTPLLMClient(LLMClient):
+    """Base for clients that call an HTTP API through one pooled session.
+    
+    The ``requests`` session is created on first use and reused by every
+    call, so connections (and TLS sessions) are kept alive between requests
+    instead of being opened per call. ``acomplete()`` uses an
+    ``httpx.AsyncClient`` shared by all calls on the same event loop, so many
+    generations can be in flight at once without a thread each.
+    
+    Subclasses describe a request with ``_build_request()`` and decode
+    replies with ``_parse_response()`` and, for streams,
+    ``_parse_stream_line()``; the sync and async paths share them.
+    """
+    
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        max_retries: int = 0,
+        async_pool_maxsize: int = 256,
+        timeout: float = 120.0,
+    ):
+        """Initialize the connection pool settings.
+        
+        Args:
+            pool_connections: Number of hosts to keep a connection pool for
+            pool_maxsize: Connections kept open per host
+            pool_block: Wait for a free connection when a host's pool is
+                exhausted, making pool_maxsize a hard per-host limit
+            keep_alive: Reuse connections between requests
+            max_retries: Retries for failed connection attempts
+            async_pool_maxsize: Connections the async client may open;
+                further async calls wait for a free one
+            timeout: Seconds to wait for a completion
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self.async_pool_maxsize = async_pool_maxsize
+        self.timeout = timeout
+        self._session = None
+        self._session_lock = threading.Lock()
+        # One async client per event loop; httpx pools cannot cross loops
+        self._async_clients = weakref.WeakKeyDictionary()
+    
+    @property
+    def session(self):
+        """The pooled ``requests.Session``, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._new_session()
+        return self._session
+    
+    def _new_session(self):
+        """Create a session whose adapters use the pool settings."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.max_retries,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+    
+    @property
+    def async_client(self):
+        """The ``httpx.AsyncClient`` for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._session_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = self._new_async_client()
+        return client
+    
+    def _new_async_client(self):
+        """Create an async client with the pool settings."""
+        import httpx
+        
+        limits = httpx.Limits(
+            max_connections=self.async_pool_maxsize,
+            max_keepalive_connections=self.async_pool_maxsize if self.keep_alive else 0,
+        )
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=self.max_retries),
+        )
+    
+    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        """Generate a completion over the pooled session."""
+        try:
+            url, payload, headers = self._build_request(messages, context)
+            response = self.session.post(url, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return self._parse_response(response.json())
+        except Exception as e:
+            print(f"{self.provider_name} error: {e}")
+            raise
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        """Generate a completion over the shared async client.
+        
+        Cancelling the awaiting task aborts the HTTP request; exceeding the
+        client timeout raises ``httpx.TimeoutException``.
+        """
+        try:
+            url, payload, headers = self._build_request(messages, context)
+            response = await self.async_client.post(url, json=payload, headers=headers)
+            response.raise_for_status()
+            return self._parse_response(response.json())
+        except Exception as e:
+            print(f"{self.provider_name} error: {e}")
+            raise
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        """Stream tokens over the pooled session."""
+        try:
+            url, payload, headers = self._build_request(messages, context, stream=True)
+            with self.session.post(
+                url, json=payload, headers=headers, timeout=self.timeout, stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    token, done = self._parse_stream_line(line.decode("utf-8"))
+                    if token:
+                        yield token
+                    if done:
+                        break
+        except Exception as e:
+            print(f"{self.provider_name} error: {e}")
+            raise
+    
+    async def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream tokens over the shared async client."""
+        try:
+            url, payload, headers = self._build_request(messages, context, stream=True)
+            async with self.async_client.stream("POST", url, json=payload, headers=headers) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    token, done = self._parse_stream_line(line)
+                    if token:
+                        yield token
+                    if done:
+                        break
+        except Exception as e:
+            print(f"{self.provider_name} error: {e}")
+            raise
+    
+    @abstractmethod
+    def _build_request(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any], stream: bool = False
+    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """Build the (url, JSON payload, headers) of a completion request."""
+        pass
+    
+    @abstractmethod
+    def _parse_response(self, result: Dict[str, Any]) -> str:
+        """Extract the completion text from a decoded response."""
+        pass
+    
+    @abstractmethod
+    def _parse_stream_line(self, line: str) -> Tuple[Optional[str], bool]:
+        """Decode one line of a streamed response into (token or None, done)."""
+        pass
+    
+    def _with_system_prompt(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Prepend the (cached) system prompt for the turn's context."""
+        return [{"role": "system", "content": get_prompt_builder().system_prompt(context)}, *messages]
+    
+    def close(self) -> None:
+        """Close the session and its pooled connections.
+        
+        Async clients are dropped; use ``aclose()`` from async code to close
+        the running loop's client cleanly.
+        """
+        with self._session_lock:
+            session, self._session = self._session, None
+            self._async_clients.clear()
+        if session is not None:
+            session.close()
+    
+    async def aclose(self) -> None:
+        """Close the running loop's async client and the session."""
+        with self._session_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
 
 
-class OllamaClient(LLMClient):
+class OllamaClient(HTTPLLMClient):
     """Client for Ollama local LLM."""
     
-    def __init__(self, model: str = "llama3.2", base_url: str = "http://localhost:11434"):
-        """Initialize Ollama client."""
+    provider_name = "Ollama"
+    
+    def __init__(self, model: str = "llama3.2", base_url: str = "http://localhost:11434", **pool_options):
+        """Initialize Ollama client.
+        
+        Args:
+            model: Ollama model name
+            base_url: Ollama server URL
+            **pool_options: Connection pool settings (see HTTPLLMClient)
+        """
+        super().__init__(**pool_options)
         self.model = model
         self.base_url = base_url
-        self.api_url = f"{base_url}/api/generate"
+        # The chat endpoint takes role-tagged messages; /api/generate takes a bare prompt
+        self.api_url = f"{base_url}/api/chat"
     
     def is_available(self) -> bool:
         """Check if Ollama is running."""
         try:
-            import requests
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
         except Exception:
             return False
     
-    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
-        """Generate completion using Ollama."""
-        try:
-            import requests
-            
-            # Build system prompt from context
-            system_prompt = self._build_system_prompt(context)
-            
-            # Prepare messages for Ollama
-            ollama_messages = [{"role": "system", "content": system_prompt}]
-            ollama_messages.extend(messages)
-            
-            payload = {
-                "model": self.model,
-                "messages": ollama_messages,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                }
+    def _build_request(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any], stream: bool = False
+    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """Build an Ollama chat request."""
+        payload = {
+            "model": self.model,
+            "messages": self._with_system_prompt(messages, context),
+            "stream": stream,
+            "options": {
+                "temperature": 0.7,
+                "top_p": 0.9,
             }
-            
-            response = requests.post(self.api_url, json=payload, timeout=120)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("response", "")
-            
-        except Exception as e:
-            print(f"Ollama error: {e}")
-            raise
+        }
+        return self.api_url, payload, {}
     
-    def _build_system_prompt(self, context: Dict[str, Any]) -> str:
-        """Build system prompt with spiritual context."""
-        base_prompt = """You are a compassionate spiritual guide and mindfulness companion. Your purpose is to:
-
-1. Listen deeply and reflect thoughtfully
-2. Offer gentle guidance without being prescriptive
-3. Draw from various spiritual traditions and philosophical perspectives
-4. Help users explore their inner world with curiosity and kindness
-5. Encourage mindfulness, self-reflection, and conscious living
-6. Be inclusive and respectful of diverse beliefs and backgrounds
-
-You are NOT:
-- A religious authority
-- A medical or psychological professional
-- Someone who gives absolute answers
-
-Your tone: Warm, contemplative, wise but humble, peaceful.
-
-Remember: You are here to guide and support, not to tell people what to believe or do. Help them find their own answers."""
-        
-        # Add context about detected emotions/intent
-        emotion = context.get("emotion")
-        intent = context.get("intent")
-        
-        if emotion:
-            base_prompt += f"\n\nThe user seems to be feeling: {emotion}"
-        if intent:
-            base_prompt += f"\nThe user's intent appears to be: {intent}"
-            
-        return base_prompt
+    def _parse_response(self, result: Dict[str, Any]) -> str:
+        """Extract the assistant message."""
+        return (result.get("message") or {}).get("content", "")
+    
+    def _parse_stream_line(self, line: str) -> Tuple[Optional[str], bool]:
+        """Decode one NDJSON chunk of a streamed chat."""
+        if not line.strip():
+            return None, False
+        chunk = json.loads(line)
+        if "error" in chunk:
+            raise RuntimeError(chunk["error"])
+        return (chunk.get("message") or {}).get("content") or None, bool(chunk.get("done"))
 
 
-class OpenAIClient(LLMClient):
+class OpenAIClient(HTTPLLMClient):
     """Client for OpenAI API."""
     
-    def __init__(self, model: str = "gpt-3.5-turbo", api_key: Optional[str] = None):
-        """Initialize OpenAI client."""
+    provider_name = "OpenAI"
+    
+    def __init__(self, model: str = "gpt-3.5-turbo", api_key: Optional[str] = None, **pool_options):
+        """Initialize OpenAI client.
+        
+        Args:
+            model: OpenAI model name
+            api_key: API key (defaults to $OPENAI_API_KEY)
+            **pool_options: Connection pool settings (see HTTPLLMClient)
+        """
+        super().__init__(**pool_options)
         self.model = model
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.api_url = "https://api.openai.com/v1/chat/completions"
@@ -114,40 +372,45 @@ class OpenAIClient(LLMClient):
         """Check if OpenAI is available."""
         return bool(self.api_key)
     
-    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
-        """Generate completion using OpenAI."""
-        try:
-            import requests
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.7
-            }
-            
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=120)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-            
-        except Exception as e:
-            print(f"OpenAI error: {e}")
-            raise
+    def _build_request(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any], stream: bool = False
+    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """Build an OpenAI chat completion request."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.model,
+            "messages": self._with_system_prompt(messages, context),
+            "temperature": 0.7
+        }
+        if stream:
+            payload["stream"] = True
+        return self.api_url, payload, headers
+    
+    def _parse_response(self, result: Dict[str, Any]) -> str:
+        """Extract the first choice's message."""
+        return result["choices"][0]["message"]["content"]
+    
+    def _parse_stream_line(self, line: str) -> Tuple[Optional[str], bool]:
+        """Decode one server-sent event line of a streamed completion."""
+        if not line.startswith("data:"):
+            return None, False  # blank separator, comment or other SSE field
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return None, True
+        choices = json.loads(data).get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or None, False
     
-    def _build_system_prompt(self, context: Dict[str, Any]) -> str:
-        """Build system prompt with spiritual context."""
-        return """You are a compassionate spiritual guide and mindfulness companion."""
 
 
 class MockClient(LLMClient):
     """Mock client for testing without LLM."""
     
+    provider_name = "Mock"
+    
     def is_available(self) -> bool:
         """Always available."""
         return True
@@ -175,10 +438,392 @@ class MockClient(LLMClient):
             return "The greatest wisdom often comes from within. Trust your inner guidance. What does your heart tell you?"
         else:
             return "I'm here to listen and reflect with you. Take your time to share what's on your mind. I'm here to support you on your spiritual journey."
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        """Return a mock response (no I/O, so no thread is needed)."""
+        return self.complete(messages, context)
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        """Stream the mock response word by word."""
+        yield from re.findall(r"\S+\s*", self.complete(messages, context))
+    
+    async def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream the mock response word by word."""
+        for token in self._generate_tokens(messages, context):
+            yield token
 
 
-def get_llm_client(provider: str = "mock") -> LLMClient:
-    """Get the appropriate LLM client."""
+class LLMClientWrapper(LLMClient):
+    """Base for clients that add behaviour around another client.
+    
+    Everything not overridden is delegated to ``inner``, including the
+    provider name, so metrics are still recorded per provider.
+    """
+    
+    def __init__(self, inner: LLMClient):
+        self.inner = inner
+    
+    @property
+    def provider_name(self) -> str:
+        return self.inner.provider_name
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes the wrapper lacks, e.g. model or api_url
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+    
+    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        return self.inner.complete(messages, context)
+    
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        return await self.inner.acomplete(messages, context)
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        return self.inner._generate_tokens(messages, context)
+    
+    def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        return self.inner._agenerate_tokens(messages, context)
+    
+    def close(self) -> None:
+        self.inner.close()
+    
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+    
+    def _turn_key(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Optional[str]:
+        """Key identifying equivalent turns, which have the same history and
+        new message (see ``cache_key()``), or None for crisis turns."""
+        if context.get("is_crisis"):
+            return None
+        model = getattr(self.inner, "model", None)
+        return cache_key(messages, context, f"{self.provider_name}:{model}")
+
+
+class CachedLLMClient(LLMClientWrapper):
+    """Serves repeated prompts from a ResponseCache.
+    
+    Completions are keyed on the normalized last user message, the history
+    before it, the emotion and intent in the context, and the model (see
+    ``cache_key()``), so only turns with the same history share a
+    response. Streams are cached once they finish; a cached response streams
+    as one piece. Crisis turns always go to the LLM and are never cached.
+    """
+    
+    def __init__(self, inner: LLMClient, cache: Optional[ResponseCache] = None):
+        """Initialize the wrapper.
+        
+        Args:
+            inner: The client whose completions are cached
+            cache: Cache to use, e.g. one shared by several clients; by default
+                the client gets its own, which it closes with itself
+        """
+        super().__init__(inner)
+        self._owns_cache = cache is None
+        self.cache = cache if cache is not None else ResponseCache()
+    
+    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        key = self._turn_key(messages, context)
+        if key is None:
+            return self.inner.complete(messages, context)
+        response = self.cache.get(key)
+        if response is None:
+            response = self.inner.complete(messages, context)
+            self._store(key, response)
+        return response
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        key = self._turn_key(messages, context)
+        if key is None:
+            return await self.inner.acomplete(messages, context)
+        response = self.cache.get(key)
+        if response is None:
+            response = await self.inner.acomplete(messages, context)
+            self._store(key, response)
+        return response
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        key = self._turn_key(messages, context)
+        if key is None:
+            yield from self.inner._generate_tokens(messages, context)
+            return
+        response = self.cache.get(key)
+        if response is not None:
+            yield response
+            return
+        pieces = []
+        for token in self.inner._generate_tokens(messages, context):
+            pieces.append(token)
+            yield token
+        self._store(key, "".join(pieces))
+    
+    async def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        key = self._turn_key(messages, context)
+        if key is None:
+            async for token in self.inner._agenerate_tokens(messages, context):
+                yield token
+            return
+        response = self.cache.get(key)
+        if response is not None:
+            yield response
+            return
+        pieces = []
+        async for token in self.inner._agenerate_tokens(messages, context):
+            pieces.append(token)
+            yield token
+        self._store(key, "".join(pieces))
+    
+    def close(self) -> None:
+        self.inner.close()
+        if self._owns_cache:
+            self.cache.close()
+    
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+        if self._owns_cache:
+            self.cache.close()
+    
+    def _store(self, key: str, response: str) -> None:
+        if response and response.strip():
+            self.cache.put(key, response)
+
+
+class CoalescingLLMClient(LLMClientWrapper):
+    """Shares one generation among concurrent identical turns.
+    
+    Turns are identical when their cache keys match (see ``cache_key()``),
+    which needs the same history as well as the same new message, so turns
+    of different sessions only share a generation when nothing private
+    could differ between them. A turn arriving while an identical one is
+    being generated waits for that generation instead of starting another,
+    and streams replay the shared tokens. Crisis turns are always generated
+    on their own.
+    """
+    
+    def __init__(self, inner: LLMClient, group: Optional[SingleFlight] = None):
+        """Initialize the wrapper.
+        
+        Args:
+            inner: The client whose calls are coalesced
+            group: In-flight calls to join, e.g. shared by every client in the
+                process; by default the client coalesces only its own calls
+        """
+        super().__init__(inner)
+        self.group = group if group is not None else SingleFlight()
+    
+    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        key = self._turn_key(messages, context)
+        if key is None:
+            return self.inner.complete(messages, context)
+        return self.group.do(key, lambda: self.inner.complete(messages, context))
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        key = self._turn_key(messages, context)
+        if key is None:
+            return await self.inner.acomplete(messages, context)
+        return await self.group.ado(key, lambda: self.inner.acomplete(messages, context))
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        key = self._turn_key(messages, context)
+        if key is None:
+            return self.inner._generate_tokens(messages, context)
+        return self.group.stream(key, lambda: self.inner._generate_tokens(messages, context))
+    
+    def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        key = self._turn_key(messages, context)
+        if key is None:
+            return self.inner._agenerate_tokens(messages, context)
+        return self.group.astream(key, lambda: self.inner._agenerate_tokens(messages, context))
+
+
+class GuardedLLMClient(LLMClientWrapper):
+    """Fails fast while the provider is down, using a circuit breaker.
+    
+    Calls the breaker refuses raise CircuitOpenError immediately instead of
+    waiting for a connection error, so callers can fall back at once.
+    Failures, and calls slower than ``slow_call_seconds``, count against
+    the circuit. With a prober, ``is_available()`` returns its cached
+    answer instead of asking the provider.
+    """
+    
+    def __init__(
+        self,
+        inner: LLMClient,
+        breaker: Optional[CircuitBreaker] = None,
+        prober: Optional[HealthProber] = None,
+        slow_call_seconds: Optional[float] = None,
+    ):
+        """Initialize the wrapper.
+        
+        Args:
+            inner: The client to guard
+            breaker: Circuit to use, e.g. one shared by every client of the
+                provider; by default the client gets its own
+            prober: Background health checks of the provider
+            slow_call_seconds: Calls taking longer count as failures
+        """
+        super().__init__(inner)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.prober = prober
+        self.slow_call_seconds = slow_call_seconds
+    
+    def is_available(self) -> bool:
+        if self.prober is not None:
+            return self.prober.available
+        return self.inner.is_available()
+    
+    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        self._admit()
+        started = time.perf_counter()
+        try:
+            response = self.inner.complete(messages, context)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self._settle(started)
+        return response
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        self._admit()
+        started = time.perf_counter()
+        try:
+            response = await self.inner.acomplete(messages, context)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self._settle(started)
+        return response
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        self._admit()
+        started = time.perf_counter()
+        produced = False
+        try:
+            for token in self.inner._generate_tokens(messages, context):
+                produced = produced or bool(token)
+                yield token
+        except GeneratorExit:
+            self._abandoned(produced)
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self._settle(started)
+    
+    async def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        self._admit()
+        started = time.perf_counter()
+        produced = False
+        try:
+            async for token in self.inner._agenerate_tokens(messages, context):
+                produced = produced or bool(token)
+                yield token
+        except (GeneratorExit, asyncio.CancelledError):
+            self._abandoned(produced)
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self._settle(started)
+    
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.provider_name} circuit is open")
+    
+    def _settle(self, started: float) -> None:
+        """Report a finished call to the breaker."""
+        if self.slow_call_seconds is not None and time.perf_counter() - started > self.slow_call_seconds:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+    
+    def _abandoned(self, produced: bool) -> None:
+        """Report a stream the caller stopped reading; one that produced tokens counts as working."""
+        if produced:
+            self.breaker.record_success()
+        else:
+            self.breaker.release()
+
+
+class AdmittedLLMClient(LLMClientWrapper):
+    """Runs calls through an AdmissionController, crisis turns first.
+    
+    A call that cannot start in time raises AdmissionRejected, so callers
+    can answer from the rule-based path instead of queueing behind a
+    saturated backend. Streams hold their slot until they end.
+    """
+    
+    def __init__(self, inner: LLMClient, admission: Optional[AdmissionController] = None):
+        """Initialize the wrapper.
+        
+        Args:
+            inner: The client whose calls are admitted
+            admission: Controller to use, e.g. one shared by every client of
+                the provider; by default the client gets its own
+        """
+        super().__init__(inner)
+        self.admission = admission if admission is not None else AdmissionController()
+    
+    def complete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        granted_at = self.admission.acquire(self._priority(context))
+        try:
+            return self.inner.complete(messages, context)
+        finally:
+            self.admission.release(granted_at)
+    
+    async def acomplete(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> str:
+        granted_at = await self.admission.aacquire(self._priority(context))
+        try:
+            return await self.inner.acomplete(messages, context)
+        finally:
+            self.admission.release(granted_at)
+    
+    def _generate_tokens(self, messages: List[Dict[str, str]], context: Dict[str, Any]) -> Iterator[str]:
+        granted_at = self.admission.acquire(self._priority(context))
+        try:
+            yield from self.inner._generate_tokens(messages, context)
+        finally:
+            self.admission.release(granted_at)
+    
+    async def _agenerate_tokens(
+        self, messages: List[Dict[str, str]], context: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        granted_at = await self.admission.aacquire(self._priority(context))
+        try:
+            async for token in self.inner._agenerate_tokens(messages, context):
+                yield token
+        finally:
+            self.admission.release(granted_at)
+    
+    @staticmethod
+    def _priority(context: Dict[str, Any]) -> int:
+        return CRISIS if context.get("is_crisis") else NORMAL
+
+
+def get_llm_client(provider: str = "mock", **pool_options) -> LLMClient:
+    """Get the appropriate LLM client.
+    
+    Args:
+        provider: "ollama", "openai" or "mock"
+        **pool_options: Connection pool settings for HTTP providers
+            (see HTTPLLMClient)
+    """
     providers = {
         "ollama": OllamaClient,
         "openai": OpenAIClient,
@@ -190,10 +835,10 @@ def get_llm_client(provider: str = "mock") -> LLMClient:
     if provider.lower() == "ollama":
         model = os.getenv("OLLAMA_MODEL", "llama3.2")
         base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        return OllamaClient(model=model, base_url=base_url)
+        return OllamaClient(model=model, base_url=base_url, **pool_options)
     elif provider.lower() == "openai":
         api_key = os.getenv("OPENAI_API_KEY")
         model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-        return OpenAIClient(model=model, api_key=api_key)
+        return OpenAIClient(model=model, api_key=api_key, **pool_options)
     else:
         return MockClient()
@@ -0,0 +1,95 @@
+"""Prompt assembly: cached system prompts and token-budgeted history."""
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from src.core.config import load_config
+from src.core.constants import SYSTEM_PROMPT
+from src.memory.records import Interaction
+
+_prompt_builder: Optional["PromptBuilder"] = None
+
+
+def approx_tokens(text: str) -> int:
+    """Estimate the token count of text (about four characters per token for English)."""
+    return (len(text) + 3) // 4
+
+
+def _clip(text: str, tokens: int) -> str:
+    """The start of text, cut to about ``tokens`` tokens."""
+    return text[:max(0, tokens) * 4]
+
+
+class PromptBuilder:
+    """Builds the messages sent to an LLM.
+
+    The system prompt for each (emotion, intent) pair is rendered once and
+    reused, so the start of every request is byte-identical for turns with
+    the same context, which lets providers reuse cached prefixes. History
+    is the most recent exchanges that fit in ``history_token_budget``
+    (estimated with ``approx_tokens()``); older ones are dropped whole, and
+    a latest exchange that alone exceeds the budget is cut short.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str = SYSTEM_PROMPT,
+        history_token_budget: int = 1024,
+        max_history_turns: int = 5,
+    ):
+        """Initialize the builder.
+
+        Args:
+            system_prompt: Instructions that start every conversation
+            history_token_budget: Estimated tokens of past exchanges to include
+            max_history_turns: Most past exchanges to include
+        """
+        self.base_prompt = system_prompt
+        self.history_token_budget = history_token_budget
+        self.max_history_turns = max_history_turns
+        self._render = lru_cache(maxsize=256)(self._render_system_prompt)
+
+    def system_prompt(self, context: Dict[str, Any]) -> str:
+        """The system prompt for a turn's detected emotion and intent."""
+        return self._render(context.get("emotion"), context.get("intent"))
+
+    def history(self, memories: Sequence[Interaction]) -> List[Dict[str, str]]:
+        """The most recent exchanges that fit in the history budget, oldest first."""
+        budget = self.history_token_budget
+        kept: List[Tuple[str, str]] = []
+        for memory in reversed(memories[-self.max_history_turns:] if self.max_history_turns else ()):
+            cost = approx_tokens(memory.user) + approx_tokens(memory.agent)
+            if cost > budget:
+                if not kept and budget > 0:
+                    # Keep the start of an overlong latest exchange rather than no history
+                    user = _clip(memory.user, budget // 2)
+                    kept.append((user, _clip(memory.agent, budget - approx_tokens(user))))
+                break
+            budget -= cost
+            kept.append((memory.user, memory.agent))
+
+        messages = []
+        for user, agent in reversed(kept):
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": agent})
+        return messages
+
+    def _render_system_prompt(self, emotion: Optional[str], intent: Optional[str]) -> str:
+        prompt = self.base_prompt
+        # Add context about detected emotions/intent
+        if emotion:
+            prompt += f"\n\nThe user seems to be feeling: {emotion}"
+        if intent:
+            prompt += f"\nThe user's intent appears to be: {intent}"
+        return prompt
+
+
+def get_prompt_builder() -> PromptBuilder:
+    """Get the process-wide prompt builder, configured from the llm.prompt settings."""
+    global _prompt_builder
+    if _prompt_builder is None:
+        settings = (load_config().get("llm") or {}).get("prompt") or {}
+        _prompt_builder = PromptBuilder(
+            history_token_budget=settings.get("history_token_budget", 1024),
+            max_history_turns=settings.get("max_history_turns", 5),
+        )
+    return _prompt_builder
@@ -0,0 +1,193 @@
+"""Cache of LLM responses, in memory with an optional on-disk tier."""
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
+from pathlib import Path
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from src.utils.metrics import get_metrics
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def normalize_message(text: str) -> str:
+    """Case-fold a message and drop punctuation and extra whitespace."""
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+def cache_key(messages: List[Dict[str, str]], context: Dict[str, Any], model: str) -> str:
+    """Key for a completion: the normalized last user message, every message
+    before it verbatim, its emotion and intent, and the model.
+
+    The earlier messages carry the session's history, so a response is only
+    reused for a turn with exactly the same history and never leaks one
+    user's conversation into another's.
+    """
+    last = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].get("role") == "user"), None)
+    user_message = messages[last].get("content", "") if last is not None else ""
+    history = [[m.get("role"), m.get("content")] for i, m in enumerate(messages) if i != last]
+    parts = [normalize_message(user_message), history, context.get("emotion"), context.get("intent"), model]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of responses with a time-to-live and a size limit in bytes.
+
+    Entries expire ``ttl`` seconds after they are stored. Once the total
+    size of the cached responses exceeds ``max_bytes`` (or there are more
+    than ``max_entries``), the least recently used ones are evicted. With a
+    ``disk_path`` every entry is also written to an SQLite file, which
+    outlives the process, is consulted on an in-memory miss and keeps the
+    ``max_disk_entries`` most recently stored entries.
+
+    Hits, misses and evictions are counted in the metrics registry under
+    ``<name>.hits``, ``<name>.misses`` and ``<name>.evictions``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttl: Optional[float] = 3600.0,
+        disk_path: Optional[Union[str, Path]] = None,
+        max_disk_entries: int = 100_000,
+        name: str = "llm.cache",
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries kept in memory
+            max_bytes: Maximum total UTF-8 size of the responses kept in memory
+            ttl: Seconds an entry stays valid, or None to keep entries until evicted
+            disk_path: SQLite file for the persistent tier, or None for memory only
+            max_disk_entries: Maximum entries kept in the SQLite file
+            name: Metrics prefix
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = ttl
+        self.max_disk_entries = max(1, max_disk_entries)
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Serializes the SQLite connection, so memory hits never wait on disk
+        self._disk_lock = threading.Lock()
+        metrics = get_metrics()
+        self._hits = metrics.counter(f"{name}.hits")
+        self._misses = metrics.counter(f"{name}.misses")
+        self._evictions = metrics.counter(f"{name}.evictions")
+        self._disk = self._open_disk(Path(disk_path)) if disk_path else None
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._hits.inc()
+                    return entry[0]
+                self._discard(key)
+
+        with self._disk_lock:
+            row = None
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT response, expires FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        if row is not None and row[1] > now:
+            with self._lock:
+                # A put() racing this read has the newer response
+                if key not in self._entries:
+                    self._insert(key, row[0], row[1])
+            self._hits.inc()
+            return row[0]
+
+        self._misses.inc()
+        return None
+
+    def put(self, key: str, response: str) -> None:
+        """Cache a response."""
+        expires = time.time() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._discard(key)
+            self._insert(key, response, expires)
+        with self._disk_lock:
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, expires) VALUES (?, ?, ?)",
+                        (key, response, expires),
+                    )
+                    self._trim_disk(self._disk)
+
+    def clear(self) -> None:
+        """Drop every entry, including those on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        with self._disk_lock:
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        with self._disk_lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.time()
+
+    def _insert(self, key: str, response: str, expires: float) -> None:
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (response, expires, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._bytes -= self._entries.popitem(last=False)[1][2]
+            self._evictions.inc()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _open_disk(self, path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Access is serialized by self._disk_lock
+        db = sqlite3.connect(str(path), check_same_thread=False)
+        # A lost cache entry is harmless, so commits need not wait for fsync
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        with db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+            self._trim_disk(db)
+        return db
+
+    def _trim_disk(self, db: sqlite3.Connection) -> None:
+        # Replacing a row gives it the next rowid, so rowids follow store order
+        db.execute(
+            "DELETE FROM responses WHERE rowid <= (SELECT MAX(rowid) FROM responses) - ?",
+            (self.max_disk_entries,),
+        )
@@ -0,0 +1,233 @@
+"""Pool of per-session SpiritualAgents sharing their stateless parts."""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import threading
+import time
+
+from src.core.agent import (
+    SpiritualAgent, get_context_analyzer, get_conversation_handler, get_memory_store, get_shared_llm_client,
+)
+from src.core.llm_client import LLMClient
+from src.dialogue.conversation_handler import ConversationHandler
+from src.memory.store import MemoryStore
+from src.reasoning.context_analyzer import ContextAnalyzer
+from src.utils.metrics import get_metrics
+
+
+class SessionPool:
+    """Creates a SpiritualAgent per session on first use and keeps it for later turns.
+
+    Agents share the ContextAnalyzer, ConversationHandler and LLM client
+    (the process-wide ones unless others are given), so only the session's
+    memory is loaded per agent. Agents idle
+    for ``idle_ttl`` seconds are evicted, and once more than
+    ``max_sessions`` are resident the least recently used one is; evicting
+    an agent flushes its memories to disk. A background thread sweeps out
+    idle agents every ``sweep_interval`` seconds.
+
+    An agent taken with ``acquire()`` is leased until ``release()`` and is
+    never evicted while leased, so a turn in progress cannot have its memory
+    closed under it. Agents are created outside the pool lock; a session
+    being created makes only its own callers wait.
+
+    Metrics, under ``name``: ``created`` and ``evicted`` counters and a
+    ``resident`` gauge.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 500,
+        idle_ttl: Optional[float] = 1800.0,
+        memory_store: Optional[MemoryStore] = None,
+        context_analyzer: Optional[ContextAnalyzer] = None,
+        conversation: Optional[ConversationHandler] = None,
+        llm_client: Optional[LLMClient] = None,
+        sweep_interval: Optional[float] = 60.0,
+        name: str = "sessions",
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_sessions: Maximum unleased agents kept resident
+            idle_ttl: Seconds without a turn before a session is evicted, or None
+            memory_store: Store holding the sessions' memories (defaults to the
+                process-wide store)
+            context_analyzer: Analyzer shared by every agent (defaults to the
+                process-wide one)
+            conversation: Rule-based responder shared by every agent (defaults
+                to the process-wide one)
+            llm_client: LLM client shared by every agent (defaults to the
+                process-wide one)
+            sweep_interval: Seconds between background sweeps for idle
+                sessions, or None to evict them only when the pool is used
+            name: Metrics prefix, and the sweep thread's name
+        """
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl = idle_ttl
+        self.memory_store = memory_store if memory_store is not None else get_memory_store()
+        self.context_analyzer = context_analyzer if context_analyzer is not None else get_context_analyzer()
+        self.conversation = conversation if conversation is not None else get_conversation_handler()
+        self._llm_client = llm_client
+        self._agents: "OrderedDict[str, Tuple[SpiritualAgent, float]]" = OrderedDict()
+        self._leases: Dict[str, int] = {}
+        self._busy: Dict[str, threading.Event] = {}  # Sessions whose agent is being created
+        self._lock = threading.Lock()
+        metrics = get_metrics()
+        self._created = metrics.counter(f"{name}.created")
+        self._evicted = metrics.counter(f"{name}.evicted")
+        self._resident = metrics.gauge(f"{name}.resident")
+        self._stopped = threading.Event()
+        if sweep_interval and idle_ttl is not None:
+            threading.Thread(target=self._run, args=(sweep_interval,), name=f"{name}.sweep", daemon=True).start()
+
+    @property
+    def llm_client(self) -> LLMClient:
+        """The LLM client shared by the pool's agents."""
+        return self._llm_client if self._llm_client is not None else get_shared_llm_client()
+
+    def get(self, session_id: str) -> SpiritualAgent:
+        """Get the session's agent, creating it if needed.
+
+        The agent may be evicted once it is idle or the least recently used;
+        use ``acquire()`` to hold on to it while it is in use.
+        """
+        return self._get(session_id, lease=False)
+
+    def acquire(self, session_id: str) -> SpiritualAgent:
+        """Get the session's agent and lease it until ``release()``."""
+        return self._get(session_id, lease=True)
+
+    def release(self, session_id: str) -> None:
+        """Return a lease taken by ``acquire()``; the release counts as use."""
+        with self._lock:
+            leases = self._leases.get(session_id, 0) - 1
+            if leases > 0:
+                self._leases[session_id] = leases
+            else:
+                self._leases.pop(session_id, None)
+            now = time.monotonic()
+            entry = self._agents.pop(session_id, None)
+            if entry is not None:
+                self._agents[session_id] = (entry[0], now)
+            evicted = self._expire(now)
+        self._release(evicted)
+
+    def evict(self, session_id: str) -> bool:
+        """Drop a session's agent, flushing its memories.
+
+        Returns:
+            True if the session was evicted, False if it was not resident
+            or is leased
+        """
+        with self._lock:
+            if session_id not in self._agents or self._leases.get(session_id):
+                return False
+            entry = self._agents.pop(session_id)
+            self._resident.set(len(self._agents))
+        self._release([entry[0]])
+        return True
+
+    def sweep(self) -> int:
+        """Evict idle sessions now.
+
+        Returns:
+            The number of sessions evicted
+        """
+        with self._lock:
+            evicted = self._expire(time.monotonic())
+        self._release(evicted)
+        return len(evicted)
+
+    def close(self) -> None:
+        """Stop sweeping and evict every session, leased or not."""
+        self._stopped.set()
+        with self._lock:
+            evicted = [agent for agent, _ in self._agents.values()]
+            self._agents.clear()
+            self._leases.clear()
+            self._resident.set(0)
+        self._release(evicted)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._agents
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def _get(self, session_id: str, lease: bool) -> SpiritualAgent:
+        while True:
+            with self._lock:
+                entry = self._agents.pop(session_id, None)
+                if entry is not None:
+                    agent = entry[0]
+                    evicted = self._checkout(session_id, agent, lease)
+                    break
+                busy = self._busy.get(session_id)
+                if busy is None:
+                    busy = self._busy[session_id] = threading.Event()
+                    agent = None
+                    break
+            # Another thread is creating this session's agent
+            busy.wait()
+
+        if agent is None:
+            try:
+                agent = SpiritualAgent(
+                    session_id=session_id,
+                    memory_store=self.memory_store,
+                    context_analyzer=self.context_analyzer,
+                    conversation=self.conversation,
+                    llm_client=self._llm_client,
+                )
+            except BaseException:
+                with self._lock:
+                    del self._busy[session_id]
+                busy.set()
+                raise
+            self._created.inc()
+            with self._lock:
+                del self._busy[session_id]
+                evicted = self._checkout(session_id, agent, lease)
+            busy.set()
+        self._release(evicted)
+        return agent
+
+    def _checkout(self, session_id: str, agent: SpiritualAgent, lease: bool) -> list:
+        """Mark a session's agent as just used (and leased); returns the
+        agents that are now due for eviction (called with the lock held)."""
+        now = time.monotonic()
+        self._agents[session_id] = (agent, now)
+        if lease:
+            self._leases[session_id] = self._leases.get(session_id, 0) + 1
+        return self._expire(now, keep=session_id)
+
+    def _expire(self, now: float, keep: Optional[str] = None) -> list:
+        """Drop idle and surplus unleased sessions, least recently used first
+        (called with the lock held)."""
+        doomed = []
+        surplus = len(self._agents) - self.max_sessions
+        for session_id, (_, last_used) in self._agents.items():
+            if session_id == keep or session_id in self._leases:
+                continue
+            idle = self.idle_ttl is not None and now - last_used > self.idle_ttl
+            if not idle and len(doomed) >= surplus:
+                break
+            doomed.append(session_id)
+        evicted = [self._agents.pop(session_id)[0] for session_id in doomed]
+        self._resident.set(len(self._agents))
+        return evicted
+
+    def _release(self, agents: list) -> None:
+        """Close evicted agents and unload their memories (outside the lock).
+
+        The store keeps a memory that a newer agent for the same session has
+        leased in the meantime.
+        """
+        for agent in agents:
+            agent.close()
+            self.memory_store.evict(agent.session_id)
+            self._evicted.inc()
+
+    def _run(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            self.sweep()
@@ -0,0 +1,226 @@
+"""Single-flight coalescing of concurrent identical calls."""
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import threading
+
+from src.utils.metrics import get_metrics
+
+
+def _abandoned() -> RuntimeError:
+    return RuntimeError("Shared stream stopped after all its readers left")
+
+
+class _Broadcast:
+    """Tokens of one stream, replayed to every reader as they arrive (threads)."""
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.readers = 0
+        self.changed = threading.Condition()
+
+    def read(self) -> Iterator[str]:
+        position = 0
+        while True:
+            with self.changed:
+                while position == len(self.tokens) and not self.done:
+                    self.changed.wait()
+                batch = self.tokens[position:]
+                position = len(self.tokens)
+                finished, error = self.done, self.error
+            yield from batch
+            if finished and position == len(self.tokens):
+                if error is not None:
+                    raise error
+                return
+
+
+class _AsyncBroadcast:
+    """Tokens of one stream, replayed to every reader as they arrive (one event loop)."""
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.readers = 0
+        self.producer: Optional[asyncio.Task] = None
+        self.changed = asyncio.Event()
+
+    def publish(self) -> None:
+        """Wake every reader waiting for more tokens."""
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def read(self) -> AsyncIterator[str]:
+        position = 0
+        while True:
+            while position < len(self.tokens):
+                yield self.tokens[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self.changed.wait()
+
+
+class SingleFlight:
+    """Runs one call per key at a time and shares it with concurrent callers.
+
+    A caller that arrives while a call with the same key is in flight waits
+    for it and gets the same result (or exception) instead of starting its
+    own. Streams are shared too: late joiners first get the tokens produced
+    so far, then the rest as they arrive. A stream stops early once every
+    reader has gone.
+
+    Calls that led a flight and calls that joined one are counted in the
+    metrics registry as ``<name>.leaders`` and ``<name>.coalesced``.
+    """
+
+    def __init__(self, name: str = "llm.single_flight"):
+        """Initialize the group.
+
+        Args:
+            name: Metrics prefix
+        """
+        self._calls: Dict[Any, Tuple[threading.Event, list]] = {}
+        self._streams: Dict[Any, _Broadcast] = {}
+        self._async_calls: Dict[Any, "asyncio.Future"] = {}
+        self._async_streams: Dict[Any, _AsyncBroadcast] = {}
+        self._lock = threading.Lock()
+        metrics = get_metrics()
+        self._leaders = metrics.counter(f"{name}.leaders")
+        self._coalesced = metrics.counter(f"{name}.coalesced")
+
+    def do(self, key: Any, call: Callable[[], Any]) -> Any:
+        """Run ``call()``, or wait for the in-flight call with the same key."""
+        with self._lock:
+            flight = self._calls.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._calls[key] = (threading.Event(), [None, None])
+        finished, outcome = flight
+
+        if not leader:
+            self._coalesced.inc()
+            finished.wait()
+        else:
+            self._leaders.inc()
+            try:
+                outcome[0] = call()
+            except BaseException as e:
+                outcome[1] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                finished.set()
+
+        if outcome[1] is not None:
+            raise outcome[1]
+        return outcome[0]
+
+    async def ado(self, key: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of ``do()``; calls are shared within one event loop.
+
+        A caller that is cancelled stops waiting, but the shared call runs on
+        for the others.
+        """
+        key = (asyncio.get_running_loop(), key)
+        task = self._async_calls.get(key)
+        if task is None:
+            self._leaders.inc()
+            task = self._async_calls[key] = asyncio.ensure_future(call())
+            task.add_done_callback(lambda _: self._async_calls.pop(key, None))
+        else:
+            self._coalesced.inc()
+        return await asyncio.shield(task)
+
+    def stream(self, key: Any, generate: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Yield the tokens of ``generate()``, shared with concurrent streams of the same key.
+
+        The leading stream's tokens are produced by a background thread.
+        """
+        with self._lock:
+            broadcast = self._streams.get(key)
+            leader = broadcast is None
+            if leader:
+                broadcast = self._streams[key] = _Broadcast()
+            with broadcast.changed:
+                broadcast.readers += 1
+        if leader:
+            self._leaders.inc()
+            threading.Thread(target=self._produce, args=(key, broadcast, generate), daemon=True).start()
+        else:
+            self._coalesced.inc()
+
+        try:
+            yield from broadcast.read()
+        finally:
+            with broadcast.changed:
+                broadcast.readers -= 1
+
+    async def astream(self, key: Any, generate: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """Async variant of ``stream()``; the leading stream is produced by a task."""
+        key = (asyncio.get_running_loop(), key)
+        broadcast = self._async_streams.get(key)
+        if broadcast is None:
+            self._leaders.inc()
+            broadcast = self._async_streams[key] = _AsyncBroadcast()
+            broadcast.producer = asyncio.ensure_future(self._aproduce(key, broadcast, generate))
+        else:
+            self._coalesced.inc()
+        broadcast.readers += 1
+
+        try:
+            async for token in broadcast.read():
+                yield token
+        finally:
+            broadcast.readers -= 1
+            if not broadcast.readers and not broadcast.done:
+                # Nobody is listening any more
+                broadcast.producer.cancel()
+
+    def _produce(self, key: Any, broadcast: _Broadcast, generate: Callable[[], Iterator[str]]) -> None:
+        tokens = generate()
+        try:
+            for token in tokens:
+                with broadcast.changed:
+                    if not broadcast.readers:
+                        # Fails anyone who joined while the stream was shutting down
+                        broadcast.error = _abandoned()
+                        break
+                    broadcast.tokens.append(token)
+                    broadcast.changed.notify_all()
+        except BaseException as e:
+            broadcast.error = e
+        finally:
+            close = getattr(tokens, "close", None)
+            if close is not None:
+                close()
+            with self._lock:
+                del self._streams[key]
+            with broadcast.changed:
+                broadcast.done = True
+                broadcast.changed.notify_all()
+
+    async def _aproduce(
+        self, key: Any, broadcast: _AsyncBroadcast, generate: Callable[[], AsyncIterator[str]]
+    ) -> None:
+        tokens = generate()
+        try:
+            async for token in tokens:
+                broadcast.tokens.append(token)
+                broadcast.publish()
+        except asyncio.CancelledError:
+            broadcast.error = _abandoned()
+            raise
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            aclose = getattr(tokens, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            del self._async_streams[key]
+            broadcast.done = True
+            broadcast.publish()
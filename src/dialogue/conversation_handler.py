@@ -3,6 +3,8 @@ from typing import Dict, Any, List, Optional
 from pathlib import Path
 import json
 
+from src.memory.records import Interaction
+
 
 class ConversationHandler:
     """Handles conversation flow and response generation."""
@@ -16,7 +18,7 @@ class ConversationHandler:
         self,
         user_message: str,
         context: Dict[str, Any],
-        memories: List[Dict[str, Any]],
+        memories: List[Interaction],
     ) -> str:
         """Generate a contextual response.
         
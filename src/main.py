@@ -13,7 +13,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.core.agent import SpiritualAgent
+from src.core.agent import SpiritualAgent, close_shared_llm_client
 from src.core.constants import GREETING, FAREWELL
 
 
@@ -39,6 +39,9 @@ def main():
             
     except KeyboardInterrupt:
         print("\n\nAgent: Take care on your spiritual journey. 🙏")
+    finally:
+        agent.close()
+        close_shared_llm_client()
 
 
 if __name__ == "__main__":
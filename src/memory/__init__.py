@@ -1,4 +1,6 @@
 """Memory management package."""
 from src.memory.memory_manager import MemoryManager
+from src.memory.records import Interaction
+from src.memory.store import MemoryStore
 
-__all__ = ["MemoryManager"]
+__all__ = ["MemoryManager", "Interaction", "MemoryStore"]
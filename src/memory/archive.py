@@ -0,0 +1,195 @@
+"""Append-only, memory-mapped archive for cold episodic memories."""
+from array import array
+from typing import List, Iterator, Optional, Tuple
+from pathlib import Path
+import heapq
+import json
+import mmap
+import os
+import threading
+
+from src.memory.index import tokenize
+from src.memory.records import Interaction
+
+
+class EpisodeArchive:
+    """Cold tier of episodic memory stored on disk.
+
+    Episodes are appended as JSON lines to ``episodes.log`` and the byte
+    offset of each line is appended to ``episodes.idx`` as an unsigned 64-bit
+    integer. Both files are memory-mapped for reading, so any episode can be
+    fetched by position and pages can be scanned without loading the archive
+    into RAM. The maps are only held during a read: each one keeps a file
+    descriptor, and a process may have thousands of archives resident.
+    """
+
+    def __init__(self, data_dir: Path):
+        """Initialize the archive.
+
+        Args:
+            data_dir: Directory holding episodes.log and episodes.idx
+        """
+        self.log_path = Path(data_dir) / "episodes.log"
+        self.idx_path = Path(data_dir) / "episodes.idx"
+        self._lock = threading.Lock()
+        self._log_map: Optional[mmap.mmap] = None
+        self._idx_map: Optional[mmap.mmap] = None
+        self._idx_view: Optional[memoryview] = None
+        self._offsets: Optional[memoryview] = None
+        self._count = self._valid_count()
+
+    def append(self, records: List[Interaction]) -> None:
+        """Append episodes, oldest first."""
+        if not records:
+            return
+        with self._lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            offsets = array("Q")
+            with open(self.log_path, "ab") as log:
+                position = log.seek(0, os.SEEK_END)
+                for record in records:
+                    line = json.dumps(record.to_dict(), separators=(",", ":")).encode("utf-8") + b"\n"
+                    offsets.append(position)
+                    log.write(line)
+                    position += len(line)
+            # The log is written first, so an index entry never points past it
+            with open(self.idx_path, "r+b" if self.idx_path.exists() else "wb") as idx:
+                idx.seek(self._count * offsets.itemsize)
+                offsets.tofile(idx)
+                idx.truncate()
+            self._count += len(offsets)
+            self._unmap()
+
+    def get(self, position: int) -> Interaction:
+        """Get the episode at a position (0 is the oldest; negatives count from the end)."""
+        with self._lock:
+            if position < 0:
+                position += self._count
+            if not 0 <= position < self._count:
+                raise IndexError("archive position out of range")
+            self._map()
+            try:
+                return self._read(position)
+            finally:
+                self._unmap()
+
+    def page(self, start: int, stop: int) -> List[Interaction]:
+        """Get the episodes in positions [start, stop), oldest first."""
+        with self._lock:
+            start, stop = max(0, start), min(stop, self._count)
+            if start >= stop:
+                return []
+            self._map()
+            try:
+                return [self._read(i) for i in range(start, stop)]
+            finally:
+                self._unmap()
+
+    def iter_pages(self, page_size: int = 256) -> Iterator[List[Interaction]]:
+        """Iterate over the archive in pages, newest page first."""
+        stop = self._count
+        while stop > 0:
+            start = max(0, stop - page_size)
+            yield self.page(start, stop)
+            stop = start
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        page_size: int = 256,
+        max_records: Optional[int] = None,
+    ) -> List[Tuple[Interaction, float]]:
+        """Find archived episodes sharing the most terms with a query.
+
+        Pages are scanned newest first, so only ``max_records`` episodes are
+        decoded when a limit is given. Scores are the fraction of query terms
+        an episode contains; ties favour newer episodes.
+
+        Returns:
+            List of (episode, score), best first
+        """
+        terms = set(tokenize(query))
+        if not terms or k <= 0:
+            return []
+
+        # Min-heap of the k best hits; -scanned is unique, so records are never compared
+        hits: List[Tuple[float, int, Interaction]] = []
+        scanned = 0
+        for page in self.iter_pages(page_size):
+            for record in reversed(page):
+                overlap = len(terms.intersection(tokenize(record.user)))
+                if overlap:
+                    hit = (overlap / len(terms), -scanned, record)
+                    if len(hits) < k:
+                        heapq.heappush(hits, hit)
+                    elif hit[:2] > hits[0][:2]:
+                        heapq.heapreplace(hits, hit)
+                scanned += 1
+                if max_records is not None and scanned >= max_records:
+                    break
+            if max_records is not None and scanned >= max_records:
+                break
+
+        hits.sort(key=lambda hit: (hit[0], hit[1]), reverse=True)
+        return [(record, score) for score, _, record in hits]
+
+    @property
+    def last_timestamp(self) -> float:
+        """Timestamp of the newest archived episode (0.0 when empty)."""
+        return self.get(-1).timestamp if self._count else 0.0
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        with self._lock:
+            self._unmap()
+
+    def _valid_count(self) -> int:
+        """Count index entries that point inside the log (drops a torn tail)."""
+        if not self.idx_path.exists() or not self.log_path.exists():
+            return 0
+        offsets = array("Q")
+        with open(self.idx_path, "rb") as idx:
+            data = idx.read()
+        offsets.frombytes(data[:len(data) - len(data) % offsets.itemsize])
+        log_size = self.log_path.stat().st_size
+        count = len(offsets)
+        while count and offsets[count - 1] >= log_size:
+            count -= 1
+        return count
+
+    def _map(self) -> None:
+        """Memory-map the log and index if not already mapped."""
+        if self._log_map is not None:
+            return
+        with open(self.log_path, "rb") as log:
+            self._log_map = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.idx_path, "rb") as idx:
+            self._idx_map = mmap.mmap(idx.fileno(), 0, access=mmap.ACCESS_READ)
+        usable = len(self._idx_map) - len(self._idx_map) % 8
+        self._idx_view = memoryview(self._idx_map)[:usable]
+        self._offsets = self._idx_view.cast("Q")
+
+    def _unmap(self) -> None:
+        """Drop the memory maps so the next read sees appended data."""
+        for view in (self._offsets, self._idx_view):
+            if view is not None:
+                view.release()
+        self._offsets = None
+        self._idx_view = None
+        for mapped in (self._log_map, self._idx_map):
+            if mapped is not None:
+                mapped.close()
+        self._log_map = None
+        self._idx_map = None
+
+    def _read(self, position: int) -> Interaction:
+        """Decode the episode at a position (maps must be open)."""
+        start = self._offsets[position]
+        end = self._log_map.find(b"\n", start)
+        if end < 0:
+            end = len(self._log_map)
+        return Interaction.from_dict(json.loads(self._log_map[start:end]))
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,130 @@
+"""Write-behind flushing of dirty memory state."""
+from typing import Dict, Any, List, Optional, Set, Tuple
+import atexit
+import threading
+import time
+
+
+class WriteBehindFlusher:
+    """Background thread that persists dirty memory managers in batches.
+
+    Targets are any object with a ``flush()`` method. A scheduled target is
+    flushed once its deadline passes, or immediately when it is scheduled as
+    urgent (e.g. its pending batch reached ``save_frequency``). A single
+    flusher thread serves every target, so the cost does not grow with the
+    number of resident memory managers.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        """Initialize the flusher.
+
+        Args:
+            interval: Default seconds a target may stay dirty before flushing
+        """
+        self.interval = interval
+        self._dirty: Dict[int, Tuple[Any, float]] = {}
+        self._urgent: Set[int] = set()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def schedule(self, target: Any, urgent: bool = False, delay: Optional[float] = None) -> None:
+        """Mark a target dirty.
+
+        Args:
+            target: Object exposing ``flush()``
+            urgent: Flush as soon as possible instead of waiting for the deadline
+            delay: Seconds until the target is due (defaults to ``interval``)
+        """
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                key = id(target)
+                if key not in self._dirty:
+                    deadline = time.monotonic() + (self.interval if delay is None else delay)
+                    self._dirty[key] = (target, deadline)
+                if urgent:
+                    self._urgent.add(key)
+                self._ensure_thread()
+                self._cond.notify()
+        if closed:
+            target.flush()
+
+    def discard(self, target: Any) -> None:
+        """Forget a target without flushing it."""
+        with self._cond:
+            self._dirty.pop(id(target), None)
+            self._urgent.discard(id(target))
+
+    def flush_all(self) -> None:
+        """Synchronously flush every dirty target."""
+        with self._cond:
+            targets = [target for target, _ in self._dirty.values()]
+            self._dirty.clear()
+            self._urgent.clear()
+        self._flush(targets)
+
+    def close(self) -> None:
+        """Flush everything and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush_all()
+
+    def _ensure_thread(self) -> None:
+        """Start the flusher thread on first use."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="memory-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Flush targets as they become due."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    due = [
+                        key for key, (_, deadline) in self._dirty.items()
+                        if key in self._urgent or deadline <= now
+                    ]
+                    if due:
+                        break
+                    timeout = None
+                    if self._dirty:
+                        timeout = min(deadline for _, deadline in self._dirty.values()) - now
+                    self._cond.wait(timeout)
+                targets = [self._dirty.pop(key)[0] for key in due]
+                self._urgent.difference_update(due)
+            self._flush(targets)
+
+    @staticmethod
+    def _flush(targets: List[Any]) -> None:
+        """Flush targets, isolating failures."""
+        for target in targets:
+            try:
+                target.flush()
+            except Exception as e:
+                print(f"Memory flush failed: {e}")
+
+
+_default_flusher: Optional[WriteBehindFlusher] = None
+_default_lock = threading.Lock()
+
+
+def get_flusher() -> WriteBehindFlusher:
+    """Get the process-wide flusher, flushed automatically at exit."""
+    global _default_flusher
+    with _default_lock:
+        if _default_flusher is None:
+            _default_flusher = WriteBehindFlusher()
+            atexit.register(_default_flusher.close)
+        return _default_flusher
@@ -0,0 +1,144 @@
+"""Incremental inverted index with BM25 scoring."""
+from collections import Counter
+from typing import List, Dict, Tuple
+from itertools import islice
+import heapq
+import math
+import re
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "do", "for",
+    "from", "how", "i", "i'm", "in", "is", "it", "its", "me", "my", "of",
+    "on", "or", "so", "that", "the", "this", "to", "was", "what", "with",
+    "you", "your",
+])
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, dropping stopwords."""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class InvertedIndex:
+    """Inverted index over short documents, updated in place.
+
+    Postings map each term to ``{doc_id: term frequency}``; document lengths
+    and the corpus length total are kept alongside, so adding or removing a
+    document only touches the postings of its own terms.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_postings: int = 256):
+        """Initialize the index.
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+            max_postings: Most recent postings walked per term when looking
+                for new candidates, bounding the cost of very common terms
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_postings = max_postings
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def add(self, doc_id: int, text: str) -> None:
+        """Index a document, replacing any previous version with the same id."""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from the index."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """Find the documents most relevant to a query.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+
+        Returns:
+            List of (doc_id, score), best first
+        """
+        n_docs = len(self._doc_lengths)
+        if not n_docs or k <= 0:
+            return []
+
+        k1 = self.k1
+        avg_length = (self._total_length / n_docs) or 1.0
+        length_norm = k1 * self.b / avg_length
+        base_norm = k1 * (1 - self.b)
+        doc_lengths = self._doc_lengths
+
+        # Score rare terms first. Once k candidates exist and even a perfect
+        # match on every remaining term could not reach the k-th best score,
+        # the remaining (common, long) postings only need to re-score the
+        # existing candidates instead of being walked in full (MaxScore).
+        # Otherwise a term contributes candidates from at most its
+        # max_postings most recent documents.
+        terms = []
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings:
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                terms.append((df, idf * (k1 + 1), postings))
+        terms.sort(key=lambda t: t[0])
+
+        remaining_bound = sum(weight for _, weight, _ in terms)
+        scores: Dict[int, float] = {}
+        pruned = False
+        for df, weight, postings in terms:
+            if pruned or len(scores) >= k:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+                if remaining_bound <= threshold:
+                    # No unseen document can enter the top k; keep only the
+                    # candidates that still can.
+                    pruned = True
+                    scores = {
+                        doc_id: score for doc_id, score in scores.items()
+                        if score + remaining_bound >= threshold
+                    }
+            if pruned:
+                for doc_id in scores:
+                    tf = postings.get(doc_id)
+                    if tf:
+                        norm = base_norm + length_norm * doc_lengths[doc_id]
+                        scores[doc_id] += weight * tf / (tf + norm)
+            else:
+                entries = postings.items()
+                if df > self.max_postings:
+                    entries = islice(reversed(entries), self.max_postings)
+                for doc_id, tf in entries:
+                    norm = base_norm + length_norm * doc_lengths[doc_id]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + norm)
+            remaining_bound -= weight
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._doc_terms
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
@@ -0,0 +1,105 @@
+"""Time-bucketed aggregates over episodic history."""
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+
+BUCKET_SECONDS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+}
+
+# Buckets kept per granularity: one week of hours, a year of days, ten years of weeks
+RETENTION = {
+    "hour": 24 * 7,
+    "day": 366,
+    "week": 520,
+}
+
+# The epoch fell on a Thursday; shift so weekly buckets start on Monday
+_WEEK_OFFSET = 3 * 86400
+
+
+class InsightTimeline:
+    """Counts of interactions, emotions and intents per hour, day and week.
+
+    Buckets are updated in O(1) as interactions are added, so trend queries
+    never rescan history. The state is a plain JSON-serializable dict so it
+    can live inside long-term memory and be persisted with it. Bucket
+    boundaries are aligned to UTC; weeks start on Monday.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """Initialize the timeline.
+
+        Args:
+            data: Previously persisted state, updated in place
+        """
+        self.data = data if data is not None else {}
+        for granularity in BUCKET_SECONDS:
+            self.data.setdefault(granularity, {})
+
+    def add(self, epoch: float, emotion: Optional[str], intent: Optional[str]) -> None:
+        """Count one interaction.
+
+        Args:
+            epoch: Time of the interaction in epoch seconds
+            emotion: Detected emotion, if any
+            intent: Detected intent, if any
+        """
+        for granularity in BUCKET_SECONDS:
+            buckets = self.data[granularity]
+            key = str(self._bucket_start(epoch, granularity))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {"interactions": 0, "emotions": {}, "intents": {}}
+                self._prune(buckets, RETENTION[granularity])
+            bucket["interactions"] += 1
+            if emotion:
+                bucket["emotions"][emotion] = bucket["emotions"].get(emotion, 0) + 1
+            if intent:
+                bucket["intents"][intent] = bucket["intents"].get(intent, 0) + 1
+
+    def query(self, granularity: str = "day", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the aggregated buckets for a granularity.
+
+        Args:
+            granularity: "hour", "day" or "week"
+            limit: Only return the most recent buckets
+
+        Returns:
+            Buckets oldest first, each with its start time and counts
+        """
+        if granularity not in BUCKET_SECONDS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        buckets = self.data[granularity]
+        keys = sorted(buckets, key=int)
+        if limit is not None:
+            keys = keys[-limit:] if limit > 0 else []
+        return [
+            {
+                "start": datetime.fromtimestamp(int(key), timezone.utc).isoformat(),
+                "interactions": buckets[key]["interactions"],
+                "emotions": dict(buckets[key]["emotions"]),
+                "intents": dict(buckets[key]["intents"]),
+                "dominant_emotion": max(
+                    buckets[key]["emotions"], key=buckets[key]["emotions"].get, default=None
+                ),
+            }
+            for key in keys
+        ]
+
+    @staticmethod
+    def _bucket_start(epoch: float, granularity: str) -> int:
+        """Get the start (epoch seconds) of the bucket containing a time."""
+        size = BUCKET_SECONDS[granularity]
+        offset = _WEEK_OFFSET if granularity == "week" else 0
+        return int((epoch + offset) // size * size - offset)
+
+    @staticmethod
+    def _prune(buckets: Dict[str, Any], retention: int) -> None:
+        """Drop the oldest buckets beyond the retention limit."""
+        excess = len(buckets) - retention
+        if excess > 0:
+            for key in sorted(buckets, key=int)[:excess]:
+                del buckets[key]
@@ -0,0 +1,192 @@
+"""Append-only journal with background snapshot compaction."""
+from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+import json
+import os
+import threading
+
+
+class MemoryJournal:
+    """Persists memories as a snapshot plus an append-only JSONL journal.
+
+    Every interaction is appended as one compact JSON line. Once the journal
+    grows past ``compact_threshold`` records it is rotated out and folded into
+    the snapshot on a background thread, so the request path never rewrites
+    the full memory file.
+
+    Records carry a monotonically increasing ``seq``; the snapshot stores the
+    last ``seq`` it contains so that replay after a crash mid-compaction never
+    applies a record twice.
+
+    The journal file is opened for each batch appended rather than held
+    open, so a process with thousands of resident sessions does not hold
+    thousands of file descriptors.
+    """
+
+    def __init__(self, snapshot_path: Path, compact_threshold: int = 500):
+        """Initialize the journal.
+
+        Args:
+            snapshot_path: Path of the JSON snapshot (e.g. ``memories.json``)
+            compact_threshold: Journal records to accumulate before compacting
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_suffix(".jsonl")
+        self.rotated_path = self.snapshot_path.with_suffix(".jsonl.1")
+        self.compact_threshold = compact_threshold
+        self.seq = 0
+        self._pending = 0  # Records appended since the last compaction
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Load the snapshot and the journal records not yet folded into it.
+
+        Returns:
+            Tuple of (snapshot data, records to replay in order)
+        """
+        snapshot: Dict[str, Any] = {}
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r") as f:
+                    snapshot = json.load(f)
+            except Exception:
+                snapshot = {}
+
+        base_seq = snapshot.get("seq", 0)
+        self.seq = base_seq
+        records = []
+        for path in (self.rotated_path, self.journal_path):
+            # Later appends must start on a fresh line, not extend a torn one
+            self._truncate_torn_tail(path)
+            for record in self._read_records(path):
+                seq = record.get("seq", 0)
+                if seq <= self.seq:
+                    continue
+                self.seq = seq
+                records.append(record)
+
+        self._pending = len(records)
+        return snapshot, records
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """Append a batch of records to the journal in a single write.
+
+        Args:
+            records: JSON-serializable records, oldest first
+
+        Returns:
+            The sequence number assigned to the last record
+        """
+        with self._lock:
+            lines = []
+            for record in records:
+                self.seq += 1
+                lines.append(json.dumps({**record, "seq": self.seq}, separators=(",", ":")))
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            self._pending += len(records)
+            return self.seq
+
+    def needs_compaction(self, incoming: int = 0) -> bool:
+        """Check whether the journal should be folded into the snapshot.
+
+        Args:
+            incoming: Records about to be appended, counted as if already written
+        """
+        compacting = self._compactor is not None and self._compactor.is_alive()
+        return self._pending + incoming >= self.compact_threshold and not compacting
+
+    def compact(self, state: Dict[str, Any], background: bool = True) -> None:
+        """Fold the journal into a new snapshot.
+
+        ``state`` must reflect every record appended so far; the journal is
+        rotated immediately so new appends go to a fresh file while the
+        snapshot is written.
+
+        Args:
+            state: Full memory state to snapshot (episodic, long_term)
+            background: Write the snapshot on a background thread
+        """
+        with self._lock:
+            if self._compactor is not None:
+                self._compactor.join()
+            snapshot = {**state, "seq": self.seq}
+            if self.journal_path.exists():
+                if self.rotated_path.exists():
+                    # A previous compaction never finished; keep its records
+                    with open(self.rotated_path, "a", encoding="utf-8") as dst, \
+                            open(self.journal_path, "r", encoding="utf-8") as src:
+                        dst.write(src.read())
+                    self.journal_path.unlink()
+                else:
+                    os.replace(self.journal_path, self.rotated_path)
+            self._pending = 0
+
+            if background:
+                self._compactor = threading.Thread(
+                    target=self._write_snapshot, args=(snapshot,),
+                    name="memory-compactor", daemon=True,
+                )
+                self._compactor.start()
+            else:
+                self._compactor = None
+                self._write_snapshot(snapshot)
+
+    def close(self) -> None:
+        """Wait for any running compaction."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Atomically replace the snapshot and drop the rotated journal."""
+        tmp_path = self.snapshot_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        try:
+            self.rotated_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path) -> None:
+        """Cut a journal file back to its last complete line."""
+        if not path.exists():
+            return
+        with open(path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            keep = end
+            while keep > 0:
+                start = max(0, keep - 4096)
+                f.seek(start)
+                chunk = f.read(keep - start)
+                if keep == end and chunk.endswith(b"\n"):
+                    return
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                keep = start
+            f.truncate(keep)
+
+    @staticmethod
+    def _read_records(path: Path) -> List[Dict[str, Any]]:
+        """Read journal records, skipping lines torn by a crash mid-write."""
+        if not path.exists():
+            return []
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
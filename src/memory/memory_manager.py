@@ -1,25 +1,100 @@
 """Memory systems (short-term, long-term, episodic)."""
-from collections import deque
+from collections import Counter, deque
 from typing import List, Dict, Any, Optional
 from pathlib import Path
+import copy
+import hashlib
 import json
-from datetime import datetime
+import os
+import threading
+
+from src.memory.archive import EpisodeArchive
+from src.memory.flusher import get_flusher
+from src.memory.index import InvertedIndex, tokenize
+from src.memory.insights import InsightTimeline
+from src.memory.journal import MemoryJournal
+from src.memory.records import Interaction
+from src.memory.vector_index import VectorIndex
+
+# Newest archived episodes scanned by default when searching the archive
+ARCHIVE_SCAN_RECORDS = 10_000
 
 
 class MemoryManager:
     """Manages different memory systems for the spiritual agent."""
     
-    def __init__(self, max_short_term: int = 20, max_episodic: int = 50):
+    def __init__(
+        self,
+        max_short_term: int = 20,
+        max_episodic: int = 50,
+        storage: str = "journal",
+        compact_threshold: int = 500,
+        save_frequency: int = 10,
+        flush_interval: float = 1.0,
+        write_behind: bool = True,
+        data_dir: Optional[Path] = None,
+        archive: bool = True,
+    ):
         """Initialize memory manager.
         
         Args:
             max_short_term: Maximum short-term memories to keep
-            max_episodic: Maximum episodic memories to keep
+            max_episodic: Maximum episodic memories kept in RAM (the hot tier)
+            storage: "journal" to append one record per interaction and
+                compact in the background, or "snapshot" to rewrite
+                memories.json on every flush
+            compact_threshold: Journal records to accumulate before compacting
+            save_frequency: Interactions to batch before flushing to disk
+            flush_interval: Maximum seconds an interaction stays unflushed
+            write_behind: Persist on the background flusher instead of in store()
+            data_dir: Directory holding the memory files
+            archive: Move episodes evicted from the hot tier to an on-disk
+                archive instead of dropping them
         """
-        self.short_term = deque(maxlen=max_short_term)  # Recent conversation
+        if storage not in ("journal", "snapshot"):
+            raise ValueError(f"Unknown memory storage mode: {storage}")
+        
+        self.short_term: deque = deque(maxlen=max_short_term)  # Recent conversation
         self.long_term = {}  # User profile, preferences
-        self.episodic = []  # Significant interactions
+        self.episodic: List[Interaction] = []  # Significant interactions
         self.max_episodic = max_episodic
+        self.storage = storage
+        self.save_frequency = max(1, save_frequency)
+        self.flush_interval = flush_interval
+        
+        if data_dir is None:
+            data_dir = Path(__file__).parent.parent.parent / "data" / "user_data"
+        self._journal = MemoryJournal(Path(data_dir) / "memories.json", compact_threshold)
+        self._vectors_path = Path(data_dir) / "memories.vectors.npy"
+        self._pending: List[Interaction] = []  # Interactions not yet on disk
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._flusher = get_flusher() if write_behind else None
+        
+        # Cold tier: episodes evicted from RAM, appended on flush
+        self._archive = EpisodeArchive(data_dir) if archive else None
+        self._archive_pending: List[Interaction] = []
+        self._archive_watermark = 0.0  # Newest archived timestamp at load time
+        
+        # Keyword index over short-term and episodic memories. Both tiers hold
+        # the same Interaction, so entries are keyed by id() and refcounted.
+        self._index = InvertedIndex()
+        self._index_refs: Dict[int, int] = {}
+        self._indexed: Dict[int, Interaction] = {}
+        
+        # Dense index over episodic memories, keyed by timestamp and text. Built
+        # on the first "vector" recall and persisted next to the snapshot.
+        # Records with the same key have the same text, so they share a row.
+        self._vectors: Optional[VectorIndex] = None
+        self._vectors_dirty = False
+        self._episodic_by_key: Dict[str, List[Interaction]] = {}
+        
+        # Insight counters over short-term memory, kept in step with the deque
+        self._emotion_counts: Counter = Counter()
+        self._intent_counts: Counter = Counter()
+        self._recent_emotions = deque(maxlen=min(3, max_short_term))
+        self._timeline = InsightTimeline()
         
         # Load from storage if exists
         self._load_memories()
@@ -31,45 +106,160 @@ class MemoryManager:
             user_message: The user's message
             agent_response: The agent's response
             context: Detected context (emotion, intent)
+            
+        Raises:
+            RuntimeError: If the manager has been closed
         """
-        # Add to short-term memory
-        self.short_term.append({
-            "user": user_message,
-            "agent": agent_response,
-            "timestamp": datetime.now().isoformat(),
-            "context": context,
-        })
+        record = Interaction.from_context(user_message, agent_response, context)
         
-        # Check if this is significant (for episodic memory)
-        is_significant = self._is_significant(context)
-        if is_significant:
-            self.episodic.append({
-                "user": user_message,
-                "agent": agent_response,
-                "timestamp": datetime.now().isoformat(),
-                "context": context,
-            })
-            # Trim episodic memory
-            if len(self.episodic) > self.max_episodic:
-                self.episodic = self.episodic[-self.max_episodic:]
-        
-        # Update long-term memory with patterns
-        self._update_long_term(context)
+        with self._lock:
+            if self._closed:
+                # Another manager may own the files now; writing here would fork the journal
+                raise RuntimeError("MemoryManager is closed")
+            # Add to short-term memory
+            if len(self.short_term) == self.short_term.maxlen:
+                evicted = self.short_term[0]
+                self._unindex(evicted)
+                self._count_insights(evicted, -1)
+            self.short_term.append(record)
+            self._index_record(record)
+            self._count_insights(record, 1)
+            
+            self._remember(record)
+            self._pending.append(record)
+            pending = len(self._pending)
         
         # Persist memories
-        self._save_memories()
+        if self._flusher is None:
+            self.flush()
+        else:
+            self._flusher.schedule(
+                self,
+                urgent=pending >= self.save_frequency,
+                delay=self.flush_interval,
+            )
+    
+    def flush(self) -> None:
+        """Write pending interactions to disk."""
+        self._write()
+    
+    def close(self, compact: bool = True) -> None:
+        """Flush pending interactions and release file handles.
+        
+        Args:
+            compact: Also fold the journal into the snapshot
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._flusher is not None:
+            self._flusher.discard(self)
+        self._write(compact=compact, final=True)
+        with self._io_lock:
+            self._journal.close()
+            if self._archive is not None:
+                self._archive.close()
     
-    def recall(self, query: str) -> List[Dict[str, Any]]:
+    def recall(
+        self,
+        query: str,
+        top_k: int = 5,
+        strategy: str = "keyword",
+        include_archive: bool = False,
+    ) -> List[Interaction]:
         """Recall relevant memories based on query.
         
         Args:
             query: The user's message to match against
+            top_k: Maximum number of memories to return
+            strategy: "keyword" for BM25 relevance over short-term and
+                episodic memories, "vector" for embedding similarity over
+                episodic memories (requires numpy), or "recent" for the
+                latest turns
+            include_archive: With "keyword", fill up to top_k from the
+                newest ``ARCHIVE_SCAN_RECORDS`` archived episodes when RAM
+                holds fewer matches
             
         Returns:
-            List of relevant memories
+            List of relevant memories, oldest first
         """
-        # Return recent conversation history
-        return list(self.short_term)
+        archive_wanted = 0
+        with self._lock:
+            if strategy == "keyword":
+                hits = self._index.search(query, top_k)
+                memories = [self._indexed[doc_id] for doc_id, _ in hits]
+                if include_archive and len(memories) < top_k:
+                    # Searched below, without holding the lock
+                    archive_wanted = top_k - len(memories)
+                elif memories:
+                    return sorted(memories, key=lambda m: m.timestamp)
+            elif strategy == "vector":
+                hits = self._vector_index().search(query, top_k)
+                memories = [
+                    record for key, score in hits if score > 0 for record in self._episodic_by_key[key]
+                ][:top_k]
+                if memories:
+                    return sorted(memories, key=lambda m: m.timestamp)
+            elif strategy != "recent":
+                raise ValueError(f"Unknown recall strategy: {strategy}")
+            recent = list(self.short_term)
+        
+        if archive_wanted:
+            # An episode archived since the RAM search may be found twice
+            seen = {(m.timestamp, m.user) for m in memories}
+            memories.extend(
+                record for record in self.search_archive(query, archive_wanted)
+                if (record.timestamp, record.user) not in seen
+            )
+            if memories:
+                return sorted(memories[:top_k], key=lambda m: m.timestamp)
+        
+        # Fall back to recent conversation history
+        return recent[-top_k:] if top_k > 0 else []
+    
+    def search_archive(
+        self, query: str, top_k: int = 5, max_records: Optional[int] = ARCHIVE_SCAN_RECORDS
+    ) -> List[Interaction]:
+        """Search archived episodes page by page without loading the archive.
+        
+        Args:
+            query: The text to match against
+            top_k: Maximum number of episodes to return
+            max_records: Only scan this many of the newest archived episodes,
+                or None to scan them all
+            
+        Returns:
+            Matching episodes, best first
+        """
+        with self._lock:
+            pending = [
+                (record, len(set(tokenize(query)) & set(tokenize(record.user))))
+                for record in reversed(self._archive_pending)
+            ]
+            memories = [record for record, overlap in sorted(pending, key=lambda p: -p[1]) if overlap]
+        if self._archive is not None:
+            hits = self._archive.search(query, top_k, max_records=max_records)
+            memories.extend(record for record, _ in hits)
+        return memories[:top_k]
+    
+    def page_archive(self, offset: int = 0, limit: int = 50) -> List[Interaction]:
+        """Page through archived episodes, newest first.
+        
+        Args:
+            offset: Number of newest episodes to skip
+            limit: Maximum number of episodes to return
+            
+        Returns:
+            Archived episodes, newest first
+        """
+        with self._lock:
+            pending = list(reversed(self._archive_pending))
+        page = pending[offset:offset + limit]
+        if self._archive is not None and len(page) < limit:
+            stop = len(self._archive) - max(0, offset - len(pending))
+            page.extend(reversed(self._archive.page(stop - (limit - len(page)), stop)))
+        return page
     
     def get_insights(self) -> Dict[str, Any]:
         """Get insights based on conversation history.
@@ -77,37 +267,202 @@ class MemoryManager:
         Returns:
             Dictionary with emotional trends, topics discussed, etc.
         """
-        emotions = [m.get("context", {}).get("emotion") for m in self.short_term if m.get("context")]
-        topics = [m.get("context", {}).get("intent") for m in self.short_term if m.get("context")]
+        with self._lock:
+            return {
+                "total_interactions": len(self.short_term),
+                "emotions_expressed": list(self._emotion_counts),
+                "topics_discussed": list(self._intent_counts),
+                "emotional_trend": self._get_emotional_trend(),
+            }
+    
+    def get_trends(self, granularity: str = "day", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get emotion and topic counts over episodic history.
         
+        Args:
+            granularity: Bucket size, "hour", "day" or "week"
+            limit: Only return the most recent buckets
+            
+        Returns:
+            Time buckets, oldest first
+        """
+        with self._lock:
+            return self._timeline.query(granularity, limit)
+    
+    def _remember(self, record: Interaction) -> None:
+        """Apply an interaction to episodic and long-term memory."""
+        # Check if this is significant (for episodic memory)
+        if self._is_significant(record):
+            self.episodic.append(record)
+            self._index_record(record)
+            self._timeline.add(record.timestamp, record.emotion, record.intent)
+            if self._vectors is not None:
+                self._add_vector(record)
+            # Trim episodic memory
+            excess = len(self.episodic) - self.max_episodic
+            if excess > 0:
+                self._evict_episodes(self.episodic[:excess])
+                del self.episodic[:excess]
+        
+        # Update long-term memory with patterns
+        self._update_long_term(record)
+    
+    def _evict_episodes(self, records: List[Interaction]) -> None:
+        """Move episodes out of the hot tier, queueing them for the archive."""
+        for old in records:
+            self._unindex(old)
+            if self._vectors is not None:
+                self._remove_vector(old)
+        if self._archive is not None:
+            # Replayed evictions may already be archived from before a restart
+            archived_until = self._archive_watermark
+            self._archive_pending.extend(r for r in records if r.timestamp > archived_until)
+    
+    def _index_record(self, record: Interaction) -> None:
+        """Add a record to the keyword index, or take another reference to it."""
+        doc_id = id(record)
+        refs = self._index_refs.get(doc_id, 0)
+        if not refs:
+            self._index.add(doc_id, record.user)
+            self._indexed[doc_id] = record
+        self._index_refs[doc_id] = refs + 1
+    
+    def _unindex(self, record: Interaction) -> None:
+        """Drop a reference to a record, removing it once no tier holds it."""
+        doc_id = id(record)
+        refs = self._index_refs.get(doc_id, 0) - 1
+        if refs > 0:
+            self._index_refs[doc_id] = refs
+            return
+        self._index_refs.pop(doc_id, None)
+        self._indexed.pop(doc_id, None)
+        self._index.remove(doc_id)
+    
+    def _count_insights(self, record: Interaction, delta: int) -> None:
+        """Add (delta=1) or remove (delta=-1) a short-term record from the insight counters."""
+        for counts, value in (
+            (self._emotion_counts, record.emotion),
+            (self._intent_counts, record.intent),
+        ):
+            if value:
+                counts[value] += delta
+                if counts[value] <= 0:
+                    del counts[value]
+        if delta > 0:
+            self._recent_emotions.append(record.emotion)
+    
+    def _vector_index(self) -> VectorIndex:
+        """Get the dense episodic index, loading or building it on first use."""
+        if self._vectors is None:
+            vectors = VectorIndex.load(self._vectors_path) or VectorIndex()
+            live = {self._vector_key(record) for record in self.episodic}
+            for key in [key for key in vectors.keys() if key not in live]:
+                vectors.remove(key)
+                self._vectors_dirty = True
+            self._vectors = vectors
+            self._episodic_by_key = {}
+            for record in self.episodic:
+                self._add_vector(record)
+        return self._vectors
+    
+    @staticmethod
+    def _vector_key(record: Interaction) -> str:
+        """Key of a record in the persisted dense index.
+        
+        Timestamps alone collide (records without one all have UNKNOWN_TIME),
+        so the key also carries a hash of the text that is embedded.
+        """
+        digest = hashlib.blake2b(record.user.encode("utf-8"), digest_size=8).hexdigest()
+        return f"{record.timestamp:.6f}:{digest}"
+    
+    def _add_vector(self, record: Interaction) -> None:
+        """Embed an episodic record unless it is already in the dense index."""
+        key = self._vector_key(record)
+        self._episodic_by_key.setdefault(key, []).append(record)
+        if key not in self._vectors:
+            self._vectors.add(key, record.user)
+            self._vectors_dirty = True
+    
+    def _remove_vector(self, record: Interaction) -> None:
+        """Drop an episodic record from the dense index."""
+        key = self._vector_key(record)
+        records = self._episodic_by_key.get(key, [])
+        for i, held in enumerate(records):
+            if held is record:
+                del records[i]
+                break
+        if not records:
+            self._episodic_by_key.pop(key, None)
+            self._vectors.remove(key)
+            self._vectors_dirty = True
+    
+    def _take_vectors(self) -> Optional[VectorIndex]:
+        """Copy the dense index for saving if it changed since the last save."""
+        if self._vectors is None or not self._vectors_dirty:
+            return None
+        self._vectors_dirty = False
+        return self._vectors.copy()
+    
+    def _write(self, compact: bool = False, final: bool = False) -> None:
+        """Persist pending interactions, and snapshot if due.
+        
+        What to write is taken under ``_lock``; the writes themselves only
+        hold ``_io_lock``, so store() and recall() never wait on the disk.
+        
+        Args:
+            compact: Fold the journal into the snapshot even if it is not due
+            final: Compact in the foreground and save the dense index (on close)
+        """
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                archived, self._archive_pending = self._archive_pending, []
+                if self.storage == "journal":
+                    # The state must hold exactly the journaled records, so take it with the batch
+                    due = compact or (batch and self._journal.needs_compaction(len(batch)))
+                    state = self._snapshot_state() if due else None
+                else:
+                    state = self._snapshot_state() if batch else None
+                vectors = self._take_vectors() if state is not None or final else None
+            
+            # Archive evicted episodes before any snapshot that drops them
+            if self._archive is not None and archived:
+                self._archive.append(archived)
+            if self.storage == "journal":
+                if batch:
+                    self._journal.append([record.to_dict() for record in batch])
+                if state is not None:
+                    self._journal.compact(state, background=not final)
+            elif state is not None:
+                self._save_memories(json.dumps({**state, "seq": self._journal.seq}, indent=2))
+            if vectors is not None:
+                vectors.save(self._vectors_path)
+    
+    def _snapshot_state(self) -> Dict[str, Any]:
+        """Copy the persistent state so it can be written off the request path."""
         return {
-            "total_interactions": len(self.short_term),
-            "emotions_expressed": list(set([e for e in emotions if e])),
-            "topics_discussed": list(set([t for t in topics if t])),
-            "emotional_trend": self._get_emotional_trend(),
+            "episodic": [record.to_dict() for record in self.episodic],
+            "long_term": copy.deepcopy(self.long_term),
         }
     
-    def _is_significant(self, context: Dict[str, Any]) -> bool:
+    def _is_significant(self, record: Interaction) -> bool:
         """Check if an interaction is significant enough for episodic memory."""
         # Crisis events are always significant
-        if context.get("is_crisis"):
+        if record.is_crisis:
             return True
         
         # Emotional peaks are significant
-        emotion = context.get("emotion")
-        if emotion in ["joy", "sadness", "fear"]:
+        if record.emotion in ["joy", "sadness", "fear"]:
             return True
         
         # Deep spiritual discussions
-        intent = context.get("intent")
-        if intent in ["spiritual_question", "meditation_request", "crisis_support"]:
+        if record.intent in ["spiritual_question", "meditation_request", "crisis_support"]:
             return True
         
         return False
     
-    def _update_long_term(self, context: Dict[str, Any]) -> None:
+    def _update_long_term(self, record: Interaction) -> None:
         """Update long-term memory with patterns."""
-        emotion = context.get("emotion")
+        emotion = record.emotion
         if emotion:
             if "emotions" not in self.long_term:
                 self.long_term["emotions"] = {}
@@ -118,12 +473,8 @@ class MemoryManager:
         if not self.short_term:
             return "neutral"
         
-        emotions = [m.get("context", {}).get("emotion") for m in self.short_term if m.get("context")]
-        if not emotions:
-            return "neutral"
-        
         # Simple trend detection
-        recent = emotions[-5:]
+        recent = self._recent_emotions
         if len(recent) >= 3:
             if recent[-1] == recent[-2] == recent[-3]:
                 return recent[-1]
@@ -131,28 +482,39 @@ class MemoryManager:
         return "varied"
     
     def _load_memories(self) -> None:
-        """Load memories from disk."""
-        data_dir = Path(__file__).parent.parent.parent / "data" / "user_data"
-        data_dir.mkdir(parents=True, exist_ok=True)
+        """Load memories from disk, replaying the journal over the snapshot."""
+        self._journal.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        snapshot, records = self._journal.load()
+        self._archive_watermark = self._archive.last_timestamp if self._archive is not None else 0.0
+        episodic = [Interaction.from_dict(data) for data in snapshot.get("episodic", [])]
+        self.episodic = episodic[-self.max_episodic:] if self.max_episodic > 0 else []
+        self._evict_episodes(episodic[:len(episodic) - len(self.episodic)])
+        self.long_term = snapshot.get("long_term", {})
+        for record in self.episodic:
+            self._index_record(record)
         
-        memory_file = data_dir / "memories.json"
-        if memory_file.exists():
-            try:
-                with open(memory_file, "r") as f:
-                    data = json.load(f)
-                    self.episodic = data.get("episodic", [])
-                    self.long_term = data.get("long_term", {})
-            except Exception:
-                pass
-    
-    def _save_memories(self) -> None:
-        """Save memories to disk."""
-        data_dir = Path(__file__).parent.parent.parent / "data" / "user_data"
+        if "timeline" in self.long_term:
+            self._timeline = InsightTimeline(self.long_term["timeline"])
+        else:
+            # Snapshots written before the timeline existed
+            self._timeline = InsightTimeline()
+            self.long_term["timeline"] = self._timeline.data
+            for record in self.episodic:
+                self._timeline.add(record.timestamp, record.emotion, record.intent)
+        
+        for data in records:
+            self._remember(Interaction.from_dict(data))
+    
+    def _save_memories(self, data: str) -> None:
+        """Atomically replace the memory snapshot on disk."""
+        data_dir = self._journal.snapshot_path.parent
         data_dir.mkdir(parents=True, exist_ok=True)
         
-        memory_file = data_dir / "memories.json"
-        with open(memory_file, "w") as f:
-            json.dump({
-                "episodic": self.episodic,
-                "long_term": self.long_term,
-            }, f, indent=2)
+        memory_file = self._journal.snapshot_path
+        tmp_file = memory_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, memory_file)
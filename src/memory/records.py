@@ -0,0 +1,142 @@
+"""Compact record type for stored interactions."""
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+import sys
+import time
+
+# Timestamp of records persisted without one; sorts before every real record
+UNKNOWN_TIME = 0.0
+
+# Context keys stored as fields; anything else is kept in ``extra``
+_CONTEXT_FIELDS = ("emotion", "intent", "is_crisis", "themes", "message_length")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a label so every record shares one string object per value."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Interaction:
+    """One user/agent exchange.
+
+    Short-term and episodic memory hold the same instance. Timestamps are
+    epoch seconds and emotion, intent and theme labels are interned, so a
+    record costs a few slots instead of two dicts and an ISO string. A
+    timestamp of ``UNKNOWN_TIME`` marks a record loaded without one.
+    """
+
+    # Explicit slots rather than @dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        "user", "agent", "timestamp", "emotion", "intent",
+        "is_crisis", "themes", "message_length", "extra",
+    )
+
+    def __init__(
+        self,
+        user: str,
+        agent: str,
+        timestamp: float,
+        emotion: Optional[str] = None,
+        intent: Optional[str] = None,
+        is_crisis: bool = False,
+        themes: Tuple[str, ...] = (),
+        message_length: int = 0,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self.user = user
+        self.agent = agent
+        self.timestamp = timestamp
+        self.emotion = emotion
+        self.intent = intent
+        self.is_crisis = is_crisis
+        self.themes = themes
+        self.message_length = message_length
+        self.extra = extra
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Interaction({fields})"
+
+    @classmethod
+    def from_context(
+        cls,
+        user: str,
+        agent: str,
+        context: Dict[str, Any],
+        timestamp: Optional[float] = None,
+    ) -> "Interaction":
+        """Build a record from an analyzer context dict.
+
+        Args:
+            user: The user's message
+            agent: The agent's response
+            context: Detected context (emotion, intent, ...)
+            timestamp: Epoch seconds (defaults to now)
+        """
+        extra = {k: v for k, v in context.items() if k not in _CONTEXT_FIELDS}
+        return cls(
+            user=user,
+            agent=agent,
+            timestamp=time.time() if timestamp is None else timestamp,
+            emotion=_intern(context.get("emotion")),
+            intent=_intern(context.get("intent")),
+            is_crisis=bool(context.get("is_crisis", False)),
+            themes=tuple(_intern(t) for t in context.get("themes") or ()),
+            message_length=context.get("message_length", len(user)),
+            extra=extra or None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Interaction":
+        """Build a record from its JSON form (see ``to_dict``)."""
+        epoch = data.get("epoch")
+        if not isinstance(epoch, (int, float)):
+            # Records written before the exact epoch was stored
+            try:
+                epoch = datetime.fromisoformat(data.get("timestamp")).timestamp()
+            except (TypeError, ValueError):
+                epoch = UNKNOWN_TIME
+        return cls.from_context(
+            data.get("user", ""),
+            data.get("agent", ""),
+            data.get("context") or {},
+            timestamp=epoch,
+        )
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        """The context dict in the shape produced by ContextAnalyzer."""
+        context = {
+            "emotion": self.emotion,
+            "intent": self.intent,
+            "is_crisis": self.is_crisis,
+            "themes": list(self.themes),
+            "message_length": self.message_length,
+        }
+        if self.extra:
+            context.update(self.extra)
+        return context
+
+    @property
+    def isoformat(self) -> str:
+        """The timestamp as a local ISO 8601 string."""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the JSON shape used in memories.json.
+
+        ``timestamp`` is the readable local time; ``epoch`` keeps the exact
+        value so ``from_dict(record.to_dict()) == record``. Both are left
+        out for a record whose time is unknown.
+        """
+        data: Dict[str, Any] = {"user": self.user, "agent": self.agent}
+        if self.timestamp != UNKNOWN_TIME:
+            data["timestamp"] = self.isoformat
+            data["epoch"] = self.timestamp
+        data["context"] = self.context
+        return data
@@ -0,0 +1,176 @@
+"""Per-session sharded memory store."""
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+import hashlib
+import re
+import threading
+
+from src.memory.memory_manager import MemoryManager
+
+_SAFE_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class MemoryStore:
+    """Keeps one MemoryManager per session, each in its own shard directory.
+
+    Shards live under ``root/<fanout>/<session>/`` where ``fanout`` is the
+    first two hex digits of the session hash, so no single directory grows
+    with the user count. Managers are loaded lazily on first access and kept
+    in an LRU; once more than ``max_resident`` are loaded, the least recently
+    used one is flushed to disk and dropped from memory.
+
+    A manager taken with ``acquire()`` is leased until ``release()``: it is
+    never evicted while leased, so an agent holding it cannot end up
+    writing to a closed manager while a reloaded one appends to the same
+    journal. Loading and closing run outside the store lock; a session
+    being loaded or closed makes only its own callers wait.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_resident: int = 1000,
+        **memory_options: Any,
+    ):
+        """Initialize the memory store.
+
+        Args:
+            root: Directory holding the session shards
+            max_resident: Maximum unleased memory managers kept in RAM
+            **memory_options: Keyword arguments passed to each MemoryManager
+        """
+        if root is None:
+            root = Path(__file__).parent.parent.parent / "data" / "user_data" / "sessions"
+        self.root = Path(root)
+        self.max_resident = max(1, max_resident)
+        self.memory_options = memory_options
+        self._resident: "OrderedDict[str, MemoryManager]" = OrderedDict()
+        self._leases: Dict[str, int] = {}
+        self._busy: Dict[str, threading.Event] = {}  # Sessions being loaded or closed
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> MemoryManager:
+        """Get the memory manager for a session, loading it if needed.
+
+        The manager may be evicted once it is the least recently used; use
+        ``acquire()`` to hold on to it.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            The session's memory manager
+        """
+        return self._get(session_id, lease=False)
+
+    def acquire(self, session_id: str) -> MemoryManager:
+        """Get a session's memory manager and lease it until ``release()``."""
+        return self._get(session_id, lease=True)
+
+    def release(self, session_id: str) -> None:
+        """Return a lease taken by ``acquire()``."""
+        with self._lock:
+            leases = self._leases.get(session_id, 0) - 1
+            if leases > 0:
+                self._leases[session_id] = leases
+            else:
+                self._leases.pop(session_id, None)
+            evicted = self._take_surplus()
+        self._close(evicted)
+
+    def evict(self, session_id: str) -> bool:
+        """Flush a session's memories to disk and drop them from RAM.
+
+        Returns:
+            True if the session was evicted, False if it was not resident
+            or is leased
+        """
+        with self._lock:
+            if session_id not in self._resident or self._leases.get(session_id):
+                return False
+            evicted = [self._take(session_id)]
+        self._close(evicted)
+        return True
+
+    def close(self) -> None:
+        """Flush and release every resident session."""
+        with self._lock:
+            resident = list(self._resident.values())
+            self._resident.clear()
+            self._leases.clear()
+        for memory in resident:
+            memory.close()
+
+    def _get(self, session_id: str, lease: bool) -> MemoryManager:
+        while True:
+            with self._lock:
+                memory = self._resident.get(session_id)
+                if memory is not None:
+                    self._resident.move_to_end(session_id)
+                    if lease:
+                        self._leases[session_id] = self._leases.get(session_id, 0) + 1
+                    return memory
+                busy = self._busy.get(session_id)
+                if busy is None:
+                    busy = self._busy[session_id] = threading.Event()
+                    break
+            # Another thread is loading or closing this session
+            busy.wait()
+
+        try:
+            memory = MemoryManager(data_dir=self.shard_path(session_id), **self.memory_options)
+        except BaseException:
+            with self._lock:
+                del self._busy[session_id]
+            busy.set()
+            raise
+        with self._lock:
+            self._resident[session_id] = memory
+            if lease:
+                self._leases[session_id] = self._leases.get(session_id, 0) + 1
+            del self._busy[session_id]
+            evicted = self._take_surplus(keep=session_id)
+        busy.set()
+        self._close(evicted)
+        return memory
+
+    def _take(self, session_id: str) -> Tuple[str, MemoryManager, threading.Event]:
+        """Remove a resident session, marking it busy until closed (lock held)."""
+        busy = self._busy[session_id] = threading.Event()
+        return session_id, self._resident.pop(session_id), busy
+
+    def _take_surplus(self, keep: Optional[str] = None) -> List[Tuple[str, MemoryManager, threading.Event]]:
+        """Remove least recently used unleased sessions beyond the limit (lock held)."""
+        surplus = len(self._resident) - self.max_resident
+        if surplus <= 0:
+            return []
+        victims = []
+        for session_id in self._resident:
+            if len(victims) == surplus:
+                break
+            if session_id != keep and not self._leases.get(session_id):
+                victims.append(session_id)
+        return [self._take(session_id) for session_id in victims]
+
+    def _close(self, evicted: List[Tuple[str, MemoryManager, threading.Event]]) -> None:
+        """Flush and close removed sessions, then let waiting loads proceed."""
+        for session_id, memory, busy in evicted:
+            try:
+                memory.close(compact=False)
+            finally:
+                with self._lock:
+                    del self._busy[session_id]
+                busy.set()
+
+    def shard_path(self, session_id: str) -> Path:
+        """Get the directory holding a session's memory files."""
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+        name = session_id if _SAFE_SESSION_ID.match(session_id) else digest
+        return self.root / digest[:2] / name
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._resident
+
+    def __len__(self) -> int:
+        return len(self._resident)
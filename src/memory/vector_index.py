@@ -0,0 +1,205 @@
+"""Dense vector index over memories using hashed embeddings."""
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the vector recall strategy needs it
+    np = None
+
+from src.memory.index import tokenize
+
+
+@lru_cache(maxsize=65536)
+def _hash_feature(feature: str, dim: int) -> Tuple[int, float]:
+    """Map a feature to a (bucket, sign) pair, stable across processes."""
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % dim, 1.0 if h >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """Deterministic text embedder based on the hashing trick.
+
+    Words and their character trigrams are hashed into a fixed number of
+    signed buckets and the result is L2-normalized, so similar wordings
+    ("meditate", "meditation") land close together without any model
+    download.
+    """
+
+    def __init__(self, dim: int = 256, trigram_weight: float = 0.5):
+        """Initialize the embedder.
+
+        Args:
+            dim: Embedding dimensionality
+            trigram_weight: Weight of character trigrams relative to words
+        """
+        if np is None:
+            raise ImportError("HashingEmbedder requires numpy")
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+
+    def embed(self, text: str) -> "np.ndarray":
+        """Embed a text as a unit-length float32 vector."""
+        buckets = []
+        weights = []
+        for token in tokenize(text):
+            bucket, sign = _hash_feature("w:" + token, self.dim)
+            buckets.append(bucket)
+            weights.append(sign)
+            padded = f"<{token}>"
+            for i in range(len(padded) - 2):
+                bucket, sign = _hash_feature("c:" + padded[i:i + 3], self.dim)
+                buckets.append(bucket)
+                weights.append(sign * self.trigram_weight)
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if buckets:
+            np.add.at(vector, buckets, weights)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector /= norm
+        return vector
+
+
+class VectorIndex:
+    """Cosine top-k search over embeddings held in one float32 matrix.
+
+    Rows live in a preallocated matrix that doubles when full; removal moves
+    the last row into the freed slot so the live rows stay contiguous and a
+    query is a single matrix-vector product followed by ``argpartition``.
+    A saved index is loaded memory-mapped and only copied into RAM on the
+    first modification.
+    """
+
+    def __init__(self, embedder: Optional[HashingEmbedder] = None, capacity: int = 1024):
+        """Initialize an empty index.
+
+        Args:
+            embedder: Embedder for texts (defaults to HashingEmbedder())
+            capacity: Initial number of preallocated rows
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self._vectors = np.zeros((max(1, capacity), self.embedder.dim), dtype=np.float32)
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def add(self, key: str, text: str) -> None:
+        """Embed and index a text under a key, replacing any previous entry."""
+        self.add_vector(key, self.embedder.embed(text))
+
+    def add_vector(self, key: str, vector: "np.ndarray") -> None:
+        """Index a precomputed embedding under a key."""
+        self._ensure_writable(len(self._keys) + 1)
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._rows[key] = row
+        self._vectors[row] = vector
+
+    def remove(self, key: str) -> None:
+        """Drop a key from the index."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._ensure_writable(len(self._keys))
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._vectors[row] = self._vectors[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Find the keys whose embeddings are most similar to the query.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+
+        Returns:
+            List of (key, cosine similarity), best first
+        """
+        n = len(self._keys)
+        if not n or k <= 0:
+            return []
+
+        scores = self._vectors[:n] @ self.embedder.embed(query)
+        if n > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[i], float(scores[i])) for i in top]
+
+    def save(self, path: Path) -> None:
+        """Atomically write the index to ``path`` (.npy) plus a keys sidecar."""
+        path = Path(path)
+        keys_path = path.with_suffix(".keys.json")
+        for target, write in (
+            (path, lambda f: np.save(f, self._vectors[:len(self._keys)])),
+            (keys_path, lambda f: f.write(json.dumps(self._keys).encode("utf-8"))),
+        ):
+            tmp = target.with_name(target.name + ".tmp")
+            with open(tmp, "wb") as f:
+                write(f)
+            os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: Path, embedder: Optional[HashingEmbedder] = None) -> Optional["VectorIndex"]:
+        """Load a saved index memory-mapped.
+
+        Returns:
+            The index, or None if it is missing, unreadable or was built
+            with a different embedding dimension
+        """
+        path = Path(path)
+        index = cls(embedder, capacity=1)
+        try:
+            with open(path.with_suffix(".keys.json"), "r", encoding="utf-8") as f:
+                keys = json.load(f)
+            vectors = np.load(path, mmap_mode="r")
+        except Exception:
+            return None
+        if vectors.ndim != 2 or vectors.shape != (len(keys), index.embedder.dim):
+            return None
+
+        index._vectors = vectors
+        index._keys = keys
+        index._rows = {key: row for row, key in enumerate(keys)}
+        return index
+
+    def copy(self) -> "VectorIndex":
+        """An independent copy of the index, e.g. to save it without holding a lock."""
+        index = VectorIndex(self.embedder, capacity=1)
+        index._vectors = np.array(self._vectors[:len(self._keys)])
+        index._keys = list(self._keys)
+        index._rows = dict(self._rows)
+        return index
+
+    def keys(self) -> Iterable[str]:
+        """Iterate over the indexed keys."""
+        return iter(self._keys)
+
+    def _ensure_writable(self, rows: int) -> None:
+        """Grow the matrix, or copy a memory-mapped one into RAM, as needed."""
+        capacity = self._vectors.shape[0]
+        if rows <= capacity and self._vectors.flags.writeable:
+            return
+        capacity = max(capacity, 1)
+        while capacity < rows:
+            capacity *= 2
+        grown = np.zeros((max(capacity, 1024), self.embedder.dim), dtype=np.float32)
+        grown[:len(self._keys)] = self._vectors[:len(self._keys)]
+        self._vectors = grown
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def __len__(self) -> int:
+        return len(self._keys)
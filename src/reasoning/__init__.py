@@ -1,4 +1,5 @@
 """Reasoning package - context analysis, intent classification, emotion detection."""
 from src.reasoning.context_analyzer import ContextAnalyzer
+from src.reasoning.batch import BatchAnalysis
 
-__all__ = ["ContextAnalyzer"]
+__all__ = ["ContextAnalyzer", "BatchAnalysis"]
@@ -0,0 +1,124 @@
+"""Columnar results for analyzing many messages at once."""
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+# Emotion id for messages with no detected emotion
+NO_EMOTION = -1
+
+
+@dataclass
+class BatchAnalysis:
+    """ContextAnalyzer results for a batch of messages, one array per field.
+
+    Row ``i`` describes message ``i``. Emotions and intents are stored as ids
+    into ``emotion_labels`` and ``intent_labels`` (``NO_EMOTION`` when no
+    emotion was detected), crisis flags as 0/1 and themes as a bitmask over
+    ``theme_labels``. ``batch[i]`` rebuilds the dict ``analyze()`` returns.
+    """
+
+    emotion_labels: Tuple[str, ...]
+    intent_labels: Tuple[str, ...]
+    theme_labels: Tuple[str, ...]
+    emotions: array = field(default_factory=lambda: array("h"))
+    intents: array = field(default_factory=lambda: array("h"))
+    crisis: array = field(default_factory=lambda: array("B"))
+    themes: array = field(default_factory=lambda: array("Q"))
+    message_lengths: array = field(default_factory=lambda: array("Q"))
+
+    def __post_init__(self):
+        if len(self.theme_labels) > 64:
+            raise ValueError("BatchAnalysis supports at most 64 themes")
+
+    def append(self, emotion: int, intent: int, is_crisis: bool, themes: int, length: int) -> None:
+        """Add one row of ids."""
+        self.emotions.append(emotion)
+        self.intents.append(intent)
+        self.crisis.append(is_crisis)
+        self.themes.append(themes)
+        self.message_lengths.append(length)
+
+    def extend(self, other: "BatchAnalysis") -> None:
+        """Append the rows of another batch built with the same labels."""
+        if (other.emotion_labels, other.intent_labels, other.theme_labels) != (
+            self.emotion_labels, self.intent_labels, self.theme_labels
+        ):
+            raise ValueError("Cannot merge batches with different labels")
+        self.emotions.extend(other.emotions)
+        self.intents.extend(other.intents)
+        self.crisis.extend(other.crisis)
+        self.themes.extend(other.themes)
+        self.message_lengths.extend(other.message_lengths)
+
+    def themes_of(self, mask: int) -> List[str]:
+        """Decode a theme bitmask, in table order."""
+        return [label for bit, label in enumerate(self.theme_labels) if mask >> bit & 1]
+
+    def counts(self) -> Dict[str, Any]:
+        """Count emotions, intents, themes and crisis flags over the batch."""
+        emotions = [0] * len(self.emotion_labels)
+        intents = [0] * len(self.intent_labels)
+        themes = [0] * len(self.theme_labels)
+        for emotion in self.emotions:
+            if emotion != NO_EMOTION:
+                emotions[emotion] += 1
+        for intent in self.intents:
+            intents[intent] += 1
+        for mask in self.themes:
+            while mask:
+                bit = (mask & -mask).bit_length() - 1
+                themes[bit] += 1
+                mask &= mask - 1
+        return {
+            "emotions": dict(zip(self.emotion_labels, emotions)),
+            "intents": dict(zip(self.intent_labels, intents)),
+            "themes": dict(zip(self.theme_labels, themes)),
+            "crisis": sum(self.crisis),
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Rebuild every row as an ``analyze()`` result."""
+        return list(self)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        emotion = self.emotions[index]
+        return {
+            "emotion": None if emotion == NO_EMOTION else self.emotion_labels[emotion],
+            "intent": self.intent_labels[self.intents[index]],
+            "is_crisis": bool(self.crisis[index]),
+            "themes": self.themes_of(self.themes[index]),
+            "message_length": self.message_lengths[index],
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[i] for i in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self.emotions)
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Analyzer used by worker processes, set once per process by _init_worker
+_worker_analyzer: Optional[Any] = None
+
+
+def _init_worker(analyzer: Any) -> None:
+    """Install the analyzer pickled from the parent process."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_chunk(messages: List[str]) -> BatchAnalysis:
+    """Analyze one chunk inside a worker process."""
+    return _worker_analyzer.analyze_batch(messages)
@@ -1,10 +1,22 @@
 """Context analyzer - intent & emotion detection, crisis indicators."""
-from typing import Dict, Any, List, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from pathlib import Path
 from src.core.constants import EMOTION_KEYWORDS
+from src.reasoning.batch import BatchAnalysis, NO_EMOTION, chunked, _init_worker, _analyze_chunk
+from src.reasoning.keyword_matcher import KeywordMatcher
 
 
 class ContextAnalyzer:
-    """Analyzes user input to detect context (emotion, intent, crisis)."""
+    """Analyzes user input to detect context (emotion, intent, crisis).
+    
+    All keyword tables are compiled into one KeywordMatcher at construction,
+    so a message is scanned once no matter how many keywords there are.
+    Keywords match at the start of a word, inflections included ("feel"
+    matches "feelings", but "now" does not match "know"). The tables are
+    read once; changing them afterwards does not affect matching.
+    """
     
     def __init__(self):
         """Initialize context analyzer."""
@@ -34,6 +46,15 @@ class ContextAnalyzer:
                 "learn", "understand",
             ],
         }
+        self.theme_keywords = {
+            "mindfulness": ["present", "now", "aware", "attention", "focus"],
+            "compassion": ["kindness", "love", "care", "forgiveness"],
+            "impermanence": ["change", "impermanent", "transient"],
+            "suffering": ["suffer", "struggle", "difficult", "hard"],
+            "peace": ["peace", "calm", "serene", "quiet", "still"],
+            "connection": ["connect", "together", "unity", "oneness"],
+        }
+        self._compile()
     
     def analyze(self, message: str) -> Dict[str, Any]:
         """Analyze user message for context.
@@ -44,12 +65,12 @@ class ContextAnalyzer:
         Returns:
             Dictionary with detected context
         """
-        message_lower = message.lower()
+        found = self._matcher.find(message)
         
-        emotion = self._detect_emotion(message_lower)
-        intent = self._detect_intent(message_lower)
-        is_crisis = self._detect_crisis(message_lower)
-        themes = self._extract_themes(message_lower)
+        emotion = self._detect_emotion(found)
+        intent = self._detect_intent(found)
+        is_crisis = self._detect_crisis(found)
+        themes = self._extract_themes(found)
         
         return {
             "emotion": emotion,
@@ -59,51 +80,150 @@ class ContextAnalyzer:
             "message_length": len(message),
         }
     
-    def _detect_emotion(self, message: str) -> str | None:
-        """Detect emotion from message."""
-        emotion_scores = {}
+    def analyze_batch(
+        self,
+        messages: Iterable[str],
+        processes: int = 1,
+        chunksize: int = 2048,
+    ) -> BatchAnalysis:
+        """Analyze many messages into columnar results.
+        
+        Row ``i`` of the result equals ``analyze(messages[i])``. Messages
+        that match the same keywords share one classification, so repeated
+        phrasing is only scored once per batch.
+        
+        Args:
+            messages: Messages to analyze
+            processes: Worker processes; above 1, chunks are analyzed in a
+                process pool by copies of this analyzer
+            chunksize: Messages per chunk sent to a worker
+            
+        Returns:
+            BatchAnalysis with one row per message, in input order
+        """
+        batch = self._new_batch()
+        if processes > 1:
+            with ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_worker, initargs=(self,)
+            ) as executor:
+                # Keep a bounded number of chunks in flight so huge inputs stream
+                pending = deque()
+                for chunk in chunked(messages, chunksize):
+                    pending.append(executor.submit(_analyze_chunk, chunk))
+                    if len(pending) >= 2 * processes:
+                        batch.extend(pending.popleft().result())
+                while pending:
+                    batch.extend(pending.popleft().result())
+            return batch
         
-        for emotion, keywords in self.emotion_keywords.items():
-            score = sum(1 for kw in keywords if kw in message)
-            if score > 0:
-                emotion_scores[emotion] = score
+        find = self._matcher.find
+        classified: Dict[FrozenSet[str], Tuple[int, int, bool, int]] = {}
+        for message in messages:
+            found = frozenset(find(message))
+            row = classified.get(found)
+            if row is None:
+                row = classified[found] = self._classify_ids(found)
+            batch.append(*row, len(message))
+        return batch
+    
+    def analyze_iter(
+        self,
+        source: Union[str, Path, Iterable[str]],
+        encoding: str = "utf-8",
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily analyze a stream of messages.
         
+        Args:
+            source: Path to a text file with one message per line, or any
+                iterable of messages
+            encoding: Encoding of the file
+            
+        Yields:
+            The ``analyze()`` result for each message, in order
+        """
+        if isinstance(source, (str, Path)):
+            with open(source, "r", encoding=encoding) as f:
+                for line in f:
+                    yield self.analyze(line.rstrip("\r\n"))
+        else:
+            for message in source:
+                yield self.analyze(message)
+    
+    def _new_batch(self) -> BatchAnalysis:
+        """Create an empty BatchAnalysis labelled with this analyzer's tables."""
+        return BatchAnalysis(
+            emotion_labels=tuple(self.emotion_keywords),
+            intent_labels=tuple(self.intent_patterns) + ("general_conversation",),
+            theme_labels=tuple(self.theme_keywords),
+        )
+    
+    def _classify_ids(self, found: Set[str]) -> Tuple[int, int, bool, int]:
+        """Classify matched keywords into (emotion id, intent id, crisis, theme mask)."""
+        emotion = self._detect_emotion(found)
+        themes = self._extract_themes(found)
+        return (
+            NO_EMOTION if emotion is None else self._emotion_ids[emotion],
+            self._intent_ids[self._detect_intent(found)],
+            self._detect_crisis(found),
+            sum(1 << self._theme_bits[theme] for theme in themes),
+        )
+    
+    def _compile(self) -> None:
+        """Build the keyword matcher and the keyword -> label tables."""
+        self._labels: Dict[str, Dict[str, List[str]]] = {
+            "emotion": {}, "intent": {}, "theme": {},
+        }
+        keywords = list(self.crisis_keywords)
+        for kind, table in (
+            ("emotion", self.emotion_keywords),
+            ("intent", self.intent_patterns),
+            ("theme", self.theme_keywords),
+        ):
+            for label, label_keywords in table.items():
+                for keyword in label_keywords:
+                    keyword = keyword.strip().lower()
+                    self._labels[kind].setdefault(keyword, []).append(label)
+                    keywords.append(keyword)
+        self._crisis: Set[str] = {kw.strip().lower() for kw in self.crisis_keywords}
+        self._matcher = KeywordMatcher(keywords)
+        labels = self._new_batch()
+        self._emotion_ids = {label: i for i, label in enumerate(labels.emotion_labels)}
+        self._intent_ids = {label: i for i, label in enumerate(labels.intent_labels)}
+        self._theme_bits = {label: i for i, label in enumerate(labels.theme_labels)}
+    
+    def _score(self, kind: str, found: Set[str]) -> Dict[str, int]:
+        """Count the distinct keywords found for each label of a kind."""
+        labels = self._labels[kind]
+        scores: Dict[str, int] = {}
+        for keyword in found:
+            for label in labels.get(keyword, ()):
+                scores[label] = scores.get(label, 0) + 1
+        return scores
+    
+    @staticmethod
+    def _best(order: Dict[str, Any], scores: Dict[str, int]) -> Tuple[str, ...]:
+        """Labels with a score, in table order (so ties go to the earlier label)."""
+        return tuple(label for label in order if label in scores)
+    
+    def _detect_emotion(self, found: Set[str]) -> Optional[str]:
+        """Detect emotion from the matched keywords."""
+        emotion_scores = self._score("emotion", found)
         if emotion_scores:
-            return max(emotion_scores, key=emotion_scores.get)
+            return max(self._best(self.emotion_keywords, emotion_scores), key=emotion_scores.get)
         return None
     
-    def _detect_intent(self, message: str) -> str:
-        """Detect user intent from message."""
-        intent_scores = {}
-        
-        for intent, patterns in self.intent_patterns.items():
-            score = sum(1 for p in patterns if p in message)
-            if score > 0:
-                intent_scores[intent] = score
-        
+    def _detect_intent(self, found: Set[str]) -> str:
+        """Detect user intent from the matched keywords."""
+        intent_scores = self._score("intent", found)
         if intent_scores:
-            return max(intent_scores, key=intent_scores.get)
+            return max(self._best(self.intent_patterns, intent_scores), key=intent_scores.get)
         return "general_conversation"
     
-    def _detect_crisis(self, message: str) -> bool:
-        """Detect crisis indicators in message."""
-        return any(kw in message for kw in self.crisis_keywords)
+    def _detect_crisis(self, found: Set[str]) -> bool:
+        """Detect crisis indicators among the matched keywords."""
+        return not self._crisis.isdisjoint(found)
     
-    def _extract_themes(self, message: str) -> List[str]:
-        """Extract spiritual themes from message."""
-        themes = []
-        
-        theme_keywords = {
-            "mindfulness": ["present", "now", "aware", "attention", "focus"],
-            "compassion": ["kindness", "love", "care", "forgiveness"],
-            "impermanence": ["change", "change", " impermanent", "transient"],
-            "suffering": ["suffer", "struggle", "difficult", "hard"],
-            "peace": ["peace", "calm", "serene", "quiet", "still"],
-            "connection": ["connect", "together", "unity", "oneness"],
-        }
-        
-        for theme, keywords in theme_keywords.items():
-            if any(kw in message for kw in keywords):
-                themes.append(theme)
-        
-        return themes
+    def _extract_themes(self, found: Set[str]) -> List[str]:
+        """Extract spiritual themes from the matched keywords."""
+        theme_scores = self._score("theme", found)
+        return list(self._best(self.theme_keywords, theme_scores))
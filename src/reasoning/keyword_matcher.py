@@ -0,0 +1,100 @@
+"""Word-start keyword matching."""
+from typing import Dict, Iterable, List, Pattern, Set, Tuple
+import re
+import string
+
+# Punctuation separates words; "-" is kept so "self-harm" stays one word
+_WORD_SEPARATORS = str.maketrans(
+    {c: " " for c in string.punctuation.replace("-", "") + "‘’“”…"}
+)
+
+
+class KeywordMatcher:
+    """Finds every keyword occurring in a text in a single pass over its words.
+
+    A keyword matches where a word starts and may run on into the rest of
+    that word, so inflections still match ("feel" in "feelings", "sad" in
+    "sadness") but a keyword inside another word does not ("now" in "know",
+    "care" in "scared"). With ``whole_words`` the keyword must also end
+    where the word ends. Phrases match consecutive words the same way, and
+    matching is case-insensitive.
+
+    Single-word keywords are found by looking up the prefixes of each
+    distinct word of the text in a table keyed by keyword, so the cost grows
+    with the length and vocabulary of the message rather than with keywords
+    times length. A phrase costs one regular expression search, made only
+    when the text contains the phrase's first word.
+
+    This is a word table, not an Aho-Corasick automaton. Splitting the text
+    into words dominates on very long messages: around 10,000 words it is
+    slower than one ``kw in text`` scan per keyword (see
+    benchmarks/bench_context_analyzer.py). A single-pass automaton that
+    beats those scans needs native code and is left for later.
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = False):
+        """Compile the keyword tables.
+
+        Args:
+            keywords: Keywords or multi-word phrases to look for
+            whole_words: Only match keywords that end where a word ends
+        """
+        self.whole_words = whole_words
+        self._words: Dict[str, Tuple[str, ...]] = {}
+        phrases: Dict[str, Tuple[str, ...]] = {}
+
+        seen: Dict[str, None] = {}
+        for keyword in keywords:
+            keyword = keyword.strip().lower()
+            units = self._split(keyword)
+            if not units or keyword in seen:
+                continue
+            seen[keyword] = None
+            table = self._words if len(units) == 1 else phrases
+            key = " ".join(units)
+            table[key] = table.get(key, ()) + (keyword,)
+        self.keywords: Tuple[str, ...] = tuple(seen)
+        # Prefix lengths worth trying, shortest first
+        self._lengths: Tuple[int, ...] = tuple(sorted({len(word) for word in self._words}))
+        # Patterns start with the phrase itself so the search can skip ahead
+        # on its first characters; find() checks that a match starts a word
+        end = r"(?!\S)" if whole_words else ""
+        self._phrases: List[Tuple[str, Pattern, Tuple[str, ...]]] = [
+            (phrase.split()[0], re.compile(r"\s+".join(map(re.escape, phrase.split())) + end), matches)
+            for phrase, matches in phrases.items()
+        ]
+
+    def find(self, text: str) -> Set[str]:
+        """Get the distinct keywords occurring in a text."""
+        text = text.lower().translate(_WORD_SEPARATORS)
+        words = set(text.split())
+        table = self._words
+        found: Set[str] = set()
+        if self.whole_words:
+            for matches in filter(None, map(table.get, words)):
+                found.update(matches)
+        else:
+            lengths = self._lengths
+            for word in words:
+                size = len(word)
+                for length in lengths:
+                    if length > size:
+                        break
+                    matches = table.get(word[:length])
+                    if matches:
+                        found.update(matches)
+
+        for first_word, pattern, matches in self._phrases:
+            if first_word not in words:
+                continue
+            for match in pattern.finditer(text):
+                start = match.start()
+                if not start or text[start - 1].isspace():
+                    found.update(matches)
+                    break
+        return found
+
+    @staticmethod
+    def _split(text: str) -> List[str]:
+        """Split lowercased text into words."""
+        return text.translate(_WORD_SEPARATORS).split()
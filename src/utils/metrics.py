@@ -0,0 +1,157 @@
+"""In-process metrics: counters, gauges and latency histograms."""
+from collections import deque
+from typing import Dict, Any, Optional
+import threading
+
+
+class Counter:
+    """A monotonically increasing count."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Add to the count."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"value": self._value}
+
+
+class Gauge:
+    """A value that goes up and down, such as a queue depth."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Replace the value."""
+        self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Add to the value."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Subtract from the value."""
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"value": self._value}
+
+
+class Histogram:
+    """Distribution of observed values.
+
+    Count, sum, min and max cover every observation; percentiles are taken
+    over the most recent ``window`` observations so they track current
+    behaviour in a long-running process.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._recent = deque(maxlen=window)
+        self._count = 0
+        self._sum = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        with self._lock:
+            self._recent.append(value)
+            self._count += 1
+            self._sum += value
+            self._min = value if self._min is None else min(self._min, value)
+            self._max = value if self._max is None else max(self._max, value)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th percentile (0-100) of recent observations."""
+        with self._lock:
+            recent = sorted(self._recent)
+        return self._pick(recent, q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, low, high = self._count, self._sum, self._min, self._max
+        return {
+            "count": count,
+            "mean": total / count if count else None,
+            "min": low,
+            "p50": self._pick(recent, 50),
+            "p90": self._pick(recent, 90),
+            "p99": self._pick(recent, 99),
+            "max": high,
+        }
+
+    @staticmethod
+    def _pick(ordered: list, q: float) -> Optional[float]:
+        """Nearest-rank percentile of sorted values."""
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use.
+
+    Names are dotted paths such as ``llm.ollama.time_to_first_token``;
+    latencies are recorded in seconds.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        """Get or create a counter."""
+        return self._get(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        """Get or create a gauge."""
+        return self._get(name, Gauge)
+
+    def histogram(self, name: str) -> Histogram:
+        """Get or create a histogram."""
+        return self._get(name, Histogram)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current values of every metric, by name."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+
+    def _get(self, name: str, kind: type):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, kind())
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {name} is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the project importable as ``src``."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core  # noqa: F401,E402  (initializes src.core before src.reasoning)
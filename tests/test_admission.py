@@ -0,0 +1,86 @@
+"""Tests for admission control ordering and rejection."""
+import threading
+import time
+
+import pytest
+
+from src.core.admission import CRISIS, NORMAL, AdmissionController, AdmissionRejected
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def queue_call(controller, priority, label, order):
+    """Start a call that queues, records when it is admitted and finishes at once."""
+    def call():
+        granted_at = controller.acquire(priority)
+        order.append(label)
+        controller.release(granted_at)
+
+    depth = controller.queue_depth
+    thread = threading.Thread(target=call)
+    thread.start()
+    wait_for(lambda: controller.queue_depth == depth + 1)
+    return thread
+
+
+def test_crisis_calls_are_admitted_first_then_in_arrival_order():
+    controller = AdmissionController(max_concurrent=1, max_queue=8, max_wait=5)
+    held = controller.acquire()
+    order = []
+    threads = [
+        queue_call(controller, NORMAL, "normal 1", order),
+        queue_call(controller, NORMAL, "normal 2", order),
+        queue_call(controller, CRISIS, "crisis", order),
+    ]
+
+    controller.release(held)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["crisis", "normal 1", "normal 2"]
+    assert controller.in_flight == 0
+
+
+def test_full_queue_rejects_at_once():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait=5)
+    held = controller.acquire()
+    thread = queue_call(controller, NORMAL, "queued", [])
+
+    started = time.perf_counter()
+    with pytest.raises(AdmissionRejected):
+        controller.acquire()
+    assert time.perf_counter() - started < 0.5
+
+    controller.release(held)
+    thread.join()
+
+
+def test_call_waiting_past_max_wait_is_rejected_and_leaves_the_queue():
+    controller = AdmissionController(max_concurrent=1, max_queue=8, max_wait=0.05)
+    held = controller.acquire()
+
+    with pytest.raises(AdmissionRejected):
+        controller.acquire()
+    assert controller.queue_depth == 0
+
+    controller.release(held)
+    assert controller.in_flight == 0
+    controller.release(controller.acquire())
+
+
+def test_expected_wait_beyond_max_wait_is_rejected_without_queueing():
+    controller = AdmissionController(max_concurrent=1, max_queue=8, max_wait=0.5)
+    granted_at = controller.acquire()
+    time.sleep(0.6)
+    controller.release(granted_at)
+
+    held = controller.acquire()
+    with pytest.raises(AdmissionRejected):
+        controller.acquire()
+    assert controller.queue_depth == 0
+    controller.release(held)
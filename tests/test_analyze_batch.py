@@ -0,0 +1,49 @@
+"""Tests that batch and streaming analysis agree with per-message analysis."""
+import pytest
+
+from src.reasoning.context_analyzer import ContextAnalyzer
+
+CORPUS = [
+    "I feel so much sadness and anxiety",
+    "Please teach me to meditate",
+    "I want to end my life",
+    "thoughts of self-harm and cutting myself",
+    "I'm grateful for the calm and peace today",
+    "",
+    "What is the meaning of life and death?",
+    "I know you are scared",
+    "Sometimes I want to   die.",
+    "The day was long and I walked home slowly",
+    "I feel so much sadness and anxiety",
+    "Love, kindness and forgiveness; together in unity",
+] * 5
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return ContextAnalyzer()
+
+
+@pytest.fixture(scope="module")
+def expected(analyzer):
+    return [analyzer.analyze(message) for message in CORPUS]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch_rows_equal_analyze(analyzer, expected, processes):
+    batch = analyzer.analyze_batch(iter(CORPUS), processes=processes, chunksize=7)
+
+    assert len(batch) == len(CORPUS)
+    assert batch.to_dicts() == expected
+    assert batch.counts()["crisis"] == sum(row["is_crisis"] for row in expected) > 0
+
+
+def test_iter_equals_analyze(analyzer, expected):
+    assert list(analyzer.analyze_iter(CORPUS)) == expected
+
+
+def test_iter_reads_one_message_per_line(analyzer, expected, tmp_path):
+    path = tmp_path / "messages.txt"
+    path.write_text("\r\n".join(CORPUS) + "\n", encoding="utf-8")
+
+    assert list(analyzer.analyze_iter(path)) == expected
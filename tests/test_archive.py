@@ -0,0 +1,55 @@
+"""Tests for the on-disk episode archive and archive recall."""
+import threading
+
+from src.memory.archive import EpisodeArchive
+from src.memory.memory_manager import MemoryManager
+from src.memory.records import Interaction
+
+
+def episodes(texts):
+    return [Interaction(text, "r", float(i + 1), "sadness") for i, text in enumerate(texts)]
+
+
+def test_search_keeps_the_best_hits_newest_first_on_ties(tmp_path):
+    archive = EpisodeArchive(tmp_path)
+    archive.append(episodes(["mother temple", "mother", "temple", "mother temple", "work"] * 100))
+
+    hits = archive.search("mother temple", k=3, page_size=16)
+
+    assert [(record.user, score) for record, score in hits] == [("mother temple", 1.0)] * 3
+    assert [record.timestamp for record, _ in hits] == [499.0, 496.0, 494.0]
+    assert [record.timestamp for record, _ in archive.search("work", k=2, max_records=3)] == [500.0]
+
+
+def test_evicted_episodes_are_recalled_from_the_archive(tmp_path):
+    memory = MemoryManager(data_dir=tmp_path, write_behind=False, max_episodic=1, max_short_term=1)
+    for text in ["I feel sad about my mother", "I feel sad about work", "I feel sad today"]:
+        memory.store(text, "r", {"emotion": "sadness"})
+
+    recalled = memory.recall("mother", top_k=2, include_archive=True)
+
+    assert [r.user for r in recalled] == ["I feel sad about my mother"]
+    memory.close()
+
+
+def test_archive_search_does_not_block_store(tmp_path):
+    memory = MemoryManager(data_dir=tmp_path, write_behind=False, max_episodic=1, max_short_term=1)
+    for text in ["I feel sad about my mother", "I feel sad about work"]:
+        memory.store(text, "r", {"emotion": "sadness"})
+    memory.flush()
+
+    stored = threading.Event()
+    search = memory._archive.search
+
+    def slow_search(*args, **kwargs):
+        # A store() from another thread finishes while the archive is scanned
+        thread = threading.Thread(target=lambda: (memory.store("I feel sad again", "r", {}), stored.set()))
+        thread.start()
+        thread.join(2)
+        return search(*args, **kwargs)
+
+    memory._archive.search = slow_search
+    memory.recall("mother", top_k=3, include_archive=True)
+
+    assert stored.is_set()
+    memory.close()
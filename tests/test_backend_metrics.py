@@ -0,0 +1,22 @@
+"""Tests for the backend's metrics endpoint."""
+from fastapi.testclient import TestClient
+
+import backend.main as backend
+from src.utils.metrics import get_metrics
+
+
+def test_metrics_endpoint_exports_the_registry():
+    metrics = get_metrics()
+    metrics.counter("test.backend.requests").inc(3)
+    metrics.gauge("test.backend.sessions").set(2)
+    metrics.histogram("test.backend.latency").observe(0.25)
+
+    response = TestClient(backend.app).get("/metrics")
+
+    assert response.status_code == 200
+    snapshot = response.json()
+    assert snapshot["test.backend.requests"] == metrics.counter("test.backend.requests").snapshot()
+    assert snapshot["test.backend.sessions"] == metrics.gauge("test.backend.sessions").snapshot()
+    latency = snapshot["test.backend.latency"]
+    assert latency["count"] >= 1 and latency["max"] >= 0.25
+    assert list(snapshot) == sorted(snapshot)
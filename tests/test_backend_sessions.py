@@ -0,0 +1,133 @@
+"""Tests for the backend's server-issued session ids and session lifecycle."""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import backend.main as backend
+from src.core.agent import SpiritualAgent
+from src.core.llm_client import LLMClient
+from src.core.session_pool import SessionPool
+from src.memory.store import MemoryStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = MemoryStore(root=tmp_path, write_behind=False)
+    pool = SessionPool(memory_store=store)
+    monkeypatch.setattr(backend, "_session_pool", pool)
+    monkeypatch.setattr(backend, "check_in_interval", lambda: None)
+    yield TestClient(backend.app)
+    pool.close()
+    store.close()
+
+
+class RecordingClient(LLMClient):
+    """A provider that remembers the conversations it was sent."""
+
+    def __init__(self):
+        self.conversations = []
+
+    def complete(self, messages, context):
+        self.conversations.append(messages)
+        return "A reply from the provider"
+
+    def is_available(self):
+        return True
+
+
+def test_issued_ids_verify_and_tampered_ids_do_not():
+    session_id = backend.issue_session_id()
+    session_key, _, signature = session_id.partition(".")
+
+    assert backend.verify_session_id(session_id) == session_key
+    assert backend.verify_session_id(session_key) is None
+    assert backend.verify_session_id(f"{'0' * 32}.{signature}") is None
+
+
+def test_chat_rejects_ids_the_server_did_not_issue(client):
+    response = client.post("/api/chat", json={"message": "hello", "session_id": "someone-else"})
+    assert response.status_code == 403
+
+    response = client.post("/api/chat/stream", json={"message": "hello", "session_id": "someone-else"})
+    assert response.status_code == 403
+
+
+def test_chat_records_into_an_issued_session(client):
+    session_id = client.post("/api/session").json()["session_id"]
+
+    response = client.post("/api/chat", json={"message": "hello", "session_id": session_id})
+
+    assert response.status_code == 200
+    memory = backend.get_session_pool().memory_store.get(backend.verify_session_id(session_id))
+    assert [r.user for r in memory.short_term] == ["hello"]
+
+
+def test_socket_refuses_forged_ids(client):
+    with pytest.raises(WebSocketDisconnect) as refused:
+        with client.websocket_connect("/ws/chat?session_id=someone-else"):
+            pass
+    assert refused.value.code == 1008
+
+
+def test_socket_announces_an_issued_id_and_accepts_binary_frames(client):
+    with client.websocket_connect("/ws/chat") as websocket:
+        session_id = websocket.receive_json()["data"]["session_id"]
+        assert backend.verify_session_id(session_id)
+
+        websocket.send_bytes(b"\xff\xfe")
+        assert websocket.receive_json() == {"type": "error", "data": {"detail": "Expected UTF-8 text"}}
+
+        websocket.send_bytes('{"message": "hello"}'.encode("utf-8"))
+        events = []
+        while not events or events[-1] != "done":
+            events.append(websocket.receive_json()["type"])
+        assert events[0] == "intent"
+
+
+def test_shutdown_flushes_sessions_and_closes_the_pool(client):
+    pool = backend.get_session_pool()
+    with TestClient(backend.app) as lifespan_client:
+        session_id = lifespan_client.post("/api/session").json()["session_id"]
+        lifespan_client.post("/api/chat", json={"message": "I feel sad tonight", "session_id": session_id})
+        assert len(pool) == 1
+
+    assert len(pool) == 0
+    assert backend._session_pool is None
+    memory = pool.memory_store.get(backend.verify_session_id(session_id))
+    assert [r.user for r in memory.episodic] == ["I feel sad tonight"]
+
+
+def test_sessionless_turns_neither_recall_nor_store_memories(client, tmp_path, monkeypatch):
+    llm = RecordingClient()
+    store = MemoryStore(root=tmp_path / "shared", write_behind=False)
+    shared = SpiritualAgent(session_id="shared", memory_store=store, llm_client=llm)
+    shared.record("My brother Raj is in hospital", "I am sorry to hear that")
+    monkeypatch.setattr(backend, "get_agent", lambda: shared)
+
+    response = client.post("/api/chat/stream", json={"message": "My brother needs help"})
+
+    assert "A reply from the provider" in response.text
+    assert llm.conversations == [[{"role": "user", "content": "My brother needs help"}]]
+    assert [r.user for r in shared.memory.short_term] == ["My brother Raj is in hospital"]
+    shared.close()
+    store.close()
+
+
+def test_socket_checks_in_once_per_silence(client, monkeypatch):
+    monkeypatch.setattr(backend, "check_in_interval", lambda: 0.05)
+    with client.websocket_connect("/ws/chat") as websocket:
+        assert websocket.receive_json()["type"] == "session"
+        assert websocket.receive_json()["type"] == "check_in"
+
+        # Several intervals of silence pass without another check-in
+        time.sleep(0.3)
+        websocket.send_json({"message": "hello"})
+        events = []
+        while not events or events[-1] != "done":
+            events.append(websocket.receive_json()["type"])
+        assert "check_in" not in events
+
+        # The user's message re-armed the timer
+        assert websocket.receive_json()["type"] == "check_in"
@@ -0,0 +1,56 @@
+"""Tests for the backend's pre-rendered static endpoints and their caching headers."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.main as backend
+
+STATIC_PATHS = ["/api/mantra/gayatri_mantra", "/api/routine/morning", "/api/meditation"]
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(backend.app)
+
+
+@pytest.mark.parametrize("path", STATIC_PATHS)
+def test_static_payloads_carry_etag_and_cache_control(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["cache-control"] == backend.STATIC_CACHE_CONTROL
+    assert response.headers["etag"].startswith('"') and response.headers["etag"].endswith('"')
+    assert client.get(path).headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.parametrize("path", STATIC_PATHS)
+def test_matching_if_none_match_gets_304(client, path):
+    etag = client.get(path).headers["etag"]
+
+    for header in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        response = client.get(path, headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == backend.STATIC_CACHE_CONTROL
+
+
+def test_stale_if_none_match_gets_the_body(client):
+    response = client.get("/api/meditation", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.json()["meditation"]["type"] == "Guided Meditation"
+
+
+def test_payloads_differ_by_etag_and_encode_like_json_response(client):
+    mantra = client.get("/api/mantra/gayatri_mantra")
+    missing = client.get("/api/mantra/no_such_mantra")
+    evening = client.get("/api/routine/evening")
+
+    assert missing.json() == {"error": "Mantra not found"}
+    assert len({mantra.headers["etag"], missing.headers["etag"], evening.headers["etag"]}) == 3
+    assert mantra.content == json.dumps(
+        mantra.json(), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
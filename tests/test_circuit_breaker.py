@@ -0,0 +1,113 @@
+"""Tests for circuit breaker state transitions and health probing."""
+import pytest
+
+import src.core.circuit_breaker as circuit_breaker
+from src.core.circuit_breaker import CircuitBreaker, HealthProber
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test moves by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=2, reset_timeout=30, half_open_calls=1)
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_consecutive_failures_open_the_circuit(breaker):
+    fail(breaker, 1)
+    breaker.record_success()
+    fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_after_reset_timeout_allows_limited_trials(breaker, clock):
+    fail(breaker, 2)
+    clock[0] += 29
+    assert not breaker.allow()
+
+    clock[0] += 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_trial_result_closes_or_reopens(breaker, clock):
+    fail(breaker, 2)
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_probe_success_does_not_skip_the_reset_timeout(breaker, clock):
+    healthy = [True]
+    prober = HealthProber(lambda: healthy[0], interval=3600, breaker=breaker)
+    try:
+        fail(breaker, 2)
+        prober.probe()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+        clock[0] += 30
+        prober.probe()
+        assert breaker.allow()
+
+        healthy[0] = False
+        breaker.record_success()
+        prober.probe()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert not prober.available
+        prober.probe()
+        assert breaker.state == CircuitBreaker.OPEN
+    finally:
+        prober.close()
+
+
+def test_probe_failures_count_against_the_threshold(breaker, clock):
+    healthy = [False]
+    prober = HealthProber(lambda: healthy[0], interval=3600, breaker=breaker)
+    try:
+        # The first probe ran at start; a success in between resets the count
+        healthy[0] = True
+        prober.probe()
+        healthy[0] = False
+        prober.probe()
+        assert breaker.state == CircuitBreaker.CLOSED
+        prober.probe()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # Half-open, one failed probe re-opens the circuit like a failed trial call
+        clock[0] += 30
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        healthy[0] = True
+        prober.probe()
+        healthy[0] = False
+        prober.probe()
+        assert not breaker.allow()
+    finally:
+        prober.close()
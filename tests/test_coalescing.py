@@ -0,0 +1,62 @@
+"""Tests for coalescing concurrent identical LLM turns."""
+import threading
+import time
+
+from src.core.llm_client import CoalescingLLMClient, MockClient
+
+CONTEXT = {"emotion": "sadness", "intent": "seeking_guidance"}
+
+
+class SlowHistoryClient(MockClient):
+    """Answers with the first message it was given, slowly enough for turns to overlap."""
+
+    provider_name = "Slow"
+    model = "test"
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, context):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return messages[0]["content"]
+
+
+def turn(first):
+    return [
+        {"role": "user", "content": first},
+        {"role": "assistant", "content": "I hear you"},
+        {"role": "user", "content": "What should I do?"},
+    ]
+
+
+def run_concurrently(client, conversations):
+    replies = [None] * len(conversations)
+
+    def ask(i):
+        replies[i] = client.complete(conversations[i], CONTEXT)
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(len(conversations))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return replies
+
+
+def test_identical_turns_share_one_generation():
+    inner = SlowHistoryClient()
+    replies = run_concurrently(CoalescingLLMClient(inner), [turn("I lost my job")] * 4)
+
+    assert replies == ["I lost my job"] * 4
+    assert inner.calls == 1
+
+
+def test_turns_with_different_histories_are_not_coalesced():
+    inner = SlowHistoryClient()
+    replies = run_concurrently(CoalescingLLMClient(inner), [turn("My brother Raj is ill"), turn("I lost my job")])
+
+    assert replies == ["My brother Raj is ill", "I lost my job"]
+    assert inner.calls == 2
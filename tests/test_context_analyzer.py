@@ -0,0 +1,46 @@
+"""Tests for ContextAnalyzer keyword matching."""
+import pytest
+
+from src.reasoning.context_analyzer import ContextAnalyzer
+from src.reasoning.keyword_matcher import KeywordMatcher
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return ContextAnalyzer()
+
+
+@pytest.mark.parametrize("message, emotion, intent", [
+    ("I feel so much sadness and anxiety", "sadness", "emotional_support"),
+    ("I am really struggling with my feelings", None, "emotional_support"),
+    ("Please teach me to meditate", None, "meditation_request"),
+    ("I'm scared", "fear", "emotional_support"),
+])
+def test_inflections_still_match(analyzer, message, emotion, intent):
+    context = analyzer.analyze(message)
+    assert context["emotion"] == emotion
+    assert context["intent"] == intent
+
+
+def test_keywords_inside_other_words_do_not_match(analyzer):
+    context = analyzer.analyze("I know you are scared")
+    assert "compassion" not in context["themes"]
+    assert "mindfulness" not in context["themes"]
+
+
+def test_crisis_phrases(analyzer):
+    assert analyzer.analyze("Sometimes I want to   die.")["is_crisis"]
+    assert analyzer.analyze("thoughts of self-harm")["is_crisis"]
+
+
+def test_matcher_prefix_and_whole_words():
+    keywords = ["feel", "now", "end my life"]
+    prefix = KeywordMatcher(keywords)
+    whole = KeywordMatcher(keywords, whole_words=True)
+
+    assert prefix.find("Feelings, right NOW; I know") == {"feel", "now"}
+    assert prefix.find("to end my lifelong habit") == {"end my life"}
+    assert prefix.find("friend my life") == set()
+    assert whole.find("Feelings, right NOW") == {"now"}
+    assert whole.find("to end my lifelong habit") == set()
+    assert whole.find("I want to end my life.") == {"end my life"}
@@ -0,0 +1,28 @@
+"""Tests for InsightTimeline buckets."""
+from datetime import datetime, timezone
+
+from src.memory.insights import InsightTimeline
+
+# Wednesday 2024-05-15 13:45 UTC
+WEDNESDAY = datetime(2024, 5, 15, 13, 45, tzinfo=timezone.utc).timestamp()
+
+
+def test_buckets_start_on_utc_boundaries():
+    timeline = InsightTimeline()
+    timeline.add(WEDNESDAY, "joy", "gratitude")
+
+    assert timeline.query("hour")[0]["start"] == "2024-05-15T13:00:00+00:00"
+    assert timeline.query("day")[0]["start"] == "2024-05-15T00:00:00+00:00"
+    assert timeline.query("week")[0]["start"] == "2024-05-13T00:00:00+00:00"
+
+
+def test_counts_and_dominant_emotion():
+    timeline = InsightTimeline()
+    timeline.add(WEDNESDAY, "joy", "gratitude")
+    timeline.add(WEDNESDAY + 60, "sadness", None)
+    timeline.add(WEDNESDAY + 120, "sadness", "emotional_support")
+
+    (day,) = timeline.query("day")
+    assert day["interactions"] == 3
+    assert day["emotions"] == {"joy": 1, "sadness": 2}
+    assert day["dominant_emotion"] == "sadness"
@@ -0,0 +1,60 @@
+"""Tests for MemoryJournal replay."""
+from src.memory.journal import MemoryJournal
+
+
+def _journal(tmp_path):
+    return MemoryJournal(tmp_path / "memories.json")
+
+
+def test_replays_records_in_order(tmp_path):
+    journal = _journal(tmp_path)
+    journal.load()
+    journal.append([{"user": "one"}, {"user": "two"}])
+    journal.close()
+
+    _, records = _journal(tmp_path).load()
+    assert [r["user"] for r in records] == ["one", "two"]
+    assert [r["seq"] for r in records] == [1, 2]
+
+
+def test_torn_write_is_dropped_and_later_appends_survive(tmp_path):
+    journal = _journal(tmp_path)
+    journal.load()
+    journal.append([{"user": "one"}])
+    journal.close()
+    # A crash mid-write leaves half a line at the end of the journal
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"user":"tw')
+
+    reloaded = _journal(tmp_path)
+    _, records = reloaded.load()
+    assert [r["user"] for r in records] == ["one"]
+    reloaded.append([{"user": "three"}])
+    reloaded.close()
+
+    _, records = _journal(tmp_path).load()
+    assert [r["user"] for r in records] == ["one", "three"]
+    assert [r["seq"] for r in records] == [1, 2]
+
+
+def test_journal_holding_only_a_torn_line(tmp_path):
+    journal = _journal(tmp_path)
+    journal.journal_path.write_text('{"user":"on')
+    assert journal.load()[1] == []
+    journal.append([{"user": "two"}])
+    journal.close()
+
+    assert [r["user"] for r in _journal(tmp_path).load()[1]] == ["two"]
+
+
+def test_compaction_skips_records_already_in_snapshot(tmp_path):
+    journal = _journal(tmp_path)
+    journal.load()
+    journal.append([{"user": "one"}, {"user": "two"}])
+    journal.compact({"episodic": ["one", "two"]}, background=False)
+    journal.append([{"user": "three"}])
+    journal.close()
+
+    snapshot, records = _journal(tmp_path).load()
+    assert snapshot["seq"] == 2
+    assert [r["user"] for r in records] == ["three"]
@@ -0,0 +1,73 @@
+"""Tests for LLM calls made under the agent's latency budget."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import src.core.agent as agent_module
+from src.core.agent import SpiritualAgent, submit_llm_call
+from src.core.llm_client import LLMClient
+from src.memory.store import MemoryStore
+
+
+class BlockedClient(LLMClient):
+    """Completes only once released, counting the calls that actually ran."""
+
+    provider_name = "Blocked"
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def complete(self, messages, context):
+        self.calls += 1
+        self.release.wait(5)
+        return "A reply from the model, long enough to use"
+
+    def is_available(self):
+        return True
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    """One LLM thread with room for one queued call."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(agent_module, "_llm_executor", executor)
+    monkeypatch.setattr(agent_module, "_llm_slots", threading.BoundedSemaphore(2))
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def agent(tmp_path):
+    client = BlockedClient()
+    store = MemoryStore(root=tmp_path, write_behind=False)
+    agent = SpiritualAgent(session_id="s", memory_store=store, llm_client=client)
+    agent.llm_budget = 0.05
+    yield agent
+    client.release.set()
+    agent.close()
+    store.close()
+
+
+def test_over_budget_call_that_never_started_is_cancelled(agent, executor):
+    running = agent.interact("I feel lost today")
+    queued = agent.interact("I feel lost today")
+    agent.llm_client.release.set()
+    executor.shutdown(wait=True)
+
+    assert "long enough to use" not in running + queued
+    assert agent.llm_client.calls == 1
+
+
+def test_full_queue_falls_back_without_waiting(agent, executor):
+    assert submit_llm_call(agent.llm_client.complete, [], {}) is not None
+    assert submit_llm_call(agent.llm_client.complete, [], {}) is not None
+    assert submit_llm_call(agent.llm_client.complete, [], {}) is None
+
+    response = agent.interact("I feel lost today")
+
+    assert "long enough to use" not in response
+    agent.llm_client.release.set()
+    executor.shutdown(wait=True)
+    assert agent.llm_client.calls == 2
@@ -0,0 +1,95 @@
+"""Tests for decoding streamed LLM replies (Ollama NDJSON, OpenAI SSE)."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.core.llm_client import OllamaClient, OpenAIClient
+
+MESSAGES = [{"role": "user", "content": "How do I find peace?"}]
+CONTEXT = {"emotion": "peace", "intent": "spiritual_question"}
+
+
+def ndjson(*chunks):
+    return [json.dumps(chunk) for chunk in chunks]
+
+
+def sse(*chunks):
+    lines = []
+    for chunk in chunks:
+        lines += [f"data: {chunk if isinstance(chunk, str) else json.dumps(chunk)}", ""]
+    return lines
+
+
+OLLAMA_STREAM = ndjson(
+    {"message": {"role": "assistant", "content": "Breathe "}, "done": False},
+    {"message": {"role": "assistant", "content": ""}, "done": False},
+    {"message": {"role": "assistant", "content": "slowly."}, "done": False},
+    {"message": {"role": "assistant", "content": ""}, "done": True},
+)
+
+OPENAI_STREAM = [": keep-alive", ""] + sse(
+    {"choices": [{"delta": {"role": "assistant"}}]},
+    {"choices": [{"delta": {"content": "Breathe "}}]},
+    {"choices": [{"delta": {"content": "slowly."}}]},
+    {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+    "[DONE]",
+)
+
+
+def decode(client, lines):
+    """Run lines through the client's parser until it reports the end."""
+    tokens = []
+    for line in lines:
+        token, done = client._parse_stream_line(line)
+        if token:
+            tokens.append(token)
+        if done:
+            return tokens, True
+    return tokens, False
+
+
+def test_ollama_ndjson_chunks():
+    assert decode(OllamaClient(), OLLAMA_STREAM + ["", "   "]) == (["Breathe ", "slowly."], True)
+
+
+def test_ollama_error_chunk_raises():
+    with pytest.raises(RuntimeError, match="model not found"):
+        decode(OllamaClient(), ndjson({"error": "model not found"}))
+
+
+def test_openai_sse_events():
+    client = OpenAIClient(api_key="test")
+    assert decode(client, OPENAI_STREAM) == (["Breathe ", "slowly."], True)
+    assert client._parse_stream_line("event: message") == (None, False)
+    assert client._parse_stream_line("data:" + json.dumps({"choices": []})) == (None, False)
+
+
+@pytest.mark.parametrize("client, lines", [
+    (OllamaClient(), OLLAMA_STREAM + ndjson({"message": {"content": "ignored"}})),
+    (OpenAIClient(api_key="test"), OPENAI_STREAM + sse({"choices": [{"delta": {"content": "ignored"}}]})),
+])
+def test_astream_decodes_a_chunked_http_body(client, lines, monkeypatch):
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+
+    async def chunks():
+        # Split mid-line so the client has to reassemble lines itself
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=chunks())
+
+    monkeypatch.setattr(
+        client, "_new_async_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    async def run():
+        try:
+            return [token async for token in client.astream(MESSAGES, CONTEXT)]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == ["Breathe ", "slowly."]
@@ -0,0 +1,81 @@
+"""Tests for MemoryStore residency and leases."""
+import os
+import threading
+
+import pytest
+
+from src.memory.store import MemoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MemoryStore(root=tmp_path, max_resident=1, write_behind=False)
+    yield store
+    store.close()
+
+
+def test_least_recently_used_session_is_evicted_and_closed(store):
+    first = store.get("first")
+    store.get("second")
+
+    assert "first" not in store
+    with pytest.raises(RuntimeError):
+        first.store("hello", "hi", {})
+
+
+def test_leased_session_is_not_evicted(store):
+    leased = store.acquire("leased")
+    store.get("other")
+
+    assert "leased" in store
+    assert store.evict("leased") is False
+    leased.store("still writable", "yes", {})
+
+    # Once released it is the least recently used session beyond the limit
+    store.release("leased")
+    assert "leased" not in store
+    assert "other" in store
+
+
+def test_reload_after_eviction_continues_the_journal(store):
+    memory = store.get("session")
+    memory.store("I feel sad one", "r", {"emotion": "sadness"})
+    store.get("other")
+    store.get("session").store("I feel sad two", "r", {"emotion": "sadness"})
+    store.evict("session")
+
+    reloaded = store.get("session")
+    assert [r.user for r in reloaded.episodic] == ["I feel sad one", "I feel sad two"]
+
+
+def test_concurrent_loads_share_one_manager(tmp_path):
+    store = MemoryStore(root=tmp_path, write_behind=False)
+    managers = []
+    threads = [threading.Thread(target=lambda: managers.append(store.get("same"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(manager) for manager in managers}) == 1
+    store.close()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_resident_sessions_hold_no_open_files(tmp_path):
+    store = MemoryStore(root=tmp_path, max_resident=100, write_behind=False, max_episodic=1)
+    for i in range(20):
+        memory = store.get(f"session-{i}")
+        for n in range(3):
+            memory.store(f"I feel sad {n}", "r", {"emotion": "sadness"})
+        memory.recall("sad", include_archive=True)
+    before = len(os.listdir("/proc/self/fd"))
+
+    for i in range(20, 60):
+        memory = store.get(f"session-{i}")
+        for n in range(3):
+            memory.store(f"I feel sad {n}", "r", {"emotion": "sadness"})
+        memory.recall("sad", include_archive=True)
+
+    assert len(os.listdir("/proc/self/fd")) <= before
+    store.close()
@@ -0,0 +1,64 @@
+"""Tests for token-budgeted history and cached system prompts."""
+from src.core.prompt_builder import PromptBuilder, approx_tokens
+from src.memory.records import Interaction
+
+
+def exchanges(*pairs):
+    return [Interaction(user, agent, float(i + 1)) for i, (user, agent) in enumerate(pairs)]
+
+
+def tokens(messages):
+    return sum(approx_tokens(message["content"]) for message in messages)
+
+
+def test_history_keeps_the_newest_exchanges_that_fit_oldest_first():
+    memories = exchanges(("a" * 40, "b" * 40), ("c" * 40, "d" * 40), ("e" * 40, "f" * 40))
+    builder = PromptBuilder(history_token_budget=45, max_history_turns=5)
+
+    history = builder.history(memories)
+
+    assert history == [
+        {"role": "user", "content": "c" * 40},
+        {"role": "assistant", "content": "d" * 40},
+        {"role": "user", "content": "e" * 40},
+        {"role": "assistant", "content": "f" * 40},
+    ]
+    assert tokens(history) <= builder.history_token_budget
+
+
+def test_an_older_exchange_that_does_not_fit_ends_the_history():
+    memories = exchanges(("short", "reply"), ("x" * 400, "y" * 400), ("last", "one"))
+    builder = PromptBuilder(history_token_budget=50, max_history_turns=5)
+
+    assert [m["content"] for m in builder.history(memories)] == ["last", "one"]
+
+
+def test_max_history_turns_caps_the_exchanges():
+    memories = exchanges(*[(f"question {i}", f"answer {i}") for i in range(10)])
+    builder = PromptBuilder(history_token_budget=10_000, max_history_turns=3)
+
+    history = builder.history(memories)
+
+    assert [m["content"] for m in history[::2]] == ["question 7", "question 8", "question 9"]
+    assert PromptBuilder(max_history_turns=0).history(memories) == []
+
+
+def test_an_overlong_latest_exchange_is_cut_to_the_budget():
+    memories = exchanges(("u" * 4000, "a" * 4000))
+    builder = PromptBuilder(history_token_budget=100, max_history_turns=5)
+
+    history = builder.history(memories)
+
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    assert history[0]["content"].startswith("u") and history[1]["content"].startswith("a")
+    assert 0 < tokens(history) <= builder.history_token_budget
+    assert PromptBuilder(history_token_budget=0).history(memories) == []
+
+
+def test_system_prompt_is_rendered_once_per_context():
+    builder = PromptBuilder(system_prompt="Be kind.")
+    sad = builder.system_prompt({"emotion": "sadness", "intent": "emotional_support", "themes": ["peace"]})
+
+    assert sad.startswith("Be kind.") and "sadness" in sad
+    assert builder.system_prompt({"emotion": "sadness", "intent": "emotional_support"}) is sad
+    assert builder.system_prompt({}) == "Be kind."
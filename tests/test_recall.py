@@ -0,0 +1,89 @@
+"""Tests for BM25 keyword recall."""
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from src.memory.index import InvertedIndex, tokenize
+from src.memory.memory_manager import MemoryManager
+
+WORDS = "peace anxiety prayer mother job sleep fear temple mantra grief anger hope work family".split()
+
+
+def reference_bm25(docs, query, k1=1.2, b=0.75):
+    """Textbook BM25 over every document."""
+    terms = {doc_id: Counter(tokenize(text)) for doc_id, text in docs.items()}
+    avg_length = sum(sum(t.values()) for t in terms.values()) / len(terms)
+    scores = {}
+    for doc_id, tf in terms.items():
+        length = sum(tf.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for t in terms.values() if term in t)
+            if not df or not tf[term]:
+                continue
+            idf = math.log(1 + (len(terms) - df + 0.5) / (df + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / avg_length))
+        if score:
+            scores[doc_id] = score
+    return scores
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(7)
+    return {i: " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))) for i in range(200)}
+
+
+@pytest.mark.parametrize("query", ["fear of sleep", "mother prayer temple", "grief", "hope and work family"])
+def test_search_matches_reference_top_k(corpus, query):
+    index = InvertedIndex()
+    for doc_id, text in corpus.items():
+        index.add(doc_id, text)
+
+    expected = reference_bm25(corpus, query)
+    results = index.search(query, k=5)
+
+    best = sorted(expected.values(), reverse=True)[:5]
+    assert [score for _, score in results] == pytest.approx(best)
+    for doc_id, score in results:
+        assert expected[doc_id] == pytest.approx(score)
+
+
+def test_removed_and_replaced_documents_update_scores(corpus):
+    index = InvertedIndex()
+    for doc_id, text in corpus.items():
+        index.add(doc_id, text)
+    for doc_id in range(0, 200, 3):
+        index.remove(doc_id)
+        del corpus[doc_id]
+    index.add(1, "mantra mantra peace")
+    corpus[1] = "mantra mantra peace"
+
+    expected = reference_bm25(corpus, "mantra peace")
+    results = dict(index.search("mantra peace", k=len(corpus)))
+    assert results.keys() == expected.keys()
+    for doc_id, score in results.items():
+        assert expected[doc_id] == pytest.approx(score)
+
+
+def test_unknown_terms_and_empty_index_find_nothing():
+    index = InvertedIndex()
+    assert index.search("anything") == []
+    index.add(1, "peace of mind")
+    assert index.search("unrelated words") == []
+    assert index.search("the and of") == []
+
+
+def test_recall_returns_relevant_memories_oldest_first(tmp_path):
+    memory = MemoryManager(data_dir=tmp_path, write_behind=False)
+    for text in ["My mother is unwell", "I chanted a mantra today", "Work is stressful", "Mother called me"]:
+        memory.store(text, "r", {"emotion": "sadness"})
+
+    recalled = memory.recall("how is my mother", top_k=2)
+
+    assert [r.user for r in recalled] == ["My mother is unwell", "Mother called me"]
+    # Without a match, the latest turns are recalled instead
+    assert [r.user for r in memory.recall("zebra", top_k=1)] == ["Mother called me"]
+    memory.close()
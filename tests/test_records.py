@@ -0,0 +1,34 @@
+"""Tests for Interaction records."""
+from src.memory.records import UNKNOWN_TIME, Interaction
+
+
+def test_round_trip_is_exact():
+    record = Interaction.from_context(
+        "I feel calm", "Wonderful.",
+        {"emotion": "peace", "intent": "gratitude", "themes": ["peace"], "source": "web"},
+        timestamp=1715780700.123456789,
+    )
+
+    assert Interaction.from_dict(record.to_dict()) == record
+
+
+def test_legacy_iso_timestamp_is_read():
+    record = Interaction.from_dict({"user": "hi", "agent": "hello", "timestamp": "2024-05-15T13:45:00"})
+
+    assert record.timestamp > UNKNOWN_TIME
+    assert record.isoformat == "2024-05-15T13:45:00"
+
+
+def test_missing_timestamp_stays_missing():
+    data = {"user": "hi", "agent": "hello", "context": {}}
+    record = Interaction.from_dict(data)
+
+    assert record.timestamp == UNKNOWN_TIME
+    assert "timestamp" not in record.to_dict()
+    assert Interaction.from_dict(record.to_dict()) == record
+
+
+def test_records_have_no_instance_dict():
+    record = Interaction("hi", "hello", 1.0)
+
+    assert not hasattr(record, "__dict__")
@@ -0,0 +1,68 @@
+"""Tests for the LLM response cache and its keys."""
+from src.core.llm_client import CachedLLMClient, MockClient
+from src.core.response_cache import ResponseCache, cache_key
+
+CONTEXT = {"emotion": "sadness", "intent": "seeking_guidance"}
+
+
+class EchoHistoryClient(MockClient):
+    """Answers with the first message it was given, like a reply built from history."""
+
+    provider_name = "Echo"
+    model = "test"
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, messages, context):
+        self.calls += 1
+        return messages[0]["content"]
+
+
+def turn(*history):
+    """A conversation: earlier user/assistant messages, then the new message."""
+    messages = [{"role": "user" if i % 2 == 0 else "assistant", "content": text} for i, text in enumerate(history)]
+    return messages + [{"role": "user", "content": "What should I do?"}]
+
+
+def test_keys_differ_between_users_with_different_histories():
+    alice = turn("My brother Raj is in hospital", "I am sorry to hear that")
+    bob = turn("I lost my job", "That sounds hard")
+
+    assert cache_key(alice, CONTEXT, "m") != cache_key(bob, CONTEXT, "m")
+    assert cache_key(alice, CONTEXT, "m") != cache_key(turn(), CONTEXT, "m")
+
+
+def test_retyped_message_with_the_same_history_shares_a_key():
+    retyped = turn("I lost my job", "That sounds hard")
+    retyped[-1] = {"role": "user", "content": "  what should i do  "}
+
+    assert cache_key(retyped, CONTEXT, "m") == cache_key(turn("I lost my job", "That sounds hard"), CONTEXT, "m")
+
+
+def test_cached_reply_is_not_served_to_another_user():
+    inner = EchoHistoryClient()
+    client = CachedLLMClient(inner, ResponseCache())
+
+    alice = client.complete(turn("My brother Raj is in hospital", "I am sorry"), CONTEXT)
+    bob = client.complete(turn("I lost my job", "That sounds hard"), CONTEXT)
+    again = client.complete(turn("My brother Raj is in hospital", "I am sorry"), CONTEXT)
+
+    assert "Raj" in alice and "Raj" not in bob
+    assert again == alice
+    assert inner.calls == 2
+
+
+def test_disk_tier_keeps_the_most_recent_entries(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(max_entries=1, disk_path=path, max_disk_entries=3)
+    for i in range(6):
+        cache.put(f"k{i}", f"response {i}")
+    cache.put("k4", "response 4 again")
+    cache.close()
+
+    reopened = ResponseCache(disk_path=path, max_disk_entries=3)
+    assert [reopened.get(f"k{i}") for i in range(6)] == [
+        None, None, None, None, "response 4 again", "response 5",
+    ]
+    reopened.close()
@@ -0,0 +1,76 @@
+"""Tests for SessionPool leases and eviction."""
+import threading
+import time
+
+import pytest
+
+from src.core.llm_client import MockClient
+from src.core.session_pool import SessionPool
+from src.memory.store import MemoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MemoryStore(root=tmp_path, write_behind=False)
+    yield store
+    store.close()
+
+
+def make_pool(store, **options):
+    options.setdefault("sweep_interval", None)
+    return SessionPool(memory_store=store, llm_client=MockClient(), **options)
+
+
+def test_agent_in_use_is_not_evicted(store):
+    pool = make_pool(store, max_sessions=1, idle_ttl=0.01)
+    agent = pool.acquire("in-use")
+    time.sleep(0.02)
+    pool.get("other")
+    pool.sweep()
+
+    assert "in-use" in pool
+    assert pool.evict("in-use") is False
+    agent.record("I feel sad and still remembered", "yes")
+
+    # Released, it is idle and beyond the limit
+    pool.release("in-use")
+    time.sleep(0.02)
+    pool.sweep()
+    assert "in-use" not in pool
+    assert [r.user for r in store.get("in-use").episodic] == ["I feel sad and still remembered"]
+
+
+def test_least_recently_used_idle_agent_is_evicted_and_closed(store):
+    pool = make_pool(store, max_sessions=1)
+    first = pool.get("first")
+    pool.get("second")
+
+    assert "first" not in pool
+    with pytest.raises(RuntimeError):
+        first.record("too late", "no")
+
+
+def test_concurrent_acquires_share_one_agent(store):
+    pool = make_pool(store)
+    agents = []
+    threads = [threading.Thread(target=lambda: agents.append(pool.acquire("same"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(agent) for agent in agents}) == 1
+    for _ in agents:
+        pool.release("same")
+    pool.close()
+
+
+def test_background_sweep_evicts_idle_agents(store):
+    pool = make_pool(store, idle_ttl=0.01, sweep_interval=0.01)
+    pool.get("idle")
+    deadline = time.monotonic() + 2
+    while "idle" in pool and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert "idle" not in pool
+    pool.close()
@@ -0,0 +1,79 @@
+"""Tests for the process-wide LLM client."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import src.core.agent as agent_module
+from src.core.agent import SpiritualAgent, close_shared_llm_client, get_shared_llm_client
+from src.core.llm_client import LLMClient, MockClient
+from src.memory.store import MemoryStore
+
+
+class ProviderClient(LLMClient):
+    """Stands in for a real provider's client."""
+
+    def complete(self, messages, context):
+        return "A reply from the provider"
+
+    def is_available(self):
+        return True
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """An Ollama provider that is down for the first creation only."""
+    created = []
+
+    def create_llm_client():
+        created.append(MockClient() if not created else ProviderClient())
+        return created[-1]
+
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setattr(agent_module, "create_llm_client", create_llm_client)
+    monkeypatch.setattr(agent_module, "load_config", lambda: {"llm": {"fallback_retry_seconds": 0}})
+    close_shared_llm_client()
+    yield created
+    close_shared_llm_client()
+
+
+def test_mock_fallback_is_replaced_once_the_provider_is_back(provider, tmp_path):
+    store = MemoryStore(root=tmp_path, write_behind=False)
+    agent = SpiritualAgent(session_id="s", memory_store=store)
+
+    assert type(get_shared_llm_client()) is MockClient
+    assert isinstance(agent.llm_client, ProviderClient)
+    assert get_shared_llm_client() is agent.llm_client
+    assert len(provider) == 2
+
+    agent.close()
+    store.close()
+
+
+def test_working_client_is_kept(provider):
+    provider.append(None)  # The provider is up from the first creation
+
+    client = get_shared_llm_client()
+
+    assert isinstance(client, ProviderClient)
+    assert get_shared_llm_client() is client
+    assert len(provider) == 2
+
+
+def test_racing_callers_start_one_health_prober(monkeypatch):
+    started = []
+
+    class SlowProber:
+        def __init__(self, *args, **kwargs):
+            started.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(agent_module, "HealthProber", SlowProber)
+    monkeypatch.setattr(agent_module, "_llm_guards", {})
+    monkeypatch.setattr(agent_module, "load_config", lambda: {"llm": {"circuit_breaker": {"enabled": True}}})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        guards = list(pool.map(lambda _: agent_module.get_llm_guard("ollama", {}), range(8)))
+
+    assert len(started) == 1
+    assert all(guard is guards[0] for guard in guards)
@@ -0,0 +1,76 @@
+"""Tests for the dense vector index and vector recall."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.memory.memory_manager import MemoryManager  # noqa: E402
+from src.memory.records import UNKNOWN_TIME, Interaction  # noqa: E402
+from src.memory.vector_index import VectorIndex  # noqa: E402
+
+TEXTS = {
+    "a": "I want to learn meditation",
+    "b": "My job is stressful",
+    "c": "Tell me a mantra for peace",
+}
+
+
+def test_search_ranks_similar_wordings_first():
+    index = VectorIndex()
+    for key, text in TEXTS.items():
+        index.add(key, text)
+
+    assert index.search("how do I meditate", k=1)[0][0] == "a"
+    assert index.search("work stress", k=3)[0][0] == "b"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = VectorIndex()
+    for key, text in TEXTS.items():
+        index.add(key, text)
+    index.remove("b")
+    path = tmp_path / "vectors.npy"
+    index.save(path)
+
+    loaded = VectorIndex.load(path)
+
+    assert list(loaded.keys()) == list(index.keys())
+    assert loaded.search("mantra peace", k=2) == pytest.approx(index.search("mantra peace", k=2))
+    # The memory-mapped matrix is copied on the first change
+    loaded.add("d", "grief after a loss")
+    assert "d" in loaded and len(loaded) == 3
+
+
+def test_load_rejects_missing_or_mismatched_files(tmp_path):
+    assert VectorIndex.load(tmp_path / "missing.npy") is None
+    index = VectorIndex()
+    index.add("a", "peace")
+    index.save(tmp_path / "vectors.npy")
+    np.save(tmp_path / "vectors.npy", np.zeros((1, 3), dtype=np.float32))
+    assert VectorIndex.load(tmp_path / "vectors.npy") is None
+
+
+def test_records_with_equal_timestamps_are_all_recalled(tmp_path):
+    memory = MemoryManager(data_dir=tmp_path, write_behind=False)
+    for text in ["I fear the exam", "I fear the dark", "I fear the exam"]:
+        record = Interaction(text, "r", UNKNOWN_TIME, "fear", None, False)
+        with memory._lock:
+            memory._remember(record)
+
+    recalled = memory.recall("fear", top_k=5, strategy="vector")
+
+    assert sorted(r.user for r in recalled) == ["I fear the dark", "I fear the exam", "I fear the exam"]
+    memory.close()
+
+
+def test_vector_index_persists_and_follows_evictions(tmp_path):
+    memory = MemoryManager(data_dir=tmp_path, write_behind=False, max_episodic=2)
+    memory.store("I feel sad about my mother", "r", {"emotion": "sadness"})
+    memory.recall("mother", strategy="vector")
+    memory.store("I feel sad about work", "r", {"emotion": "sadness"})
+    memory.store("I feel sad about the temple", "r", {"emotion": "sadness"})
+    memory.close()
+
+    reopened = MemoryManager(data_dir=tmp_path, write_behind=False, max_episodic=2)
+    recalled = reopened.recall("sad", top_k=5, strategy="vector")
+    assert sorted(r.user for r in recalled) == ["I feel sad about the temple", "I feel sad about work"]
+    reopened.close()